@@ -3,14 +3,205 @@ Smart Resume Analyzer - Flask Application
 Main application file with routes and error handling
 """
 
-from flask import Flask, render_template, request, jsonify, flash, redirect, url_for
+from flask import (Flask, Request, Response, g, render_template, request, jsonify, flash, redirect, url_for,
+                   stream_with_context)
+import hashlib
 import os
-from werkzeug.utils import secure_filename
-from config import UPLOAD_FOLDER, ALLOWED_EXTENSIONS, MAX_CONTENT_LENGTH
-from modules.resume_parser import get_resume_text
-from modules.matcher import get_match_analysis
+import tempfile
+import threading
+import time
+from werkzeug.exceptions import HTTPException
+from config import (
+    UPLOAD_FOLDER,
+    ALLOWED_EXTENSIONS,
+    MAX_CONTENT_LENGTH,
+    MAX_BATCH_FILES,
+    MAX_BATCH_CONTENT_LENGTH,
+    MAX_MULTI_JOB_DESCRIPTIONS,
+    UPLOAD_SPOOL_MAX_SIZE,
+    UPLOAD_SPOOL_STREAM_MAX_SIZE,
+    JOB_WORKERS,
+    METRICS_ENABLED,
+    PDF_LARGE_PAGES,
+    ANALYZE_MAX_IN_FLIGHT,
+    ANALYZE_MAX_LARGE_IN_FLIGHT,
+    ANALYZE_MAX_QUEUE,
+    ANALYZE_QUEUE_TIMEOUT,
+    ANALYZE_RETRY_AFTER,
+    RANKING_MAX_JOB_DESCRIPTIONS,
+    RANKING_MAX_K
+)
+from modules.resume_parser import get_resume_text, get_text_cache_stats, hash_file, inspect_pdf, pdf_rejection
+from modules.matcher import (
+    get_match_analysis,
+    get_match_analysis_batch,
+    get_match_analysis_multi,
+    get_jd_cache_stats,
+    analyze_job_description
+)
+from modules.tfidf_model import load_tfidf_model
+from modules.jobs import JobQueue, QueueFullError, ensure_workers
+from modules.candidate_store import QuerySyntaxError, get_candidate_store
+from modules.resume_matrix import rank_candidates, record_resumes
+from modules.skill_db import get_taxonomy, install_reload_signal
+from modules import metrics
+from modules.profiler import profiler, profile_if_slow
+from modules import warmup
+
+
+class HashingSpooledFile(tempfile.SpooledTemporaryFile):
+    """
+    Upload buffer kept in memory up to max_size bytes, then spilled to a
+    temporary file (0 writes to the file from the start); hashes the bytes as
+    they are received
+    """
+    
+    def __init__(self, max_size: int = UPLOAD_SPOOL_MAX_SIZE):
+        super().__init__(max_size=max_size, mode='w+b', dir=UPLOAD_FOLDER)
+        if not max_size:
+            self.rollover()
+        self._digest = hashlib.sha256()
+    
+    def write(self, data):
+        self._digest.update(data)
+        return super().write(data)
+    
+    def hexdigest(self) -> str:
+        return self._digest.hexdigest()
+
+
+class AnalyzerRequest(Request):
+    """
+    Request class allowing a larger body for batch screening and parsing
+    uploads into hashing spooled buffers
+    """
+    
+    @property
+    def max_content_length(self):
+        if self.path in ('/analyze/batch', '/analyze/stream'):
+            return MAX_BATCH_CONTENT_LENGTH
+        return MAX_CONTENT_LENGTH
+    
+    # Set by a view that hands the uploads over to a streamed response
+    uploads_handed_off = False
+    
+    def _get_file_stream(self, total_content_length, content_type, filename=None, content_length=None):
+        if self.path == '/analyze/stream':
+            return HashingSpooledFile(UPLOAD_SPOOL_STREAM_MAX_SIZE)
+        return HashingSpooledFile()
+    
+    def close(self):
+        # Flask closes the request when the view returns, and pushes the
+        # context again only once a stream_with_context response starts:
+        # uploads handed off are closed by the stream instead
+        if not self.uploads_handed_off:
+            super().close()
+
+
+class AdmissionController:
+    """
+    Bounds the analyses running at once in this worker process.
+    
+    At most max_in_flight analyses run at a time, and at most max_large of
+    them on large documents, so a few huge PDFs can't take every slot. Up to
+    max_queue more requests wait for a slot, small ones first, for at most
+    queue_timeout seconds; beyond that they are turned away with a 503 so the
+    client retries later instead of queueing behind them.
+    """
+    
+    def __init__(self, max_in_flight: int = ANALYZE_MAX_IN_FLIGHT, max_large: int = ANALYZE_MAX_LARGE_IN_FLIGHT,
+                 max_queue: int = ANALYZE_MAX_QUEUE, queue_timeout: float = ANALYZE_QUEUE_TIMEOUT):
+        """
+        Args:
+            max_in_flight: Analyses running at once (0 turns admission control off)
+            max_large: Of which on large documents
+            max_queue: Requests waiting for a slot
+            queue_timeout: Seconds a request waits before it is turned away
+        """
+        self.max_in_flight = max_in_flight
+        self.max_large = max_large
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.in_flight = 0
+        self.large_in_flight = 0
+        self.waiting = 0
+        self.small_waiting = 0
+        self._condition = threading.Condition()
+    
+    def _can_run(self, large: bool) -> bool:
+        if self.in_flight >= self.max_in_flight:
+            return False
+        # Large documents only take a free slot no small request is waiting for
+        return not large or (self.large_in_flight < self.max_large and not self.small_waiting)
+    
+    def acquire(self, large: bool = False) -> bool:
+        """
+        Takes a slot, waiting in the queue if needed
+        
+        Args:
+            large: Whether the request is a large document or a batch
+            
+        Returns:
+            True when admitted (call release afterwards), False when the
+            queue is full or the wait timed out
+        """
+        if not self.max_in_flight:
+            return True
+        
+        lane = 'large' if large else 'small'
+        start = time.perf_counter()
+        with self._condition:
+            if not self._can_run(large):
+                if self.waiting >= self.max_queue:
+                    metrics.inc('resume_analyzer_admission_total', lane=lane, outcome='queue_full')
+                    return False
+                
+                self.waiting += 1
+                if not large:
+                    self.small_waiting += 1
+                try:
+                    admitted = self._condition.wait_for(lambda: self._can_run(large), self.queue_timeout)
+                finally:
+                    self.waiting -= 1
+                    if not large:
+                        self.small_waiting -= 1
+                # A small request leaving the queue may unblock a large one
+                self._condition.notify_all()
+                if not admitted:
+                    metrics.inc('resume_analyzer_admission_total', lane=lane, outcome='timeout')
+                    return False
+            
+            self.in_flight += 1
+            if large:
+                self.large_in_flight += 1
+        
+        metrics.inc('resume_analyzer_admission_total', lane=lane, outcome='admitted')
+        metrics.observe('resume_analyzer_admission_wait_seconds', time.perf_counter() - start)
+        return True
+    
+    def release(self, large: bool = False):
+        """
+        Frees a slot taken by acquire
+        """
+        if not self.max_in_flight:
+            return
+        with self._condition:
+            self.in_flight -= 1
+            if large:
+                self.large_in_flight -= 1
+            self._condition.notify_all()
+    
+    def stats(self) -> dict:
+        with self._condition:
+            return {
+                'in_flight': self.in_flight,
+                'large_in_flight': self.large_in_flight,
+                'waiting': self.waiting
+            }
+
 
 app = Flask(__name__)
+app.request_class = AnalyzerRequest
 app.config['SECRET_KEY'] = 'dev-secret-key-change-in-production'
 app.config['UPLOAD_FOLDER'] = UPLOAD_FOLDER
 app.config['MAX_CONTENT_LENGTH'] = MAX_CONTENT_LENGTH
@@ -18,6 +209,67 @@ app.config['MAX_CONTENT_LENGTH'] = MAX_CONTENT_LENGTH
 # Ensure upload directory exists
 os.makedirs(UPLOAD_FOLDER, exist_ok=True)
 
+# Load the corpus-fitted TF-IDF model (if one has been fitted) at startup
+load_tfidf_model()
+
+# Load the spaCy model and run a canned resume through the pipeline
+# (in the gunicorn master before fork with WARMUP_MODE=preload)
+warmup.start()
+
+# Reload the skill taxonomy on TAXONOMY_RELOAD_SIGNAL (gunicorn resets
+# signal handlers in its workers, so gunicorn.conf.py installs it again)
+install_reload_signal()
+
+# Bounds concurrent analyses in this worker process
+admission = AdmissionController()
+
+# Durable queue for asynchronous analysis jobs (created on first use)
+_job_queue = None
+
+
+def get_job_queue() -> JobQueue:
+    global _job_queue
+    if _job_queue is None:
+        _job_queue = JobQueue()
+    return _job_queue
+
+
+@app.before_request
+def start_request_timing():
+    """
+    Starts the request timer, stage timings and (if enabled) the profiler
+    """
+    g.request_start = time.perf_counter()
+    metrics.start_request()
+    if profiler is not None:
+        profiler.start()
+
+
+@app.after_request
+def record_request_timing(response):
+    """
+    Records request metrics and adds a Server-Timing header with the time
+    spent in each analysis stage
+    """
+    start = g.pop('request_start', None)
+    if start is None:
+        return response
+    
+    elapsed = time.perf_counter() - start
+    endpoint = request.endpoint or 'unknown'
+    
+    if profiler is not None:
+        path = profile_if_slow(profiler.stop(), elapsed * 1000, endpoint)
+        if path:
+            print(f"Slow request to {request.path} ({elapsed * 1000:.0f} ms), profile saved to {path}")
+    
+    # Streamed responses record their metrics when the stream ends
+    if METRICS_ENABLED and endpoint != 'metrics_endpoint' and not response.is_streamed:
+        timings = metrics.finish_request(endpoint, response.status_code, elapsed)
+        response.headers['Server-Timing'] = metrics.server_timing_header(timings, elapsed)
+    
+    return response
+
 
 def allowed_file(filename: str) -> bool:
     """
@@ -33,6 +285,191 @@ def allowed_file(filename: str) -> bool:
            filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
 
 
+def upload_digest(file_storage) -> str:
+    """
+    Returns the SHA-256 of an uploaded file
+    
+    Args:
+        file_storage: Uploaded file
+        
+    Returns:
+        Hex digest, computed while the upload was received when possible
+    """
+    if isinstance(file_storage.stream, HashingSpooledFile):
+        return file_storage.stream.hexdigest()
+    return hash_file(file_storage.stream)
+
+
+def invalid_request(message: str):
+    """
+    Result of a validate_*_request function for a request rejected with a 400
+    
+    Returns:
+        (None, None, error response)
+    """
+    return None, None, (jsonify({
+        'success': False,
+        'error': message
+    }), 400)
+
+
+def validate_analyze_request():
+    """
+    Validates the resume upload and job description of a single analysis
+    
+    Returns:
+        (resume_file, job_description, None) when valid, otherwise
+        (None, None, error response)
+    """
+    # Check if resume file is present
+    if 'resume' not in request.files:
+        return invalid_request('No resume file uploaded')
+    
+    resume_file = request.files['resume']
+    job_description = request.form.get('job_description', '').strip()
+    
+    # Validate inputs
+    if resume_file.filename == '':
+        return invalid_request('No file selected')
+    
+    if not job_description:
+        return invalid_request('Job description is required')
+    
+    # Validate file type
+    if not allowed_file(resume_file.filename):
+        return invalid_request('Invalid file type. Only PDF files are allowed.')
+    
+    return resume_file, job_description, None
+
+
+def validate_multi_request():
+    """
+    Validates the resume upload and job descriptions of a one-resume,
+    many-roles analysis (/analyze/multi)
+    
+    Returns:
+        (resume_file, job_descriptions, None) when valid, otherwise
+        (None, None, error response)
+    """
+    if 'resume' not in request.files:
+        return invalid_request('No resume file uploaded')
+    
+    resume_file = request.files['resume']
+    job_descriptions = [text.strip() for text in request.form.getlist('job_description')]
+    
+    if resume_file.filename == '':
+        return invalid_request('No file selected')
+    
+    if not job_descriptions or not all(job_descriptions):
+        return invalid_request('At least one job_description is required, and none may be empty')
+    
+    if len(job_descriptions) > MAX_MULTI_JOB_DESCRIPTIONS:
+        return invalid_request(f'Too many job descriptions. At most {MAX_MULTI_JOB_DESCRIPTIONS} per request.')
+    
+    if not allowed_file(resume_file.filename):
+        return invalid_request('Invalid file type. Only PDF files are allowed.')
+    
+    return resume_file, job_descriptions, None
+
+
+def validate_batch_request():
+    """
+    Validates the resume uploads and job description of a multi-resume
+    analysis (/analyze/batch, /analyze/stream)
+    
+    Returns:
+        (resume_files, job_description, None) when valid, otherwise
+        (None, None, error response)
+    """
+    resume_files = request.files.getlist('resumes')
+    job_description = request.form.get('job_description', '').strip()
+    
+    # Validate inputs
+    if not resume_files:
+        return invalid_request('No resume files uploaded')
+    
+    if len(resume_files) > MAX_BATCH_FILES:
+        return invalid_request(f'Too many files. At most {MAX_BATCH_FILES} resumes per batch.')
+    
+    if not job_description:
+        return invalid_request('Job description is required')
+    
+    return resume_files, job_description, None
+
+
+def inspect_upload(resume_file):
+    """
+    Inspects an uploaded PDF before any text extraction (page count,
+    password protection, text layer) and applies the rejection limits
+    
+    Returns:
+        (inspection, None, None) when the PDF is accepted, otherwise
+        (None, error message, HTTP status)
+    """
+    try:
+        inspection = inspect_pdf(resume_file.stream)
+    except ValueError:
+        metrics.inc('resume_analyzer_pdf_rejected_total', reason='unreadable')
+        return None, 'Could not read the PDF. Please upload a valid PDF file.', 400
+    
+    rejection = pdf_rejection(inspection)
+    if rejection is not None:
+        reason, message = rejection
+        metrics.inc('resume_analyzer_pdf_rejected_total', reason=reason)
+        return None, message, 413 if reason == 'too_many_pages' else 400
+    
+    return inspection, None, None
+
+
+def is_large(inspection: dict) -> bool:
+    """
+    Whether an inspected PDF goes through the large lane of admission control
+    """
+    return inspection['pages'] is not None and inspection['pages'] >= PDF_LARGE_PAGES
+
+
+def extract_upload(resume_file):
+    """
+    Checks, inspects and extracts one resume of a multi-resume request
+    
+    Returns:
+        (content_hash, resume_text, None) on success, otherwise
+        (None, None, error message)
+    """
+    filename = resume_file.filename or ''
+    if not filename or not allowed_file(filename):
+        return None, None, 'Invalid file type. Only PDF files are allowed.'
+    
+    # Cheap checks before any text extraction
+    _, error, _ = inspect_upload(resume_file)
+    if error:
+        return None, None, error
+    
+    try:
+        content_hash = upload_digest(resume_file)
+        resume_text = get_resume_text(resume_file.stream, content_hash)
+    except Exception as e:
+        resume_text = None
+        print(f"Error processing {filename}: {str(e)}")
+    
+    if not resume_text:
+        return None, None, 'Could not extract text from PDF. Please ensure the PDF contains readable text.'
+    
+    return content_hash, resume_text, None
+
+
+def server_busy():
+    """
+    Response for requests turned away by admission control
+    """
+    response = jsonify({
+        'success': False,
+        'error': 'The server is busy. Please retry shortly.'
+    })
+    response.headers['Retry-After'] = str(ANALYZE_RETRY_AFTER)
+    return response, 503
+
+
 @app.route('/')
 def index():
     """
@@ -48,49 +485,33 @@ def analyze():
     
     Handles:
     - File upload validation
+    - PDF inspection and admission control
     - PDF text extraction
     - Skill matching
     - Error handling
     """
     try:
-        # Check if resume file is present
-        if 'resume' not in request.files:
-            return jsonify({
-                'success': False,
-                'error': 'No resume file uploaded'
-            }), 400
-        
-        resume_file = request.files['resume']
-        job_description = request.form.get('job_description', '').strip()
+        resume_file, job_description, error = validate_analyze_request()
+        if error:
+            return error
         
-        # Validate inputs
-        if resume_file.filename == '':
+        # Cheap checks before any text extraction
+        inspection, error, status = inspect_upload(resume_file)
+        if error:
             return jsonify({
                 'success': False,
-                'error': 'No file selected'
-            }), 400
+                'error': error
+            }), status
         
-        if not job_description:
-            return jsonify({
-                'success': False,
-                'error': 'Job description is required'
-            }), 400
-        
-        # Validate file type
-        if not allowed_file(resume_file.filename):
-            return jsonify({
-                'success': False,
-                'error': 'Invalid file type. Only PDF files are allowed.'
-            }), 400
-        
-        # Save uploaded file
-        filename = secure_filename(resume_file.filename)
-        filepath = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-        resume_file.save(filepath)
+        large = is_large(inspection)
+        if not admission.acquire(large):
+            return server_busy()
         
         try:
-            # Extract text from PDF
-            resume_text = get_resume_text(filepath)
+            # Extract text straight from the upload buffer
+            # (or reuse the cached text of identical bytes)
+            content_hash = upload_digest(resume_file)
+            resume_text = get_resume_text(resume_file.stream, content_hash)
             
             if not resume_text:
                 return jsonify({
@@ -100,12 +521,10 @@ def analyze():
             
             # Perform matching analysis
             analysis = get_match_analysis(resume_text, job_description)
+            metrics.observe('resume_analyzer_skills', len(analysis['resume_skills']))
             
-            # Clean up uploaded file (optional - you may want to keep it)
-            try:
-                os.remove(filepath)
-            except:
-                pass  # Ignore cleanup errors
+            # Keep the candidate searchable (GET /candidates/search) and rankable (POST /candidates/rank)
+            record_resumes([(resume_file.filename, analysis['resume_skills'], content_hash)], [resume_text])
             
             # Return results
             return jsonify({
@@ -115,22 +534,105 @@ def analyze():
                     'matched_skills': analysis['matched_skills'],
                     'missing_skills': analysis['missing_skills'],
                     'resume_skills': analysis['resume_skills'],
-                    'jd_skills': analysis['jd_skills']
+                    'jd_skills': analysis['jd_skills'],
+                    'fuzzy_skills': analysis['fuzzy_skills'],
+                    'taxonomy_version': analysis['taxonomy_version']
                 }
             })
             
         except Exception as e:
-            # Clean up file on error
-            try:
-                os.remove(filepath)
-            except:
-                pass
+            return jsonify({
+                'success': False,
+                'error': f'Error processing resume: {str(e)}'
+            }), 500
+        
+        finally:
+            admission.release(large)
+        
+    except HTTPException:
+        # e.g. 413 from reading the form: answered by its error handler
+        raise
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': f'Unexpected error: {str(e)}'
+        }), 500
+
+
+@app.route('/analyze/multi', methods=['POST'])
+def analyze_multi():
+    """
+    Analyze one resume against many job descriptions
+    
+    Expects the PDF as 'resume' and the job descriptions as repeated
+    'job_description' fields. The resume is extracted and featurized once;
+    results are ranked by match percentage, each with the index of its job
+    description in the request.
+    """
+    try:
+        resume_file, job_descriptions, error = validate_multi_request()
+        if error:
+            return error
+        
+        # Cheap checks before any text extraction
+        inspection, error, status = inspect_upload(resume_file)
+        if error:
+            return jsonify({
+                'success': False,
+                'error': error
+            }), status
+        
+        large = is_large(inspection)
+        if not admission.acquire(large):
+            return server_busy()
+        
+        try:
+            content_hash = upload_digest(resume_file)
+            resume_text = get_resume_text(resume_file.stream, content_hash)
+            
+            if not resume_text:
+                return jsonify({
+                    'success': False,
+                    'error': 'Could not extract text from PDF. Please ensure the PDF contains readable text.'
+                }), 400
+            
+            # One skill extraction and one similarity pass for every role
+            ranked = get_match_analysis_multi(resume_text, job_descriptions)
+            resume_skills = ranked[0]['resume_skills']
+            metrics.observe('resume_analyzer_skills', len(resume_skills))
+            
+            record_resumes([(resume_file.filename, resume_skills, content_hash)], [resume_text])
             
+            return jsonify({
+                'success': True,
+                'resume_skills': resume_skills,
+                'fuzzy_skills': ranked[0]['fuzzy_skills'],
+                'taxonomy_version': ranked[0]['taxonomy_version'],
+                'results': [
+                    {
+                        'index': analysis['index'],
+                        'rank': rank,
+                        'match_percentage': analysis['match_percentage'],
+                        'matched_skills': analysis['matched_skills'],
+                        'missing_skills': analysis['missing_skills'],
+                        'jd_skills': analysis['jd_skills']
+                    }
+                    for rank, analysis in enumerate(ranked, start=1)
+                ]
+            })
+            
+        except Exception as e:
             return jsonify({
                 'success': False,
                 'error': f'Error processing resume: {str(e)}'
             }), 500
         
+        finally:
+            admission.release(large)
+        
+    except HTTPException:
+        # e.g. 413 from reading the form: answered by its error handler
+        raise
     except Exception as e:
         return jsonify({
             'success': False,
@@ -138,14 +640,500 @@ def analyze():
         }), 500
 
 
+@app.route('/analyze/batch', methods=['POST'])
+def analyze_batch():
+    """
+    Analyze many resumes against one job description
+    
+    Expects the PDFs as repeated 'resumes' file fields. Results are ranked by
+    match percentage; files that fail validation or parsing are reported
+    inline after the ranked results without aborting the batch.
+    """
+    try:
+        resume_files, job_description, error = validate_batch_request()
+        if error:
+            return error
+        
+        # A batch takes a large slot for the whole extraction and matching
+        if not admission.acquire(large=True):
+            return server_busy()
+        
+        try:
+            return analyze_batch_files(resume_files, job_description)
+        finally:
+            admission.release(large=True)
+        
+    except HTTPException:
+        # e.g. 413 from reading the form: answered by its error handler
+        raise
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': f'Unexpected error: {str(e)}'
+        }), 500
+
+
+def analyze_batch_files(resume_files, job_description: str):
+    """
+    Extracts and ranks the resumes of a validated batch request
+    
+    Args:
+        resume_files: Uploaded PDFs
+        job_description: Job description text
+        
+    Returns:
+        JSON response with the ranked results and inline failures
+    """
+    filenames = []
+    content_hashes = []
+    resume_texts = []
+    failures = []
+    
+    for resume_file in resume_files:
+        filename = resume_file.filename or ''
+        
+        content_hash, resume_text, error = extract_upload(resume_file)
+        if error:
+            failures.append({
+                'filename': filename,
+                'success': False,
+                'error': error
+            })
+            continue
+        
+        filenames.append(filename)
+        content_hashes.append(content_hash)
+        resume_texts.append(resume_text)
+    
+    # Perform matching analysis for the whole batch at once
+    ranked = get_match_analysis_batch(resume_texts, job_description)
+    
+    for analysis in ranked:
+        metrics.observe('resume_analyzer_skills', len(analysis['resume_skills']))
+    
+    record_resumes(
+        [(filenames[analysis['index']], analysis['resume_skills'], content_hashes[analysis['index']])
+         for analysis in ranked],
+        [resume_texts[analysis['index']] for analysis in ranked]
+    )
+    
+    results = []
+    for rank, analysis in enumerate(ranked, start=1):
+        results.append({
+            'filename': filenames[analysis['index']],
+            'success': True,
+            'rank': rank,
+            'match_percentage': analysis['match_percentage'],
+            'matched_skills': analysis['matched_skills'],
+            'missing_skills': analysis['missing_skills'],
+            'resume_skills': analysis['resume_skills'],
+            'jd_skills': analysis['jd_skills'],
+            'fuzzy_skills': analysis['fuzzy_skills'],
+            'taxonomy_version': analysis['taxonomy_version']
+        })
+    
+    return jsonify({
+        'success': True,
+        'analyzed': len(ranked),
+        'failed': len(failures),
+        'results': results + failures
+    })
+
+
+@app.route('/analyze/stream', methods=['POST'])
+def analyze_stream():
+    """
+    Analyze many resumes against one job description, streaming the results
+    
+    Takes the same fields as /analyze/batch. The response is NDJSON: one line
+    per resume in upload order as soon as it is scored, then a summary line
+    with the ranking and timings. Only the ranking is kept between resumes
+    and the uploads wait on disk, so memory stays flat however many resumes
+    are sent; if the client disconnects, resumes not started yet are skipped.
+    """
+    try:
+        resume_files, job_description, error = validate_batch_request()
+        if error:
+            return error
+        
+        # Held until the stream ends or the client goes away
+        if not admission.acquire(large=True):
+            return server_busy()
+        
+    except HTTPException:
+        # e.g. 413 from reading the form: answered by its error handler
+        raise
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': f'Unexpected error: {str(e)}'
+        }), 500
+    
+    try:
+        # stream_analyses closes each upload once scored (see AnalyzerRequest.close)
+        request.uploads_handed_off = True
+        response = Response(stream_with_context(stream_analyses(resume_files, job_description)),
+                            mimetype='application/x-ndjson')
+        # Runs even if the stream never starts
+        response.call_on_close(lambda: admission.release(large=True))
+        # Ask proxies such as nginx to pass each line on right away
+        response.headers['X-Accel-Buffering'] = 'no'
+        return response
+    
+    except Exception as e:
+        # No response will release the slot or close the uploads
+        admission.release(large=True)
+        for resume_file in resume_files:
+            resume_file.close()
+        return jsonify({
+            'success': False,
+            'error': f'Unexpected error: {str(e)}'
+        }), 500
+
+
+def stream_analyses(resume_files, job_description: str):
+    """
+    Generator behind /analyze/stream: extracts and scores one resume at a
+    time and yields its NDJSON line, then the summary line
+    
+    The WSGI server closes the generator when the client disconnects, which
+    stops it at the current yield.
+    """
+    metrics.start_request()
+    start = time.perf_counter()
+    first_result_ms = None
+    ranking = []  # (match_percentage, index, filename)
+    failed = 0
+    status = 499  # client closed the connection, until the summary is sent
+    
+    try:
+        for index, resume_file in enumerate(resume_files):
+            filename = resume_file.filename or ''
+            line = {'type': 'result', 'index': index, 'filename': filename}
+            
+            content_hash, resume_text, error = extract_upload(resume_file)
+            if not error:
+                try:
+                    analysis = get_match_analysis(resume_text, job_description)
+                except Exception as e:
+                    error = f'Error processing resume: {str(e)}'
+            
+            if error:
+                failed += 1
+                line.update({'success': False, 'error': error})
+            else:
+                metrics.observe('resume_analyzer_skills', len(analysis['resume_skills']))
+                record_resumes([(filename, analysis['resume_skills'], content_hash)], [resume_text])
+                ranking.append((analysis['match_percentage'], index, filename))
+                line.update({
+                    'success': True,
+                    'match_percentage': analysis['match_percentage'],
+                    'matched_skills': analysis['matched_skills'],
+                    'missing_skills': analysis['missing_skills'],
+                    'resume_skills': analysis['resume_skills'],
+                    'jd_skills': analysis['jd_skills'],
+                    'fuzzy_skills': analysis['fuzzy_skills'],
+                    'taxonomy_version': analysis['taxonomy_version']
+                })
+            
+            # Drop the upload (and its temporary file) as soon as it is scored
+            resume_file.close()
+            if first_result_ms is None:
+                first_result_ms = (time.perf_counter() - start) * 1000
+            yield app.json.dumps(line) + '\n'
+        
+        ranking.sort(key=lambda entry: (-entry[0], entry[1]))
+        timings = {stage: round(seconds * 1000, 1) for stage, seconds in metrics.request_timings().items()}
+        yield app.json.dumps({
+            'type': 'summary',
+            'success': True,
+            'analyzed': len(ranking),
+            'failed': failed,
+            'ranking': [
+                {'rank': rank, 'index': index, 'filename': filename, 'match_percentage': match_percentage}
+                for rank, (match_percentage, index, filename) in enumerate(ranking, start=1)
+            ],
+            'timings': {
+                'total_ms': round((time.perf_counter() - start) * 1000, 1),
+                'first_result_ms': round(first_result_ms or 0.0, 1),
+                **timings
+            }
+        }) + '\n'
+        status = 200
+    
+    finally:
+        # Uploads not reached yet when the client went away
+        for resume_file in resume_files:
+            resume_file.close()
+        if METRICS_ENABLED:
+            metrics.finish_request('analyze_stream', status, time.perf_counter() - start)
+
+
+@app.route('/jobs', methods=['POST'])
+def submit_job():
+    """
+    Queue an analysis and return its job id immediately
+    
+    Takes the same fields as /analyze. Poll GET /jobs/<job_id> for the result.
+    """
+    try:
+        resume_file, job_description, error = validate_analyze_request()
+        if error:
+            return error
+        
+        # Rejected PDFs are not worth queueing
+        _, error, status = inspect_upload(resume_file)
+        if error:
+            return jsonify({
+                'success': False,
+                'error': error
+            }), status
+        
+        content_hash = upload_digest(resume_file)
+        resume_file.stream.seek(0)
+        
+        try:
+            job_id = get_job_queue().submit(
+                resume_file.stream.read(), content_hash, job_description, resume_file.filename
+            )
+        except QueueFullError as e:
+            response = jsonify({
+                'success': False,
+                'error': str(e)
+            })
+            response.headers['Retry-After'] = '30'
+            return response, 503
+        
+        if JOB_WORKERS > 0:
+            ensure_workers()
+        
+        return jsonify({
+            'success': True,
+            'job_id': job_id,
+            'status': 'queued',
+            'status_url': url_for('job_status', job_id=job_id)
+        }), 202
+        
+    except HTTPException:
+        # e.g. 413 from reading the form: answered by its error handler
+        raise
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': f'Unexpected error: {str(e)}'
+        }), 500
+
+
+@app.route('/jobs/<job_id>')
+def job_status(job_id):
+    """
+    Status of an analysis job, with its results once done
+    """
+    job = get_job_queue().get(job_id)
+    if job is None:
+        return jsonify({
+            'success': False,
+            'error': 'Job not found'
+        }), 404
+    
+    if JOB_WORKERS > 0 and job['status'] in ('queued', 'running'):
+        # Replaces workers (or their owner) that died since the job was submitted
+        ensure_workers()
+    
+    response = {
+        'success': job['status'] != 'failed',
+        'job_id': job['job_id'],
+        'status': job['status'],
+        'attempts': job['attempts']
+    }
+    if job['status'] == 'done':
+        response['results'] = job['result']
+    elif job['status'] == 'failed':
+        response['error'] = job['error']
+    return jsonify(response)
+
+
+@app.route('/candidates/search')
+def search_candidates():
+    """
+    Search previously analyzed candidates by skills
+    
+    Query parameters (one of):
+    - q: boolean skill query, e.g. "kafka AND kubernetes AND NOT java"
+    - job_description: rank candidates by number of matched JD skills
+    - skills: comma-separated skills, ranked the same way
+    
+    limit caps the number of candidates returned (default 20).
+    """
+    try:
+        query = request.args.get('q', '').strip()
+        job_description = request.args.get('job_description', '').strip()
+        skills = [skill.strip() for skill in request.args.get('skills', '').split(',') if skill.strip()]
+        
+        try:
+            limit = int(request.args.get('limit', '20'))
+        except ValueError:
+            limit = 0
+        if limit < 1:
+            return jsonify({
+                'success': False,
+                'error': 'limit must be a positive integer'
+            }), 400
+        
+        store = get_candidate_store()
+        
+        if query:
+            try:
+                found = store.search(query, limit=limit)
+            except QuerySyntaxError as e:
+                return jsonify({
+                    'success': False,
+                    'error': f'Invalid query: {str(e)}'
+                }), 400
+            return jsonify({
+                'success': True,
+                'total': found['total'],
+                'candidates': found['candidates']
+            })
+        
+        if job_description:
+            skills = analyze_job_description(job_description)['skills']
+        
+        if not skills:
+            return jsonify({
+                'success': False,
+                'error': 'A query (q), job_description or skills parameter is required'
+            }), 400
+        
+        candidates = store.top_k(skills, k=limit)
+        return jsonify({
+            'success': True,
+            'skills': sorted({get_taxonomy().canonical(skill) or skill.lower() for skill in skills}),
+            'candidates': candidates
+        })
+        
+    except HTTPException:
+        # e.g. 413 from reading the form: answered by its error handler
+        raise
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': f'Unexpected error: {str(e)}'
+        }), 500
+
+
+@app.route('/candidates/rank', methods=['POST'])
+def rank_stored_candidates():
+    """
+    Rank every stored candidate against many job descriptions at once
+    
+    Expects the job descriptions as repeated 'job_description' form fields
+    and k, the number of candidates per job description (default 50).
+    Candidates are scored from their stored vectors and skills, so nothing
+    is parsed again.
+    """
+    try:
+        job_descriptions = [text.strip() for text in request.form.getlist('job_description')]
+        
+        if not job_descriptions or not all(job_descriptions):
+            return jsonify({
+                'success': False,
+                'error': 'At least one job_description is required, and none may be empty'
+            }), 400
+        
+        if len(job_descriptions) > RANKING_MAX_JOB_DESCRIPTIONS:
+            return jsonify({
+                'success': False,
+                'error': f'Too many job descriptions. At most {RANKING_MAX_JOB_DESCRIPTIONS} per request.'
+            }), 400
+        
+        try:
+            k = int(request.form.get('k', '50'))
+        except ValueError:
+            k = 0
+        if not 1 <= k <= RANKING_MAX_K:
+            return jsonify({
+                'success': False,
+                'error': f'k must be an integer between 1 and {RANKING_MAX_K}'
+            }), 400
+        
+        rankings = rank_candidates(job_descriptions, k=k)
+        return jsonify({
+            'success': True,
+            'rankings': [{'index': index, **ranking} for index, ranking in enumerate(rankings)]
+        })
+        
+    except HTTPException:
+        # e.g. 413 from reading the form: answered by its error handler
+        raise
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': f'Unexpected error: {str(e)}'
+        }), 500
+
+
+@app.route('/taxonomy')
+def taxonomy_info():
+    """
+    Version of the skill taxonomy in use and its canonical skills by category
+    """
+    taxonomy = get_taxonomy()
+    return jsonify({
+        'success': True,
+        **taxonomy.info(),
+        'categories': taxonomy.skills_by_category()
+    })
+
+
+@app.route('/cache/stats')
+def cache_stats():
+    """
+    Hit/miss/eviction counters of the resume text and job description caches
+    """
+    return jsonify({
+        'pdf_text_cache': get_text_cache_stats(),
+        'jd_cache': get_jd_cache_stats()
+    })
+
+
+@app.route('/ready')
+def ready():
+    """
+    Readiness probe: 200 once models are loaded and warmup has finished,
+    503 before that (or if warmup failed)
+    """
+    status = warmup.status()
+    return jsonify({
+        'success': status['ready'],
+        **status
+    }), 200 if status['ready'] else 503
+
+
+@app.route('/metrics')
+def metrics_endpoint():
+    """
+    Stage timings, request latencies and per-resume counters of all worker
+    processes in the Prometheus text format
+    """
+    if not METRICS_ENABLED:
+        return jsonify({
+            'success': False,
+            'error': 'Metrics are disabled'
+        }), 404
+    
+    return Response(metrics.render_prometheus(), mimetype='text/plain; version=0.0.4')
+
+
 @app.errorhandler(413)
 def request_entity_too_large(error):
     """
-    Handle file size limit exceeded
+    Handle file size limit exceeded (the limit depends on the route)
     """
+    limit_mb = request.max_content_length / (1024 * 1024)
     return jsonify({
         'success': False,
-        'error': 'File size exceeds maximum allowed size (16MB)'
+        'error': f'File size exceeds maximum allowed size ({limit_mb:g}MB)'
     }), 413
 
 
@@ -180,6 +1168,8 @@ if __name__ == '__main__':
     print("\nStarting Flask server...")
     print("=" * 60)
     
+    # Metrics files of earlier runs would be summed into /metrics
+    metrics.clear_files()
     app.run(debug=True, host='0.0.0.0', port=5000)
 
 
@@ -0,0 +1,4 @@
+"""
+Smart Resume Analyzer Benchmarks Package
+Run individual benchmarks with: python -m benchmarks.<name>
+"""
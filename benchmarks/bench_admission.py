@@ -0,0 +1,142 @@
+"""
+Admission Control Load Test
+Runs gunicorn with one threaded worker and measures the latency of small
+/analyze requests, first alone and then while clients keep sending large
+PDFs, with admission control on (ANALYZE_MAX_IN_FLIGHT) and off
+
+Usage:
+    python -m benchmarks.bench_admission [--seconds 15] [--small-clients 2] [--large-clients 4]
+"""
+
+import argparse
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from typing import Dict, List
+
+from benchmarks.bench_jobs import post_multipart
+from benchmarks.bench_preload import free_port, wait_ready
+from benchmarks.corpus import make_job_description, make_resume
+from benchmarks.suite import percentile
+
+
+MODES = {
+    # name: environment of the server
+    'off': {'ANALYZE_MAX_IN_FLIGHT': '0'},
+    'on': {'ANALYZE_MAX_IN_FLIGHT': '2', 'ANALYZE_MAX_QUEUE': '4'},
+}
+
+LARGE_PAGES = 40
+
+
+def client(url: str, pdf: bytes, job_description: str, stop: threading.Event, samples: List):
+    """
+    Closed loop: sends the PDF again as soon as the previous response
+    arrives; after a 503 it waits a second (less than Retry-After, to keep
+    the pressure on)
+    """
+    while not stop.is_set():
+        start = time.perf_counter()
+        status, _ = post_multipart(f'{url}/analyze', {'job_description': job_description},
+                                   {'resume': ('resume.pdf', pdf)})
+        samples.append((status, time.perf_counter() - start))
+        if status == 503:
+            stop.wait(1.0)
+
+
+def run_phase(url: str, seconds: float, small: bytes, large: bytes, job_description: str,
+              small_clients: int, large_clients: int) -> Dict:
+    stop = threading.Event()
+    small_samples, large_samples = [], []
+    threads = [threading.Thread(target=client, args=(url, small, job_description, stop, small_samples))
+               for _ in range(small_clients)]
+    threads += [threading.Thread(target=client, args=(url, large, job_description, stop, large_samples))
+                for _ in range(large_clients)]
+    for thread in threads:
+        thread.start()
+    time.sleep(seconds)
+    stop.set()
+    for thread in threads:
+        thread.join()
+
+    latencies = sorted(elapsed * 1000 for status, elapsed in small_samples if status == 200)
+    return {
+        'small_ok': len(latencies),
+        'small_503': sum(status == 503 for status, _ in small_samples),
+        'small_p50_ms': percentile(latencies, 0.50) if latencies else None,
+        'small_p95_ms': percentile(latencies, 0.95) if latencies else None,
+        'small_p99_ms': percentile(latencies, 0.99) if latencies else None,
+        'large_ok': sum(status == 200 for status, _ in large_samples),
+        'large_503': sum(status == 503 for status, _ in large_samples),
+    }
+
+
+def run_mode(name: str, args, small: bytes, large: bytes, job_description: str) -> List[Dict]:
+    port = free_port()
+    url = f'http://127.0.0.1:{port}'
+
+    with tempfile.TemporaryDirectory() as directory:
+        env = dict(
+            os.environ,
+            **MODES[name],
+            PDF_TEXT_CACHE_ENABLED='false',
+            CANDIDATE_STORE_ENABLED='false',
+            JOB_WORKERS='0',
+            METRICS_DIR=os.path.join(directory, 'metrics'),
+        )
+        log_path = os.path.join(directory, 'gunicorn.log')
+        log = open(log_path, 'w')
+        server = subprocess.Popen(
+            [sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py', '-w', '1',
+             '--threads', str(args.threads), '-b', f'127.0.0.1:{port}', 'app:app'],
+            env=env, stdout=log, stderr=log
+        )
+        try:
+            wait_ready(url)
+            results = [
+                run_phase(url, args.seconds, small, large, job_description, args.small_clients, 0),
+                run_phase(url, args.seconds, small, large, job_description, args.small_clients,
+                          args.large_clients),
+            ]
+        except Exception:
+            with open(log_path) as f:
+                print(f"gunicorn log ({name}):\n{f.read()[-3000:]}")
+            raise
+        finally:
+            server.terminate()
+            server.wait()
+            log.close()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--seconds', type=float, default=15.0, help='Duration of each phase')
+    parser.add_argument('--small-clients', type=int, default=2)
+    parser.add_argument('--large-clients', type=int, default=4)
+    parser.add_argument('--threads', type=int, default=8, help='gunicorn threads')
+    parser.add_argument('--modes', nargs='+', default=list(MODES), choices=list(MODES))
+    args = parser.parse_args()
+
+    rng = random.Random(21)
+    small = make_resume(1, 0.05, rng)['pdf']
+    large = make_resume(LARGE_PAGES, 0.05, rng)['pdf']
+    job_description = make_job_description(150, rng)
+
+    print(f"{args.small_clients} clients sending 1-page resumes, then {args.large_clients} more sending "
+          f"{LARGE_PAGES}-page resumes; one gunicorn worker with {args.threads} threads")
+    print(f"{'admission':<10} {'phase':<13} {'small ok':>9} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} "
+          f"{'small 503':>10} {'large ok':>9} {'large 503':>10}")
+    for name in args.modes:
+        for phase, result in zip(('small only', '+ large'), run_mode(name, args, small, large, job_description)):
+            print(f"{name:<10} {phase:<13} {result['small_ok']:>9} {result['small_p50_ms'] or 0:>8.1f} "
+                  f"{result['small_p95_ms'] or 0:>8.1f} {result['small_p99_ms'] or 0:>8.1f} "
+                  f"{result['small_503']:>10} {result['large_ok']:>9} {result['large_503']:>10}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,142 @@
+"""
+Candidate Store Benchmark
+Builds an inverted skill index over synthetic candidates and measures boolean
+query, top-k and single-insert latency, checking results against a
+brute-force scan
+
+Usage:
+    python -m benchmarks.bench_candidate_store [--candidates 100000]
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import time
+from typing import List, Set
+
+import numpy as np
+
+from modules.candidate_store import CandidateStore, parse_query
+from modules.skill_db import SKILLS_DATABASE
+
+
+QUERIES = [
+    'python',
+    'kafka AND kubernetes',
+    'kafka AND kubernetes AND NOT java',
+    '(react OR angular OR vue) AND typescript',
+    'machine learning AND (pytorch OR tensorflow) AND NOT java',
+    'NOT python',
+    '"spring boot" OR django OR flask',
+]
+TOP_K_SKILLS = ['python', 'django', 'flask', 'docker', 'kubernetes', 'aws', 'postgresql',
+                'redis', 'kafka', 'git', 'rest api', 'microservices', 'linux', 'jenkins', 'terraform']
+TARGET_MS = 5.0
+
+
+def synthetic_candidates(count: int, rng: random.Random) -> List[List[str]]:
+    # Zipf-like skill popularity: a few skills are on most resumes
+    skills = sorted(SKILLS_DATABASE)
+    rng.shuffle(skills)
+    for skill in ['python', 'java', 'git', 'docker', 'aws', 'kubernetes', 'kafka', 'react']:
+        if skill in skills:
+            skills.remove(skill)
+            skills.insert(0, skill)
+    weights = [1 / (rank + 1) ** 0.8 for rank in range(len(skills))]
+    return [sorted(set(rng.choices(skills, weights, k=rng.randint(8, 40)))) for _ in range(count)]
+
+
+def brute_force(node, candidates: List[Set[str]]) -> Set[int]:
+    kind = node[0]
+    if kind == 'skill':
+        return {i + 1 for i, skills in enumerate(candidates) if node[1] in skills}
+    if kind == 'not':
+        return set(range(1, len(candidates) + 1)) - brute_force(node[1], candidates)
+    results = [brute_force(child, candidates) for child in node[1]]
+    return set.intersection(*results) if kind == 'and' else set.union(*results)
+
+
+def latency_ms(function, repeats: int = 50) -> List[float]:
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        function()
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--candidates', type=int, default=100000)
+    args = parser.parse_args()
+
+    rng = random.Random(12)
+    candidates = synthetic_candidates(args.candidates, rng)
+    candidate_sets = [set(skills) for skills in candidates]
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'candidates.sqlite3')
+        store = CandidateStore(path)
+
+        start = time.perf_counter()
+        for offset in range(0, len(candidates), 5000):
+            store.add_candidates([
+                (f'candidate-{offset + i}.pdf', skills, None)
+                for i, skills in enumerate(candidates[offset:offset + 5000])
+            ])
+        build_s = time.perf_counter() - start
+        store.merge_segments()
+
+        postings_bytes, postings_count = store._connection().execute(
+            'SELECT SUM(LENGTH(ids)), SUM(count) FROM postings'
+        ).fetchone()
+        print(f"Indexed {store.count()} candidates in {build_s:.1f} s, "
+              f"{postings_count} postings in {postings_bytes / 1024:.0f} KiB "
+              f"({postings_bytes / postings_count:.2f} bytes/posting, raw int32 = 4)")
+        print()
+        print(f"{'query':<60} {'hits':>7} {'cold ms':>9} {'p50 ms':>8} {'p95 ms':>8}")
+
+        worst_p50 = 0.0
+        for query in QUERIES:
+            expected = brute_force(parse_query(query), candidate_sets)
+
+            # Cold: a fresh store has to read and decompress every posting list
+            cold = CandidateStore(path)
+            start = time.perf_counter()
+            found = cold.search(query, limit=10)
+            cold_ms = (time.perf_counter() - start) * 1000
+
+            ids = cold._evaluate(parse_query(query))
+            assert found['total'] == len(expected) and set(ids.tolist()) == expected, query
+
+            timings = sorted(latency_ms(lambda: store.search(query, limit=10)))
+            worst_p50 = max(worst_p50, timings[len(timings) // 2])
+            print(f"{query:<60} {found['total']:>7} {cold_ms:>9.2f} "
+                  f"{timings[len(timings) // 2]:>8.2f} {timings[int(len(timings) * 0.95)]:>8.2f}")
+
+        # Top-k by number of matched JD skills
+        counts = np.array([len(skills & set(TOP_K_SKILLS)) for skills in candidate_sets])
+        expected_top = sorted(range(len(counts)), key=lambda i: (-counts[i], i))[:10]
+        top = store.top_k(TOP_K_SKILLS, k=10)
+        assert [candidate['id'] for candidate in top] == [i + 1 for i in expected_top]
+
+        timings = sorted(latency_ms(lambda: store.top_k(TOP_K_SKILLS, k=10)))
+        p50 = timings[len(timings) // 2]
+        worst_p50 = max(worst_p50, p50)
+        print(f"{'top-10 by ' + str(len(TOP_K_SKILLS)) + ' JD skills':<60} {len(top):>7} {'':>9} "
+              f"{p50:>8.2f} {timings[int(len(timings) * 0.95)]:>8.2f}")
+
+        # One resume at a time, as the routes add them: appends a segment per
+        # skill whatever the size of the store, merging every few inserts
+        extra = synthetic_candidates(200, rng)
+        timings = sorted(latency_ms(lambda: store.add_candidate('single.pdf', extra.pop()), repeats=200))
+        print(f"{'single insert into ' + str(args.candidates) + ' candidates':<60} {'':>7} {'':>9} "
+              f"{timings[len(timings) // 2]:>8.2f} {timings[int(len(timings) * 0.95)]:>8.2f}")
+        print()
+        print(f"Results match a brute-force scan. Target: warm p50 under {TARGET_MS:.0f} ms "
+              f"({'met' if worst_p50 < TARGET_MS else 'NOT met'}, slowest {worst_p50:.2f} ms)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,59 @@
+"""
+Skill Extraction Modes Benchmark
+Measures documents per second for each extraction mode, one call per
+document (extract_skills) and batched (extract_skills_many)
+
+Usage:
+    python -m benchmarks.bench_extraction_modes [--documents 200] [--n-process 1]
+"""
+
+import argparse
+import random
+import time
+
+from benchmarks.bench_skill_matcher import synthetic_document
+from modules.skill_extractor import (
+    SPACY_PIPELINE_PROFILES,
+    VOCABULARY_MODE,
+    extract_skills,
+    extract_skills_many,
+    load_spacy_model
+)
+
+
+def throughput(function, count: int) -> float:
+    start = time.perf_counter()
+    function()
+    return count / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--documents', type=int, default=200)
+    parser.add_argument('--batch-size', type=int, default=32)
+    parser.add_argument('--n-process', type=int, default=1)
+    args = parser.parse_args()
+
+    rng = random.Random(3)
+    documents = [synthetic_document(rng) for _ in range(args.documents)]
+
+    print(f"{'mode':>8} {'docs/s (single)':>16} {'docs/s (batched)':>17}")
+    for mode in list(SPACY_PIPELINE_PROFILES) + [VOCABULARY_MODE]:
+        if mode != VOCABULARY_MODE:
+            try:
+                load_spacy_model(mode)
+            except Exception as e:
+                print(f"{mode:>8} skipped: {e}")
+                continue
+
+        single = throughput(lambda: [extract_skills(doc, mode=mode) for doc in documents], len(documents))
+        batched = throughput(
+            lambda: extract_skills_many(documents, batch_size=args.batch_size,
+                                        n_process=args.n_process, mode=mode),
+            len(documents)
+        )
+        print(f"{mode:>8} {single:>16.1f} {batched:>17.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,190 @@
+"""
+Fuzzy Skill Matching Benchmark
+Corrupts the skills in synthetic resumes (split words, typos, punctuation)
+and measures how many each matcher still finds, the skills fuzzy matching
+adds to clean text (synthetic resumes, and English prose from the standard
+library's docstrings, where every one is a false positive), and the time
+per document of exact and exact + fuzzy matching, with the candidate cache
+cold and warm
+
+Usage:
+    python -m benchmarks.bench_fuzzy_skills [--documents 200] [--words 800]
+"""
+
+import argparse
+import importlib
+import inspect
+import random
+import time
+from typing import Callable, Dict, List, Set, Tuple
+
+from benchmarks.corpus import FILLER
+from modules.skill_db import get_taxonomy
+from modules.skill_matcher import fuzzy_key
+from config import SKILL_FUZZY_MIN_LENGTHS
+
+
+# Modules whose docstrings serve as clean English prose
+PROSE_MODULES = (
+    'argparse', 'asyncio', 'calendar', 'collections', 'csv', 'datetime', 'decimal',
+    'difflib', 'email', 'functools', 'http.client', 'inspect', 'itertools', 'json',
+    'logging', 'os', 'pathlib', 'pickle', 'random', 're', 'shutil', 'socket',
+    'sqlite3', 'ssl', 'statistics', 'string', 'subprocess', 'tarfile', 'textwrap',
+    'threading', 'typing', 'unittest', 'urllib.request', 'zipfile',
+)
+
+KEYBOARD = 'abcdefghijklmnopqrstuvwxyz'
+
+
+def typo(word: str, rng: random.Random) -> str:
+    """
+    One random deletion, insertion, substitution or transposition inside a word
+    """
+    position = rng.randrange(1, len(word) - 1)
+    kind = rng.choice(('delete', 'insert', 'substitute', 'transpose'))
+    if kind == 'delete':
+        return word[:position] + word[position + 1:]
+    if kind == 'insert':
+        return word[:position] + rng.choice(KEYBOARD) + word[position:]
+    if kind == 'substitute':
+        return word[:position] + rng.choice(KEYBOARD) + word[position + 1:]
+    return word[:position - 1] + word[position] + word[position - 1] + word[position + 1:]
+
+
+def corrupt(skill: str, rng: random.Random) -> Tuple[str, str]:
+    """
+    A corrupted spelling of a skill and the kind of corruption
+
+    Split words need 6 characters (nobody writes 'g it'), typos 8 (shorter
+    names are too close to ordinary words to allow edits); other skills keep
+    their spelling with punctuation changed, when they have any
+    """
+    if ' ' not in skill and len(skill) >= 6 and rng.random() < 0.5:
+        position = rng.randrange(3, len(skill) - 2)
+        return skill[:position] + ' ' + skill[position:], 'split'
+    words = skill.split()
+    long_words = [i for i, word in enumerate(words) if len(word) >= 8]
+    if long_words:
+        i = rng.choice(long_words)
+        words[i] = typo(words[i], rng)
+        return ' '.join(words), 'typo'
+    variant = skill.replace('.', ' ').replace('-', ' ')
+    if variant != skill:
+        return variant, 'punctuation'
+    return skill, 'unchanged'
+
+
+def make_documents(count: int, words: int, rng: random.Random,
+                   corrupted: bool) -> List[Tuple[str, Set[str], Dict[str, str]]]:
+    """
+    Synthetic resumes
+
+    Returns:
+        (text, skills written, corrupted skill -> kind of corruption) tuples
+    """
+    taxonomy = get_taxonomy()
+    documents = []
+    for _ in range(count):
+        text, skills, changed = [], set(), {}
+        for _ in range(words):
+            if rng.random() < 0.05:
+                skill = rng.choice(taxonomy.skills)
+                spelling, kind = corrupt(skill, rng) if corrupted else (skill, 'unchanged')
+                skills.add(skill)
+                if kind != 'unchanged':
+                    changed[skill] = kind
+                text.append(spelling)
+            else:
+                text.append(rng.choice(FILLER))
+        documents.append((' '.join(text), skills, changed))
+    return documents
+
+
+def prose_documents() -> List[str]:
+    docs = []
+    for name in PROSE_MODULES:
+        module = importlib.import_module(name)
+        for _, member in inspect.getmembers(module):
+            doc = inspect.getdoc(member)
+            if doc and len(doc) > 200:
+                docs.append(doc.lower())
+    return list(dict.fromkeys(docs))
+
+
+def per_document_ms(function: Callable[[str], object], texts: List[str]) -> float:
+    start = time.perf_counter()
+    for text in texts:
+        function(text)
+    return (time.perf_counter() - start) / len(texts) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--documents', type=int, default=200)
+    parser.add_argument('--words', type=int, default=800, help='Words per resume')
+    args = parser.parse_args()
+
+    rng = random.Random(25)
+    taxonomy = get_taxonomy()
+    index = taxonomy.fuzzy_index
+
+    def exact(text: str) -> Set[str]:
+        return taxonomy.find_skills(text)
+
+    def fuzzy(text: str) -> Set[str]:
+        return taxonomy.find_skills(text) | set(taxonomy.find_skills_fuzzy(text, SKILL_FUZZY_MIN_LENGTHS))
+
+    corrupted = make_documents(args.documents, args.words, rng, corrupted=True)
+    kinds = ('split', 'typo', 'punctuation')
+    written = {kind: 0 for kind in ('all',) + kinds}
+    found = {name: dict.fromkeys(written, 0) for name in ('exact', 'fuzzy')}
+    for text, skills, changed in corrupted:
+        written['all'] += len(skills)
+        for kind in changed.values():
+            written[kind] += 1
+        for name, function in (('exact', exact), ('fuzzy', fuzzy)):
+            matched = function(text)
+            found[name]['all'] += len(skills & matched)
+            for skill in changed.keys() & matched:
+                found[name][changed[skill]] += 1
+    print(f"Recall on {args.documents} resumes with corrupted skills "
+          f"({written['all']} skills written: " + ', '.join(f"{written[kind]} {kind}" for kind in kinds) + ")")
+    print(f"  {'':<6} " + ' '.join(f"{kind:>12}" for kind in written))
+    for name, counts in found.items():
+        print(f"  {name:<6} " + ' '.join(f"{counts[kind] / written[kind]:>12.1%}" for kind in written))
+
+    clean = make_documents(args.documents, args.words, rng, corrupted=False)
+    recovered = added = 0
+    for text, skills, _ in clean:
+        extra = fuzzy(text) - exact(text)
+        recovered += len(extra & skills)
+        added += len(extra - skills)
+    print("\nSkills fuzzy matching adds to clean text")
+    print(f"  synthetic resumes: {recovered} written ones the exact matcher misses, "
+          f"{added} not written (false positives)")
+    extra = {}
+    prose = prose_documents()
+    for text in prose:
+        for skill in fuzzy(text) - exact(text):
+            extra[skill] = extra.get(skill, 0) + 1
+    listed = ''.join(f", {skill} ({count})" for skill, count in sorted(extra.items(), key=lambda item: -item[1]))
+    print(f"  stdlib docstrings ({len(prose)} documents, {sum(len(text.split()) for text in prose)} words): "
+          f"{sum(extra.values())} false positives{listed}")
+
+    texts = [text for text, _, _ in corrupted]
+    exact_ms = min(per_document_ms(exact, texts) for _ in range(3))
+    index._cache.clear()
+    cold_ms = per_document_ms(fuzzy, texts)
+    warm_ms = min(per_document_ms(fuzzy, texts) for _ in range(3))
+    print(f"\nTime per {args.words}-word resume ({len(taxonomy.aliases)} skill names and aliases, "
+          f"{len(index._keys_by_delete)} deletion keys)")
+    print(f"  exact                {exact_ms:6.2f} ms")
+    print(f"  exact + fuzzy, cold  {cold_ms:6.2f} ms ({cold_ms / exact_ms:.1f}x)")
+    print(f"  exact + fuzzy, warm  {warm_ms:6.2f} ms ({warm_ms / exact_ms:.1f}x)")
+
+    longest = max(len(fuzzy_key(skill)) for skill in taxonomy.aliases)
+    print(f"  (windows of up to {index.max_words} words and {longest + index.max_distance} characters)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,103 @@
+"""
+Import Time Benchmark
+Measures the cold import time of the package and its main modules in fresh
+interpreters, lists which heavy dependencies each import pulls in, and
+checks `import modules` against its target
+
+Usage:
+    python -m benchmarks.bench_import [--runs 15] [--detail modules.matcher]
+"""
+
+import argparse
+import json
+import re
+import statistics
+import subprocess
+import sys
+from typing import Dict, List
+
+
+TARGETS = ['modules', 'modules.skill_db', 'modules.skill_extractor', 'modules.resume_parser',
+           'modules.matcher', 'app']
+
+# Wall time budget for `import modules` (median, ms)
+IMPORT_MODULES_TARGET_MS = 25.0
+
+HEAVY_DEPENDENCIES = ['PyPDF2', 'spacy', 'sklearn', 'numpy', 'flask']
+
+_PROBE = '''
+import json, sys, time
+start = time.perf_counter()
+import {target}
+elapsed = time.perf_counter() - start
+print(json.dumps({{'ms': elapsed * 1000, 'loaded': [name for name in {heavy!r} if name in sys.modules]}}))
+'''
+
+
+def measure(target: str, runs: int) -> Dict:
+    """
+    Imports target in runs fresh interpreters
+
+    Returns:
+        Dictionary with median_ms, min_ms and the heavy dependencies loaded
+    """
+    times = []
+    loaded: List[str] = []
+    for _ in range(runs):
+        output = subprocess.run(
+            [sys.executable, '-c', _PROBE.format(target=target, heavy=HEAVY_DEPENDENCIES)],
+            capture_output=True, text=True, check=True
+        ).stdout
+        result = json.loads(output.strip().splitlines()[-1])
+        times.append(result['ms'])
+        loaded = result['loaded']
+    return {'median_ms': statistics.median(times), 'min_ms': min(times), 'loaded': loaded}
+
+
+def importtime_detail(target: str, top: int = 15) -> List[str]:
+    """
+    The imports with the largest self time under python -X importtime
+    """
+    stderr = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {target}'],
+        capture_output=True, text=True, check=True
+    ).stderr
+    rows = []
+    for line in stderr.splitlines():
+        match = re.match(r'import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)', line)
+        if match:
+            rows.append((int(match.group(1)), int(match.group(2)), match.group(4)))
+    rows.sort(reverse=True)
+    return [f"{name:<45} self {self_us / 1000:>7.1f} ms  cumulative {total_us / 1000:>7.1f} ms"
+            for self_us, total_us, name in rows[:top]]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--runs', type=int, default=15)
+    parser.add_argument('--targets', nargs='+', default=TARGETS)
+    parser.add_argument('--detail', metavar='MODULE', help='Also list the slowest imports of MODULE')
+    args = parser.parse_args()
+
+    print(f"{'import':<26} {'median ms':>10} {'min ms':>8}  heavy dependencies loaded")
+    results = {}
+    for target in args.targets:
+        results[target] = result = measure(target, args.runs)
+        print(f"{target:<26} {result['median_ms']:>10.1f} {result['min_ms']:>8.1f}  "
+              f"{', '.join(result['loaded']) or '-'}")
+
+    if args.detail:
+        print(f"\nSlowest imports of {args.detail} (python -X importtime):")
+        for line in importtime_detail(args.detail):
+            print(f"  {line}")
+
+    if 'modules' in results:
+        median = results['modules']['median_ms']
+        if median > IMPORT_MODULES_TARGET_MS:
+            print(f"\nimport modules: {median:.1f} ms, over the {IMPORT_MODULES_TARGET_MS:.0f} ms target")
+            sys.exit(1)
+        print(f"\nimport modules: {median:.1f} ms (target {IMPORT_MODULES_TARGET_MS:.0f} ms)")
+
+
+if __name__ == '__main__':
+    main()
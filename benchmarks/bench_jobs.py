@@ -0,0 +1,113 @@
+"""
+Async Jobs Load Benchmark
+Drives a running server with concurrent clients and compares request latency
+of the synchronous /analyze route with POST /jobs, plus the time until an
+async job result is available
+
+Usage:
+    python app.py   (or gunicorn app:app) in another shell, then
+    python -m benchmarks.bench_jobs --url http://localhost:5000 [--clients 16] [--requests 200]
+"""
+
+import argparse
+import json
+import random
+import time
+import urllib.error
+import urllib.request
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.bench_pdf_pipeline import synthetic_pdf
+
+
+def post_multipart(url: str, fields: dict, files: dict):
+    boundary = uuid.uuid4().hex
+    body = bytearray()
+    for name, value in fields.items():
+        body += (f'--{boundary}\r\nContent-Disposition: form-data; name="{name}"\r\n\r\n'
+                 f'{value}\r\n').encode('utf-8')
+    for name, (filename, data) in files.items():
+        body += (f'--{boundary}\r\nContent-Disposition: form-data; name="{name}"; '
+                 f'filename="{filename}"\r\nContent-Type: application/pdf\r\n\r\n').encode('utf-8')
+        body += data + b'\r\n'
+    body += f'--{boundary}--\r\n'.encode('utf-8')
+
+    request = urllib.request.Request(url, data=bytes(body), method='POST', headers={
+        'Content-Type': f'multipart/form-data; boundary={boundary}'
+    })
+    try:
+        with urllib.request.urlopen(request, timeout=300) as response:
+            return response.status, json.loads(response.read())
+    except urllib.error.HTTPError as e:
+        return e.code, json.loads(e.read() or b'{}')
+
+
+def get_json(url: str):
+    with urllib.request.urlopen(url, timeout=60) as response:
+        return json.loads(response.read())
+
+
+def percentiles(values) -> str:
+    values = sorted(values)
+    if not values:
+        return 'n/a'
+
+    def pick(q):
+        return values[min(len(values) - 1, int(q * len(values)))] * 1000
+
+    return f"p50={pick(0.50):8.1f} ms  p95={pick(0.95):8.1f} ms  p99={pick(0.99):8.1f} ms"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--url', default='http://localhost:5000')
+    parser.add_argument('--clients', type=int, default=16)
+    parser.add_argument('--requests', type=int, default=200)
+    parser.add_argument('--large-fraction', type=float, default=0.1,
+                        help='Share of 50-page documents among the 2-page ones')
+    args = parser.parse_args()
+
+    rng = random.Random(21)
+    small, large = synthetic_pdf(2, rng), synthetic_pdf(50, rng)
+    documents = [large if rng.random() < args.large_fraction else small for _ in range(args.requests)]
+    fields = {'job_description': 'python developer with flask, docker, kubernetes and aws'}
+
+    def sync_call(pdf):
+        start = time.perf_counter()
+        status, _ = post_multipart(f'{args.url}/analyze', fields, {'resume': ('resume.pdf', pdf)})
+        return time.perf_counter() - start, status
+
+    def async_call(pdf):
+        start = time.perf_counter()
+        status, payload = post_multipart(f'{args.url}/jobs', fields, {'resume': ('resume.pdf', pdf)})
+        submitted = time.perf_counter() - start
+        if status != 202:
+            return submitted, None, status
+        while True:
+            job = get_json(f"{args.url}/jobs/{payload['job_id']}")
+            if job['status'] in ('done', 'failed'):
+                return submitted, time.perf_counter() - start, status
+            time.sleep(0.1)
+
+    with ThreadPoolExecutor(max_workers=args.clients) as executor:
+        start = time.perf_counter()
+        sync_results = list(executor.map(sync_call, documents))
+        sync_elapsed = time.perf_counter() - start
+
+        start = time.perf_counter()
+        async_results = list(executor.map(async_call, documents))
+        async_elapsed = time.perf_counter() - start
+
+    print(f"{args.requests} requests, {args.clients} concurrent clients, "
+          f"{args.large_fraction:.0%} large documents")
+    print(f"sync  /analyze response:  {percentiles([r[0] for r in sync_results if r[1] == 200])}"
+          f"  errors={sum(r[1] != 200 for r in sync_results)}  total={sync_elapsed:.1f}s")
+    print(f"async POST /jobs response: {percentiles([r[0] for r in async_results])}"
+          f"  rejected={sum(r[2] != 202 for r in async_results)}")
+    print(f"async result available:   {percentiles([r[1] for r in async_results if r[1]])}"
+          f"  total={async_elapsed:.1f}s")
+
+
+if __name__ == '__main__':
+    main()
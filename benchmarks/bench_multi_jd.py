@@ -0,0 +1,94 @@
+"""
+Multi-Role Benchmark
+Scores one resume PDF against N job descriptions, once per job description
+as a client calling /analyze N times would (text extraction, skill
+extraction and similarity every time), and with get_match_analysis_multi
+(one extraction, one similarity pass), for both similarity engines; then
+compares their scores
+
+Usage:
+    python -m benchmarks.bench_multi_jd [--counts 1 10 50 200] [--pages 2]
+"""
+
+import os
+
+# Every extraction runs; the JD cache stays in memory, warm as for open roles
+os.environ.setdefault('PDF_TEXT_CACHE_ENABLED', 'false')
+os.environ.setdefault('JD_CACHE_BACKEND', 'memory')
+
+import argparse
+import io
+import random
+import time
+from typing import Dict, List
+
+import numpy as np
+from scipy.stats import spearmanr
+
+from benchmarks.corpus import make_job_description, make_resume
+from modules import matcher
+from modules.matcher import SIMILARITY_ENGINES, get_match_analysis, get_match_analysis_multi
+from modules.resume_parser import get_resume_text
+
+
+def one_by_one(pdf: bytes, job_descriptions: List[str]) -> List[float]:
+    scores = []
+    for job_description in job_descriptions:
+        resume_text = get_resume_text(io.BytesIO(pdf))
+        scores.append(get_match_analysis(resume_text, job_description)['match_percentage'])
+    return scores
+
+
+def multi(pdf: bytes, job_descriptions: List[str]) -> List[float]:
+    resume_text = get_resume_text(io.BytesIO(pdf))
+    analyses = get_match_analysis_multi(resume_text, job_descriptions)
+    return [analysis['match_percentage'] for analysis in sorted(analyses, key=lambda a: a['index'])]
+
+
+def best_of(function, *args, repeat: int = 3) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function(*args)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--counts', type=int, nargs='+', default=[1, 10, 50, 200])
+    parser.add_argument('--pages', type=int, default=2)
+    args = parser.parse_args()
+
+    rng = random.Random(24)
+    pdf = make_resume(args.pages, 0.05, rng)['pdf']
+    job_descriptions = [make_job_description(rng.choice((40, 150, 600)), rng) for _ in range(max(args.counts))]
+
+    print(f"One {args.pages}-page resume against N job descriptions (JD cache warm)")
+    print(f"{'engine':<8} {'N':>5} {'one by one ms':>14} {'multi ms':>9} {'speedup':>8}")
+    agreement: Dict[str, Dict] = {}
+    for engine in SIMILARITY_ENGINES:
+        matcher.SIMILARITY_ENGINE = engine
+        # Warms the JD cache and the models
+        one_by_one(pdf, job_descriptions)
+        for count in args.counts:
+            separate = best_of(one_by_one, pdf, job_descriptions[:count])
+            combined = best_of(multi, pdf, job_descriptions[:count])
+            print(f"{engine:<8} {count:>5} {separate * 1000:>14.1f} {combined * 1000:>9.1f} "
+                  f"{separate / combined:>7.1f}x")
+
+        expected = np.array(one_by_one(pdf, job_descriptions))
+        scores = np.array(multi(pdf, job_descriptions))
+        agreement[engine] = {
+            'max_difference': float(np.abs(expected - scores).max()),
+            'spearman': float(spearmanr(expected, scores)[0])
+        }
+
+    print(f"\nScores of get_match_analysis_multi vs /analyze, {max(args.counts)} job descriptions")
+    for engine, result in agreement.items():
+        print(f"{engine:<8} max difference {result['max_difference']:6.2f} points, "
+              f"Spearman {result['spearman']:.3f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,50 @@
+"""
+Parallel PDF Extraction Benchmark
+Compares in-process page extraction with the process pool mode for 1-, 10-
+and 100-page documents; meaningful on a multi-core machine
+
+Usage:
+    python -m benchmarks.bench_parallel_pdf [--pages 1 10 100] [--repeat 3]
+"""
+
+import argparse
+import os
+import random
+import time
+
+import modules.resume_parser as resume_parser
+from benchmarks.bench_pdf_pipeline import synthetic_pdf
+
+
+def best_of(function, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--pages', type=int, nargs='+', default=[1, 10, 100])
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    # Send every document to the pool so small ones are measured too
+    resume_parser.PDF_PARALLEL_MIN_PAGES = 1
+    resume_parser._get_page_pool()
+
+    rng = random.Random(17)
+    print(f"CPU cores: {os.cpu_count()}, pool workers: {resume_parser._get_page_pool().size}")
+    print(f"{'pages':>6} {'serial s':>9} {'parallel s':>11} {'speedup':>8}")
+
+    for pages in args.pages:
+        pdf = synthetic_pdf(pages, rng)
+        serial = best_of(lambda: resume_parser.extract_pdf(pdf, None, None, mode='serial'), args.repeat)
+        parallel = best_of(lambda: resume_parser.extract_pdf(pdf, None, None, mode='parallel'), args.repeat)
+        print(f"{pages:>6} {serial:>9.3f} {parallel:>11.3f} {serial / parallel:>7.2f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,91 @@
+"""
+PDF Pipeline Benchmark
+Compares the previous whole-document extraction (string concatenation plus
+four full-text regex passes) with the page-by-page streaming pipeline on
+synthetic large PDFs: time per input page and peak Python memory (timings
+include tracemalloc overhead)
+
+Usage:
+    python -m benchmarks.bench_pdf_pipeline [--pages 10 100 300]
+"""
+
+import argparse
+import io
+import random
+import re
+import time
+import tracemalloc
+
+import PyPDF2
+
+from benchmarks.bench_skill_matcher import synthetic_document
+from benchmarks.pdfgen import make_pdf
+from modules.resume_parser import extract_text_from_pdf
+
+
+LINES_PER_PAGE = 60
+
+
+def legacy_extract(pdf: bytes) -> str:
+    """
+    The previous extract_text_from_pdf and clean_text
+    """
+    text = ""
+    pdf_reader = PyPDF2.PdfReader(io.BytesIO(pdf))
+    for page_num in range(len(pdf_reader.pages)):
+        text += pdf_reader.pages[page_num].extract_text() + "\n"
+    text = re.sub(r'\s+', ' ', text)
+    text = re.sub(r'\n\s*\n', '\n', text)
+    text = text.lower()
+    text = re.sub(r'[^\w\s\.\-\+\#]', ' ', text)
+    text = re.sub(r'\s+', ' ', text)
+    return text.strip()
+
+
+def synthetic_pdf(pages: int, rng: random.Random) -> bytes:
+    page_lines = []
+    for _ in range(pages):
+        words = synthetic_document(rng).split()
+        page_lines.append([' '.join(words[i:i + 14]) for i in range(0, 14 * LINES_PER_PAGE, 14)])
+    return make_pdf(page_lines)
+
+
+def measure(function):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = function()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak / (1024 * 1024)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--pages', type=int, nargs='+', default=[10, 100, 300])
+    args = parser.parse_args()
+
+    rng = random.Random(13)
+    print(f"{'pages':>6} {'variant':>20} {'ms/page':>9} {'total s':>8} {'peak MB':>8} {'chars':>9}")
+
+    for pages in args.pages:
+        pdf = synthetic_pdf(pages, rng)
+        variants = [
+            ('legacy', lambda: legacy_extract(pdf)),
+            ('streaming', lambda: extract_text_from_pdf(pdf, max_pages=None, max_chars=None)),
+            ('streaming + limits', lambda: extract_text_from_pdf(pdf)),
+        ]
+
+        legacy_text = None
+        for name, function in variants:
+            text, elapsed, peak_mb = measure(function)
+            if name == 'legacy':
+                legacy_text = text
+            elif name == 'streaming' and text != legacy_text:
+                raise AssertionError('Streaming pipeline output differs from the legacy extraction')
+            per_page = elapsed / pages * 1000
+            print(f"{pages:>6} {name:>20} {per_page:>9.2f} {elapsed:>8.2f} {peak_mb:>8.1f} {len(text):>9}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,86 @@
+"""
+Phrase Index Benchmark
+Compares the previous O(phrases x skills) substring scan with SkillPhraseIndex
+lookups as the skills vocabulary grows
+
+Usage:
+    python -m benchmarks.bench_phrase_index
+"""
+
+import random
+import time
+from typing import List, Set
+
+from benchmarks.bench_skill_matcher import FILLER_WORDS, synthetic_vocabulary
+from modules.skill_db import SKILLS_DATABASE
+from modules.skill_matcher import SkillPhraseIndex
+
+
+VOCAB_SIZES = [len(SKILLS_DATABASE), 1000, 2500, 5000, 10000]
+DOCUMENTS = 10
+PHRASES_PER_DOCUMENT = 150
+
+
+def legacy_phrase_skills(phrases: List[str], skills: List[str]) -> Set[str]:
+    """
+    The previous noun phrase loop from extract_skills
+    """
+    matched = set()
+    for phrase in phrases:
+        for skill in skills:
+            if skill in phrase or phrase in skill:
+                matched.add(skill)
+    return matched
+
+
+def indexed_phrase_skills(phrases: List[str], index: SkillPhraseIndex, reverse: bool) -> Set[str]:
+    matched = set()
+    for phrase in phrases:
+        matched.update(index.lookup(phrase, reverse=reverse))
+    return matched
+
+
+def synthetic_phrases(rng: random.Random) -> List[str]:
+    phrases = []
+    for _ in range(PHRASES_PER_DOCUMENT):
+        words = [rng.choice(FILLER_WORDS) for _ in range(rng.randint(1, 3))]
+        if rng.random() < 0.3:
+            words.insert(rng.randint(0, len(words)), rng.choice(SKILLS_DATABASE))
+        phrases.append(' '.join(words))
+    return phrases
+
+
+def time_per_document(function, documents) -> float:
+    start = time.perf_counter()
+    for phrases in documents:
+        function(phrases)
+    return (time.perf_counter() - start) / len(documents) * 1000
+
+
+def main():
+    rng = random.Random(7)
+    documents = [synthetic_phrases(rng) for _ in range(DOCUMENTS)]
+
+    index = SkillPhraseIndex(SKILLS_DATABASE)
+    legacy = legacy_phrase_skills(documents[0], SKILLS_DATABASE)
+    indexed = indexed_phrase_skills(documents[0], index, reverse=True)
+    print(f"Sample document: substring scan found {len(legacy)} skills, "
+          f"index found {len(indexed)} (dropped: {sorted(legacy - indexed)[:10]})")
+    print()
+    print(f"{'skills':>8} {'build ms':>10} {'scan ms/doc':>13} {'index ms/doc':>14} {'no-reverse ms/doc':>19}")
+
+    for size in VOCAB_SIZES:
+        vocabulary = synthetic_vocabulary(size, rng)
+
+        start = time.perf_counter()
+        index = SkillPhraseIndex(vocabulary)
+        build_ms = (time.perf_counter() - start) * 1000
+
+        scan_ms = time_per_document(lambda phrases: legacy_phrase_skills(phrases, vocabulary), documents)
+        index_ms = time_per_document(lambda phrases: indexed_phrase_skills(phrases, index, True), documents)
+        forward_ms = time_per_document(lambda phrases: indexed_phrase_skills(phrases, index, False), documents)
+        print(f"{size:>8} {build_ms:>10.1f} {scan_ms:>13.2f} {index_ms:>14.3f} {forward_ms:>19.3f}")
+
+
+if __name__ == '__main__':
+    main()
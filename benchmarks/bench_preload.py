@@ -0,0 +1,154 @@
+"""
+Preload Benchmark
+Starts gunicorn with lazy model loading, background warmup and master
+preloading (gunicorn.conf.py) and compares time to ready, first-request
+latency and per-worker memory (RSS, and PSS, which splits shared pages
+between the processes sharing them)
+
+Usage:
+    python -m benchmarks.bench_preload [--workers 4]
+"""
+
+import argparse
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List
+
+from benchmarks.bench_jobs import post_multipart
+from benchmarks.corpus import make_job_description, make_resume
+
+
+MODES = {
+    # name: (extra gunicorn arguments, WARMUP_MODE)
+    'lazy': ([], 'off'),
+    'background': ([], 'background'),
+    'preload': (['-c', 'gunicorn.conf.py'], 'preload'),
+}
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def memory_kb(pid: int) -> Dict[str, int]:
+    values = {}
+    with open(f'/proc/{pid}/smaps_rollup') as f:
+        for line in f:
+            parts = line.split()
+            if parts[0] in ('Rss:', 'Pss:'):
+                values[parts[0][:-1].lower()] = int(parts[1])
+    return values
+
+
+def worker_pids(master: int) -> List[int]:
+    output = subprocess.run(['ps', '-o', 'pid=', '--ppid', str(master)], capture_output=True, text=True).stdout
+    return [int(pid) for pid in output.split()]
+
+
+def wait_ready(url: str, timeout: float = 120) -> float:
+    start = time.perf_counter()
+    while time.perf_counter() - start < timeout:
+        try:
+            with urllib.request.urlopen(f'{url}/ready', timeout=5) as response:
+                if response.status == 200:
+                    return time.perf_counter() - start
+        except (urllib.error.URLError, ConnectionError):
+            pass
+        time.sleep(0.05)
+    raise RuntimeError(f'{url} not ready after {timeout} s')
+
+
+def run_mode(name: str, workers: int, pdf: bytes, job_description: str) -> Dict:
+    arguments, warmup_mode = MODES[name]
+    port = free_port()
+    url = f'http://127.0.0.1:{port}'
+
+    with tempfile.TemporaryDirectory() as directory:
+        env = dict(
+            os.environ,
+            WARMUP_MODE=warmup_mode,
+            PDF_TEXT_CACHE_ENABLED='false',
+            CANDIDATE_STORE_ENABLED='false',
+            METRICS_DIR=os.path.join(directory, 'metrics'),
+        )
+        log_path = os.path.join(directory, 'gunicorn.log')
+        log = open(log_path, 'w')
+        start = time.perf_counter()
+        server = subprocess.Popen(
+            [sys.executable, '-m', 'gunicorn', *arguments, '-w', str(workers), '-b', f'127.0.0.1:{port}', 'app:app'],
+            env=env, stdout=log, stderr=log
+        )
+        try:
+            wait_ready(url)
+            # Every worker must be up (and, for background warmup, warmed up)
+            while len(worker_pids(server.pid)) < workers:
+                time.sleep(0.05)
+            if warmup_mode == 'background':
+                for _ in range(workers * 4):
+                    wait_ready(url)
+            ready_s = time.perf_counter() - start
+
+            def first_request(_):
+                request_start = time.perf_counter()
+                status, _ = post_multipart(f'{url}/analyze', {'job_description': job_description},
+                                           {'resume': ('resume.pdf', pdf)})
+                assert status == 200, status
+                return time.perf_counter() - request_start
+
+            # One concurrent request per worker: the first request each worker sees
+            with ThreadPoolExecutor(workers) as pool:
+                latencies = sorted(pool.map(first_request, range(workers)))
+
+            memory = [memory_kb(pid) for pid in worker_pids(server.pid)]
+            master = memory_kb(server.pid)
+        except Exception:
+            with open(log_path) as f:
+                print(f"gunicorn log ({name}):\n{f.read()[-3000:]}")
+            raise
+        finally:
+            server.terminate()
+            server.wait()
+            log.close()
+
+    return {
+        'ready_s': ready_s,
+        'first_p50_ms': latencies[len(latencies) // 2] * 1000,
+        'first_max_ms': latencies[-1] * 1000,
+        'worker_rss_mb': sum(m['rss'] for m in memory) / len(memory) / 1024,
+        'worker_pss_mb': sum(m['pss'] for m in memory) / len(memory) / 1024,
+        'total_pss_mb': (sum(m['pss'] for m in memory) + master['pss']) / 1024,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--modes', nargs='+', default=list(MODES), choices=list(MODES))
+    args = parser.parse_args()
+
+    rng = random.Random(16)
+    pdf = make_resume(2, 0.05, rng)['pdf']
+    job_description = make_job_description(150, rng)
+
+    print(f"{args.workers} gunicorn workers")
+    print(f"{'mode':<12} {'ready s':>8} {'1st p50 ms':>11} {'1st max ms':>11} "
+          f"{'RSS/worker':>11} {'PSS/worker':>11} {'total PSS':>10}")
+    for name in args.modes:
+        result = run_mode(name, args.workers, pdf, job_description)
+        print(f"{name:<12} {result['ready_s']:>8.2f} {result['first_p50_ms']:>11.1f} "
+              f"{result['first_max_ms']:>11.1f} {result['worker_rss_mb']:>9.1f}MB "
+              f"{result['worker_pss_mb']:>9.1f}MB {result['total_pss_mb']:>8.1f}MB")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,147 @@
+"""
+Resume Matrix Benchmark
+Stores synthetic resumes (hashed vectors in the memory-mapped resume matrix,
+skills in the candidate store), then ranks them against many job
+descriptions with rank_candidates: latency per number of job descriptions,
+memory allocated per query, and agreement with a brute-force ranking
+
+Usage:
+    python -m benchmarks.bench_resume_matrix [--resumes 100000] [--jds 100] [--k 50]
+"""
+
+import argparse
+import os
+import random
+import shutil
+import tempfile
+import time
+import tracemalloc
+from typing import List, Set, Tuple
+
+import numpy as np
+
+from benchmarks.corpus import FILLER
+from modules import candidate_store, resume_matrix
+from modules.candidate_store import CandidateStore
+from modules.matcher import HASHING_ENGINE, analyze_job_description, hashed_vectors
+from modules.resume_matrix import ResumeMatrix, rank_candidates
+from modules.skill_db import SKILLS_BY_ID
+from config import RANKING_SKILL_WEIGHT
+
+
+BATCH = 2000  # resumes stored per append, as a large /analyze/batch would
+
+
+def make_resume(words: int, density: float, rng: random.Random) -> Tuple[str, Set[str]]:
+    """
+    Resume text and the skills it mentions
+    """
+    skills = set()
+    text = []
+    for _ in range(words):
+        if rng.random() < density:
+            skill = rng.choice(SKILLS_BY_ID)
+            skills.add(skill)
+            text.append(skill)
+        else:
+            text.append(rng.choice(FILLER))
+    return ' '.join(text), skills
+
+
+def build(directory: str, resumes: int, words: int, rng: random.Random) -> float:
+    """
+    Fills a candidate store and resume matrix in directory and makes them the
+    shared ones; returns seconds spent appending to the matrix
+    """
+    store = CandidateStore(os.path.join(directory, 'candidates.sqlite3'))
+    matrix = ResumeMatrix(os.path.join(directory, 'resume_matrix'))
+    candidate_store._candidate_store = store
+    resume_matrix._resume_matrix = matrix
+
+    append_seconds = 0.0
+    for start in range(0, resumes, BATCH):
+        batch = [make_resume(words, 0.05, rng) for _ in range(min(BATCH, resumes - start))]
+        ids = store.add_candidates([(f'resume-{start + i}', sorted(skills), None)
+                                    for i, (_, skills) in enumerate(batch)])
+        vectors = hashed_vectors([text for text, _ in batch])
+        begin = time.perf_counter()
+        matrix.append(ids, vectors)
+        append_seconds += time.perf_counter() - begin
+    return append_seconds
+
+
+def brute_force(job_descriptions: List[str], k: int) -> List[List[int]]:
+    """
+    Top k candidate ids per job description from the whole matrix loaded in
+    memory and dense scores for every candidate
+    """
+    from scipy.sparse import csr_matrix
+
+    data, indices, indptr, candidate_ids = resume_matrix.get_resume_matrix().snapshot()
+    matrix = csr_matrix((np.asarray(data, dtype=np.float64), np.asarray(indices), indptr),
+                        shape=(len(candidate_ids), resume_matrix.get_resume_matrix().n_features))
+    store = candidate_store.get_candidate_store()
+    top = []
+    for job_description in job_descriptions:
+        analysis = analyze_job_description(job_description, engine=HASHING_ENGINE)
+        similarities = (matrix @ analysis['vector'].T).toarray().ravel()
+        counts = np.bincount(store.skill_hits(analysis['skills']), minlength=int(candidate_ids[-1]) + 1)
+        coverage = counts[np.asarray(candidate_ids)] / max(len(analysis['skills']), 1)
+        weight = RANKING_SKILL_WEIGHT if analysis['skills'] else 0.0
+        scores = (1 - weight) * similarities + weight * coverage
+        order = np.lexsort((np.arange(len(scores)), -scores))[:k]
+        top.append(np.asarray(candidate_ids)[order].tolist())
+    return top
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--resumes', type=int, default=100000)
+    parser.add_argument('--words', type=int, default=300, help='Words per resume')
+    parser.add_argument('--jds', type=int, default=100)
+    parser.add_argument('--k', type=int, default=50)
+    args = parser.parse_args()
+
+    rng = random.Random(23)
+    directory = tempfile.mkdtemp(prefix='bench_resume_matrix_')
+    try:
+        start = time.perf_counter()
+        append_seconds = build(directory, args.resumes, args.words, rng)
+        size_mb = sum(os.path.getsize(os.path.join(directory, 'resume_matrix', name))
+                      for name in os.listdir(os.path.join(directory, 'resume_matrix'))) / (1024 * 1024)
+        print(f"Stored {args.resumes} resumes of {args.words} words in {time.perf_counter() - start:.0f} s "
+              f"(appending to the matrix: {append_seconds:.1f} s); matrix files {size_mb:.0f} MB")
+
+        job_descriptions = [
+            make_resume(150, 0.2, rng)[0] for _ in range(args.jds)
+        ]
+        # JD analyses are cached after the first call, as for repeated open roles
+        for job_description in job_descriptions:
+            analyze_job_description(job_description, engine=HASHING_ENGINE)
+
+        print(f"\nrank_candidates, top {args.k}: seconds per query / MB allocated (memory-mapped pages excluded)")
+        for count in sorted({1, 10, args.jds}):
+            timings = []
+            for _ in range(3):
+                begin = time.perf_counter()
+                rank_candidates(job_descriptions[:count], k=args.k)
+                timings.append(time.perf_counter() - begin)
+            tracemalloc.start()
+            rank_candidates(job_descriptions[:count], k=args.k)
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            print(f"{count:>4} job descriptions: {min(timings):6.2f} s "
+                  f"({min(timings) / count * 1000:6.1f} ms per job description), {peak / (1024 * 1024):6.1f} MB")
+
+        checked = job_descriptions[:5]
+        ranked = [[candidate['id'] for candidate in ranking['candidates']]
+                  for ranking in rank_candidates(checked, k=args.k)]
+        expected = brute_force(checked, args.k)
+        same = sum(a == b for a, b in zip(ranked, expected))
+        print(f"\nSame top {args.k} as a brute-force dense ranking: {same}/{len(checked)} job descriptions")
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == '__main__':
+    main()
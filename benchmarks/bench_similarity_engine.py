@@ -0,0 +1,163 @@
+"""
+Similarity Engine Benchmark
+Compares the TF-IDF and hashing similarity engines: ranking quality on a
+labeled sample (resumes written for a job description against unrelated
+ones), agreement with the TF-IDF scores, and latency and peak memory per
+resume length and for bulk scoring
+
+Usage:
+    python -m benchmarks.bench_similarity_engine [--jds 20] [--resumes-per-jd 20]
+"""
+
+import os
+
+# JD analyses are recomputed for every engine and never come from disk
+os.environ.setdefault('JD_CACHE_BACKEND', 'memory')
+
+import argparse
+import random
+import time
+import tracemalloc
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+from scipy.stats import spearmanr
+from sklearn.metrics import roc_auc_score
+
+from benchmarks.corpus import FILLER, LINES_PER_PAGE, WORDS_PER_LINE
+from modules.matcher import SIMILARITY_ENGINES, _similarity_scores, analyze_job_description
+from modules.skill_db import SKILLS_BY_ID
+
+
+WORDS_PER_PAGE = WORDS_PER_LINE * LINES_PER_PAGE
+ROLE_SKILLS = 12  # skills that define a job description
+
+
+def _text(words: int, density: float, skills: Sequence[str], rng: random.Random) -> str:
+    return ' '.join(rng.choice(skills) if rng.random() < density else rng.choice(FILLER) for _ in range(words))
+
+
+def labeled_sample(jds: int, resumes_per_jd: int, rng: random.Random) -> List[Dict]:
+    """
+    Job descriptions, each with resumes written for it (label 1: most skills
+    from the role) and unrelated resumes (label 0: skills from anywhere)
+
+    Returns:
+        List of {'job_description', 'resumes', 'labels'}
+    """
+    sample = []
+    for _ in range(jds):
+        role = rng.sample(SKILLS_BY_ID, ROLE_SKILLS)
+        job_description = _text(150, 0.2, role, rng)
+        resumes, labels = [], []
+        for label in (1, 0) * resumes_per_jd:
+            words = WORDS_PER_PAGE * rng.choice((1, 2, 3))
+            if label:
+                # Mostly the role's skills, some unrelated ones
+                skills = role * 3 + rng.sample(SKILLS_BY_ID, ROLE_SKILLS)
+            else:
+                skills = SKILLS_BY_ID
+            resumes.append(_text(words, 0.05, skills, rng))
+            labels.append(label)
+        sample.append({'job_description': job_description, 'resumes': resumes, 'labels': labels})
+    return sample
+
+
+def score_pairs(engine: str, resumes: List[str], job_description: str) -> np.ndarray:
+    """
+    Scores each resume on its own, as /analyze does
+    """
+    analysis = analyze_job_description(job_description, engine=engine)
+    return np.array([_similarity_scores([resume], job_description, analysis, engine=engine)[0]
+                     for resume in resumes])
+
+
+def quality(sample: List[Dict]) -> Dict[str, Dict]:
+    """
+    Mean ROC AUC and precision at the number of relevant resumes per job
+    description, plus Spearman correlation with the TF-IDF scores
+    """
+    scores = {engine: [score_pairs(engine, item['resumes'], item['job_description']) for item in sample]
+              for engine in SIMILARITY_ENGINES}
+    results = {}
+    for engine in SIMILARITY_ENGINES:
+        aucs, precisions = [], []
+        for item, engine_scores in zip(sample, scores[engine]):
+            labels = np.array(item['labels'])
+            aucs.append(roc_auc_score(labels, engine_scores))
+            top = np.argsort(-engine_scores, kind='stable')[:labels.sum()]
+            precisions.append(labels[top].mean())
+        correlation = spearmanr(np.concatenate(scores[engine]), np.concatenate(scores['tfidf']))[0]
+        results[engine] = {
+            'auc': float(np.mean(aucs)),
+            'precision': float(np.mean(precisions)),
+            'spearman_vs_tfidf': float(correlation),
+            'mean_score': float(np.mean(np.concatenate(scores[engine])))
+        }
+    return results
+
+
+def latency_and_memory(engine: str, resumes: List[str], job_description: str) -> Tuple[float, float]:
+    """
+    Mean ms per resume scored on its own, and peak traced memory (MB) of one call
+    """
+    analysis = analyze_job_description(job_description, engine=engine)
+    _similarity_scores([resumes[0]], job_description, analysis, engine=engine)
+
+    start = time.perf_counter()
+    for resume in resumes:
+        _similarity_scores([resume], job_description, analysis, engine=engine)
+    latency_ms = (time.perf_counter() - start) / len(resumes) * 1000
+
+    tracemalloc.start()
+    _similarity_scores([resumes[-1]], job_description, analysis, engine=engine)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return latency_ms, peak / (1024 * 1024)
+
+
+def bulk(engine: str, resumes: List[str], job_description: str) -> float:
+    """
+    Seconds to score all resumes against one job description in one call
+    """
+    analysis = analyze_job_description(job_description, engine=engine)
+    start = time.perf_counter()
+    _similarity_scores(resumes, job_description, analysis, engine=engine)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--jds', type=int, default=20)
+    parser.add_argument('--resumes-per-jd', type=int, default=20, help='Relevant resumes (as many unrelated)')
+    parser.add_argument('--bulk', type=int, default=1000, help='Resumes in the bulk scoring run')
+    args = parser.parse_args()
+
+    rng = random.Random(19)
+    sample = labeled_sample(args.jds, args.resumes_per_jd, rng)
+    print(f"Ranking quality: {args.jds} job descriptions x {args.resumes_per_jd * 2} resumes "
+          f"(half written for the role)")
+    print(f"{'engine':<8} {'ROC AUC':>8} {'P@relevant':>11} {'Spearman vs tfidf':>18} {'mean score':>11}")
+    for engine, result in quality(sample).items():
+        print(f"{engine:<8} {result['auc']:>8.3f} {result['precision']:>11.3f} "
+              f"{result['spearman_vs_tfidf']:>18.3f} {result['mean_score']:>11.3f}")
+
+    job_description = sample[0]['job_description']
+    print(f"\nOne resume at a time ({', '.join(SIMILARITY_ENGINES)}): ms per resume / peak MB per call")
+    for pages in (1, 5, 20):
+        resumes = [_text(WORDS_PER_PAGE * pages, 0.05, SKILLS_BY_ID, rng) for _ in range(20)]
+        cells = []
+        for engine in SIMILARITY_ENGINES:
+            latency_ms, peak_mb = latency_and_memory(engine, resumes, job_description)
+            cells.append(f"{engine} {latency_ms:7.2f} ms {peak_mb:6.2f} MB")
+        print(f"{pages:>3} pages: " + '   '.join(cells))
+
+    resumes = [_text(WORDS_PER_PAGE, 0.05, SKILLS_BY_ID, rng) for _ in range(args.bulk)]
+    print(f"\nBulk: {args.bulk} one-page resumes against one job description in one call")
+    for engine in SIMILARITY_ENGINES:
+        seconds = bulk(engine, resumes, job_description)
+        print(f"{engine:<8} {seconds:6.2f} s ({seconds / args.bulk * 1000:.2f} ms per resume)")
+
+
+if __name__ == '__main__':
+    main()
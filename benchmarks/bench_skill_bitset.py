@@ -0,0 +1,83 @@
+"""
+Skill Gap Benchmark
+Compares per-candidate set operations with bitwise operations over a skill
+matrix for one job description against many candidates
+
+Usage:
+    python -m benchmarks.bench_skill_bitset [--candidates 100000]
+"""
+
+import argparse
+import random
+import time
+from typing import Dict, List
+
+from benchmarks.bench_candidate_store import TOP_K_SKILLS, synthetic_candidates
+from modules.skill_bitset import gap_counts, pack, skill_gaps, skill_matrix, skill_row
+
+
+def set_gap(resume_skills: List[str], jd_skills: List[str]) -> Dict:
+    """
+    The previous per-candidate skill gap from calculate_match_score
+    """
+    resume_skills_set = set(resume_skills)
+    jd_skills_set = set(jd_skills)
+
+    return {
+        'matched_skills': sorted(resume_skills_set.intersection(jd_skills_set)),
+        'missing_skills': sorted(jd_skills_set - resume_skills_set),
+        'resume_skills': sorted(resume_skills),
+        'jd_skills': sorted(jd_skills)
+    }
+
+
+def timed(function):
+    start = time.perf_counter()
+    result = function()
+    return result, (time.perf_counter() - start) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--candidates', type=int, default=100000)
+    args = parser.parse_args()
+
+    candidates = synthetic_candidates(args.candidates, random.Random(13))
+    jd_skills = list(TOP_K_SKILLS)
+    jd_set = set(jd_skills)
+
+    # Gap lists (the JSON response form)
+    expected, set_lists_ms = timed(lambda: [set_gap(skills, jd_skills) for skills in candidates])
+    matrix, encode_ms = timed(lambda: skill_matrix(candidates))
+    jd_row = skill_row(jd_skills)
+    gaps, bitset_lists_ms = timed(lambda: skill_gaps(matrix, jd_row))
+    assert gaps == expected
+
+    # Counts and coverage only (ranking / analytics)
+    expected_counts, set_counts_ms = timed(
+        lambda: [len(jd_set.intersection(skills)) for skills in candidates]
+    )
+    packed, pack_ms = timed(lambda: pack(matrix))
+    packed_jd = pack(jd_row)
+    counts, bitset_counts_ms = timed(lambda: gap_counts(packed, packed_jd))
+    _, bool_counts_ms = timed(lambda: (matrix & jd_row).sum(axis=1))
+    assert counts['matched'].tolist() == expected_counts
+
+    print(f"{args.candidates} candidates, {len(jd_skills)} JD skills, "
+          f"{matrix.shape[1]} skill ids; bool matrix {matrix.nbytes / 2**20:.1f} MiB, "
+          f"packed {packed.nbytes / 2**20:.1f} MiB")
+    print()
+    print(f"{'operation':<42} {'sets ms':>10} {'bitset ms':>10} {'speedup':>8}")
+    print(f"{'matched/missing/resume lists':<42} {set_lists_ms:>10.1f} {bitset_lists_ms:>10.1f} "
+          f"{set_lists_ms / bitset_lists_ms:>7.1f}x")
+    print(f"{'matched counts + coverage (packed)':<42} {set_counts_ms:>10.1f} {bitset_counts_ms:>10.1f} "
+          f"{set_counts_ms / bitset_counts_ms:>7.1f}x")
+    print(f"{'matched counts (bool matrix)':<42} {set_counts_ms:>10.1f} {bool_counts_ms:>10.1f} "
+          f"{set_counts_ms / bool_counts_ms:>7.1f}x")
+    print()
+    print(f"One-off encoding: skill_matrix {encode_ms:.1f} ms, pack {pack_ms:.1f} ms. "
+          f"Results match the set-based gaps.")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,103 @@
+"""
+Skill Matcher Benchmark
+Measures time per document of SkillMatcher and the previous per-skill regex
+loop as the skills vocabulary grows (their parity is checked by
+tests/test_skill_matcher.py)
+
+Usage:
+    python -m benchmarks.bench_skill_matcher
+"""
+
+import random
+import re
+import string
+import time
+from typing import List, Set
+
+from modules.skill_db import SKILLS_DATABASE
+from modules.skill_matcher import SkillMatcher
+
+
+FILLER_WORDS = [
+    'experienced', 'engineer', 'with', 'strong', 'background', 'in', 'building',
+    'scalable', 'systems', 'using', 'and', 'team', 'delivered', 'projects',
+    'across', 'multiple', 'domains', 'including', 'data', 'pipelines', 'led',
+    'migration', 'to', 'the', 'platform', 'improved', 'performance', 'by',
+]
+
+# Snippets exercising the word-boundary edge cases of the regex semantics
+EDGE_CASES = [
+    'c++ c++11 c#, c#7 .net asp.net vb.net node.js nodejs node',
+    'interest apis rest api restful api sql server mysql',
+    'react-native react.js reactjs (python3) python 3 c plus plus',
+    'tcp/ip ci/cd objective-c f# go-lang golang r&d',
+]
+
+VOCAB_SIZES = [len(SKILLS_DATABASE), 1000, 2500, 5000, 10000]
+DOCUMENTS = 20
+WORDS_PER_DOCUMENT = 800
+
+
+def legacy_regex_skills(text: str, skills: List[str]) -> Set[str]:
+    """
+    The previous extract_skills regex loop, kept as the parity reference
+    """
+    text_lower = text.lower()
+    matched = set()
+    for skill in sorted(skills, key=len, reverse=True):
+        if len(skill.split()) == 1:
+            pattern = r'\b' + re.escape(skill) + r'\b'
+        else:
+            pattern = re.escape(skill)
+        if re.search(pattern, text_lower, re.IGNORECASE):
+            matched.add(skill)
+    return matched
+
+
+def synthetic_vocabulary(size: int, rng: random.Random) -> List[str]:
+    vocabulary = list(SKILLS_DATABASE)
+    while len(vocabulary) < size:
+        word = ''.join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(4, 10)))
+        if rng.random() < 0.2:
+            word += ' ' + rng.choice(FILLER_WORDS)
+        vocabulary.append(word)
+    return vocabulary
+
+
+def synthetic_document(rng: random.Random) -> str:
+    words = []
+    for _ in range(WORDS_PER_DOCUMENT):
+        if rng.random() < 0.05:
+            words.append(rng.choice(SKILLS_DATABASE))
+        else:
+            words.append(rng.choice(FILLER_WORDS))
+    return ' '.join(words) + ' ' + rng.choice(EDGE_CASES)
+
+
+def time_per_document(function, documents: List[str]) -> float:
+    start = time.perf_counter()
+    for document in documents:
+        function(document)
+    return (time.perf_counter() - start) / len(documents) * 1000
+
+
+def main():
+    rng = random.Random(42)
+    documents = [synthetic_document(rng) for _ in range(DOCUMENTS)]
+
+    print(f"{'skills':>8} {'build ms':>10} {'regex ms/doc':>14} {'matcher ms/doc':>16} {'speedup':>9}")
+
+    for size in VOCAB_SIZES:
+        vocabulary = synthetic_vocabulary(size, rng)
+
+        start = time.perf_counter()
+        matcher = SkillMatcher(vocabulary)
+        build_ms = (time.perf_counter() - start) * 1000
+
+        regex_ms = time_per_document(lambda doc: legacy_regex_skills(doc, vocabulary), documents)
+        matcher_ms = time_per_document(matcher.find_skills, documents)
+        print(f"{size:>8} {build_ms:>10.1f} {regex_ms:>14.2f} {matcher_ms:>16.2f} {regex_ms / matcher_ms:>8.1f}x")
+
+
+if __name__ == '__main__':
+    main()
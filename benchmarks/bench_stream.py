@@ -0,0 +1,168 @@
+"""
+Streaming Benchmark
+Runs gunicorn with one worker and sends the same resumes to /analyze/batch
+and /analyze/stream: time until the client sees the first result, total
+time and the worker's peak memory (VmHWM) per number of resumes, then
+checks that a client disconnecting from /analyze/stream cancels the rest
+
+Usage:
+    python -m benchmarks.bench_stream [--counts 25 100 400] [--pages 2]
+"""
+
+import argparse
+import http.client
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+import uuid
+from contextlib import contextmanager
+from typing import Dict, List, Tuple
+
+from benchmarks.bench_preload import free_port, wait_ready, worker_pids
+from benchmarks.corpus import make_job_description, make_resume
+
+
+ROUTES = ('/analyze/batch', '/analyze/stream')
+
+
+def multipart_body(job_description: str, pdfs: List[bytes]) -> Tuple[bytes, str]:
+    """
+    Multipart body with the job description and every PDF as a 'resumes' file
+
+    Returns:
+        (body, content type)
+    """
+    boundary = uuid.uuid4().hex
+    body = bytearray(f'--{boundary}\r\nContent-Disposition: form-data; name="job_description"\r\n\r\n'
+                     f'{job_description}\r\n'.encode('utf-8'))
+    for index, pdf in enumerate(pdfs):
+        body += (f'--{boundary}\r\nContent-Disposition: form-data; name="resumes"; '
+                 f'filename="resume-{index}.pdf"\r\nContent-Type: application/pdf\r\n\r\n').encode('utf-8')
+        body += pdf + b'\r\n'
+    body += f'--{boundary}--\r\n'.encode('utf-8')
+    return bytes(body), f'multipart/form-data; boundary={boundary}'
+
+
+def vm_hwm_kb(pid: int) -> int:
+    with open(f'/proc/{pid}/status') as f:
+        for line in f:
+            if line.startswith('VmHWM:'):
+                return int(line.split()[1])
+    return 0
+
+
+@contextmanager
+def server(directory: str):
+    """
+    gunicorn with one worker, yields (port, worker pid)
+    """
+    port = free_port()
+    env = dict(
+        os.environ,
+        PDF_TEXT_CACHE_ENABLED='false',
+        CANDIDATE_STORE_ENABLED='false',
+        JOB_WORKERS='0',
+        METRICS_DIR=os.path.join(directory, 'metrics-' + uuid.uuid4().hex),
+    )
+    log_path = os.path.join(directory, 'gunicorn.log')
+    log = open(log_path, 'w')
+    process = subprocess.Popen(
+        [sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py', '-w', '1',
+         '-b', f'127.0.0.1:{port}', '--timeout', '600', 'app:app'],
+        env=env, stdout=log, stderr=log
+    )
+    try:
+        wait_ready(f'http://127.0.0.1:{port}')
+        yield port, worker_pids(process.pid)[0]
+    except Exception:
+        with open(log_path) as f:
+            print(f"gunicorn log:\n{f.read()[-3000:]}")
+        raise
+    finally:
+        process.terminate()
+        process.wait()
+        log.close()
+
+
+def send(port: int, route: str, body: bytes, content_type: str, lines: int = None) -> Dict:
+    """
+    Posts the body and reads the response line by line; with lines, closes
+    the connection after that many lines
+
+    Returns:
+        Dictionary with first_s (first line received), total_s and the
+        decoded last line
+    """
+    connection = http.client.HTTPConnection('127.0.0.1', port, timeout=600)
+    start = time.perf_counter()
+    connection.request('POST', route, body=body, headers={'Content-Type': content_type})
+    response = connection.getresponse()
+    first, last, count = None, None, 0
+    for line in iter(response.readline, b''):
+        if first is None:
+            first = time.perf_counter() - start
+        last, count = line, count + 1
+        if lines is not None and count >= lines:
+            break
+    total = time.perf_counter() - start
+    connection.close()
+    return {'status': response.status, 'first_s': first, 'total_s': total, 'last': json.loads(last)}
+
+
+def stream_metrics(port: int) -> Dict[str, float]:
+    """
+    Stream requests by status and resumes analyzed so far, from /metrics
+    """
+    with urllib.request.urlopen(f'http://127.0.0.1:{port}/metrics', timeout=60) as response:
+        text = response.read().decode('utf-8')
+    values = {}
+    for line in text.splitlines():
+        if line.startswith('resume_analyzer_requests_total{endpoint="analyze_stream"'):
+            values['status ' + line.split('status="')[1].split('"')[0]] = float(line.split()[-1])
+        elif line.startswith('resume_analyzer_skills_count'):
+            values['resumes analyzed'] = float(line.split()[-1])
+    return values
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--counts', type=int, nargs='+', default=[25, 100, 400], help='Resumes per request')
+    parser.add_argument('--pages', type=int, default=2, help='Pages per resume')
+    args = parser.parse_args()
+
+    rng = random.Random(22)
+    pdfs = [make_resume(args.pages, 0.05, rng)['pdf'] for _ in range(max(args.counts))]
+    job_description = make_job_description(150, rng)
+
+    with tempfile.TemporaryDirectory() as directory:
+        print(f"{args.pages}-page resumes, one gunicorn worker (a fresh one per run, so VmHWM is its own peak)")
+        print(f"{'route':<16} {'resumes':>8} {'first result s':>15} {'total s':>8} {'worker VmHWM MB':>16} "
+              f"{'ready VmHWM MB':>15}")
+        for count in args.counts:
+            body, content_type = multipart_body(job_description, pdfs[:count])
+            for route in ROUTES:
+                with server(directory) as (port, pid):
+                    ready_kb = vm_hwm_kb(pid)
+                    result = send(port, route, body, content_type)
+                    peak_kb = vm_hwm_kb(pid)
+                assert result['status'] == 200 and result['last']['success'], result
+                print(f"{route:<16} {count:>8} {result['first_s']:>15.2f} {result['total_s']:>8.2f} "
+                      f"{peak_kb / 1024:>16.1f} {ready_kb / 1024:>15.1f}")
+
+        count = max(args.counts)
+        body, content_type = multipart_body(job_description, pdfs[:count])
+        with server(directory) as (port, pid):
+            send(port, '/analyze/stream', body, content_type, lines=1)
+            time.sleep(2.0)
+            values = stream_metrics(port)
+        print(f"\nDisconnect after the first line of {count} resumes: "
+              + ', '.join(f"{name} {value:.0f}" for name, value in sorted(values.items())))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,82 @@
+"""
+TF-IDF Model Benchmark
+Compares the per-request TF-IDF fit with transform-only scoring against a
+corpus-fitted model: latency per pair and score distribution
+
+Usage:
+    python -m benchmarks.bench_tfidf_model [--corpus 1000] [--pairs 200]
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import time
+
+import numpy as np
+from sklearn.metrics.pairwise import cosine_similarity
+
+from benchmarks.bench_skill_matcher import synthetic_document
+from modules.matcher import _new_vectorizer
+from modules.tfidf_model import TfidfModel, fit_tfidf_model
+
+
+def per_request_score(resume: str, job_description: str) -> float:
+    matrix = _new_vectorizer().fit_transform([resume, job_description])
+    return float(cosine_similarity(matrix[0:1], matrix[1:2])[0][0])
+
+
+def model_score(model: TfidfModel, resume: str, job_description: str) -> float:
+    matrix = model.transform([resume, job_description])
+    return float(cosine_similarity(matrix[0:1], matrix[1:2])[0][0])
+
+
+def describe(scores) -> str:
+    p10, p50, p90 = np.percentile(scores, [10, 50, 90])
+    return f"mean={np.mean(scores):.3f} p10={p10:.3f} p50={p50:.3f} p90={p90:.3f}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--corpus', type=int, default=1000)
+    parser.add_argument('--pairs', type=int, default=200)
+    args = parser.parse_args()
+
+    rng = random.Random(11)
+    corpus = [synthetic_document(rng) for _ in range(args.corpus)]
+    pairs = [(synthetic_document(rng), synthetic_document(rng)) for _ in range(args.pairs)]
+
+    start = time.perf_counter()
+    model = fit_tfidf_model(corpus)
+    fit_s = time.perf_counter() - start
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'tfidf_model.npz')
+        model.save(path)
+        size_kb = os.path.getsize(path) / 1024
+        start = time.perf_counter()
+        loaded = TfidfModel.load(path)
+        load_ms = (time.perf_counter() - start) * 1000
+
+    print(f"Corpus fit: {len(corpus)} documents, {len(model)} terms, {fit_s:.2f}s")
+    print(f"Saved model: {size_kb:.1f} KB, load {load_ms:.1f} ms")
+
+    reproducible = all(
+        model_score(model, resume, jd) == model_score(loaded, resume, jd)
+        for resume, jd in pairs[:20]
+    )
+    print(f"Scores identical after save/load: {reproducible}")
+    print()
+
+    for name, function in [
+        ('per-request fit', per_request_score),
+        ('transform only', lambda resume, jd: model_score(loaded, resume, jd)),
+    ]:
+        start = time.perf_counter()
+        scores = [function(resume, jd) for resume, jd in pairs]
+        latency_ms = (time.perf_counter() - start) / len(pairs) * 1000
+        print(f"{name:>16}: {latency_ms:6.2f} ms/pair  {describe(scores)}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,71 @@
+"""
+Upload Processing Benchmark
+Compares the old save/parse/remove path with parsing from memory (concurrent
+uploads are checked by tests/test_app.py)
+
+Usage:
+    python -m benchmarks.bench_upload [--requests 40]
+"""
+
+import os
+
+# Measure parsing, not the resume text cache; the vocabulary matcher keeps
+# the run independent of the spaCy model
+os.environ['PDF_TEXT_CACHE_ENABLED'] = 'false'
+os.environ.setdefault('SKILL_EXTRACTION_MODE', 'vocab')
+
+import argparse
+import io
+import random
+import tempfile
+import time
+
+from benchmarks.bench_skill_matcher import synthetic_document
+from benchmarks.pdfgen import make_pdf
+from modules.resume_parser import get_resume_text
+
+
+def resume_pdf(rng: random.Random, marker: str, pages: int = 2) -> bytes:
+    words = synthetic_document(rng).split()
+    lines = [' '.join(words[i:i + 12]) for i in range(0, len(words), 12)]
+    per_page = max(1, len(lines) // pages)
+    page_lines = [lines[i:i + per_page] for i in range(0, len(lines), per_page)][:pages]
+    page_lines[0].insert(0, marker)
+    return make_pdf(page_lines)
+
+
+def legacy_save_parse_remove(pdf: bytes, directory: str) -> str:
+    path = os.path.join(directory, 'resume.pdf')
+    with open(path, 'wb') as file:
+        file.write(pdf)
+    try:
+        return get_resume_text(path)
+    finally:
+        os.remove(path)
+
+
+def time_per_call(function, pdfs) -> float:
+    start = time.perf_counter()
+    for pdf in pdfs:
+        function(pdf)
+    return (time.perf_counter() - start) / len(pdfs) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--requests', type=int, default=40)
+    args = parser.parse_args()
+
+    rng = random.Random(9)
+    pdfs = [resume_pdf(rng, f'candidate {i}') for i in range(args.requests)]
+
+    with tempfile.TemporaryDirectory() as directory:
+        legacy_ms = time_per_call(lambda pdf: legacy_save_parse_remove(pdf, directory), pdfs)
+    memory_ms = time_per_call(lambda pdf: get_resume_text(io.BytesIO(pdf)), pdfs)
+
+    print(f"save/parse/remove: {legacy_ms:.2f} ms per upload")
+    print(f"in-memory parse:   {memory_ms:.2f} ms per upload")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,149 @@
+"""
+Synthetic Corpus Generator
+Builds reproducible resume PDFs and job descriptions from SKILLS_DATABASE with
+varying page counts, skill densities and job description lengths
+
+Usage:
+    python -m benchmarks.corpus --out corpus/ [--seed 0] [--resumes 60]
+"""
+
+import argparse
+import json
+import os
+import random
+from typing import Dict, List, Sequence
+
+from benchmarks.pdfgen import make_pdf
+from modules.skill_db import SKILLS_BY_ID
+
+
+PAGE_COUNTS = (1, 2, 5)
+SKILL_DENSITIES = (0.01, 0.05, 0.15)  # share of words that are skills
+JD_LENGTHS = (40, 150, 600)  # words
+
+WORDS_PER_LINE = 12
+LINES_PER_PAGE = 45
+
+FILLER = (
+    'experience team project developed designed implemented led managed '
+    'built improved production system service customers data platform '
+    'responsible delivered worked across company scale performance reliable '
+    'years strong knowledge with using and the for of in to on a'
+).split()
+PUNCTUATION = ('', '', '', ',', '.', ';', ':', ' -', ' (2019)', ' & co')
+
+
+def _words(count: int, density: float, rng: random.Random) -> List[str]:
+    words = []
+    for _ in range(count):
+        if rng.random() < density:
+            words.append(rng.choice(SKILLS_BY_ID))
+        else:
+            words.append(rng.choice(FILLER) + rng.choice(PUNCTUATION))
+    return words
+
+
+def make_resume(pages: int, density: float, rng: random.Random) -> Dict:
+    """
+    Builds one resume PDF
+
+    Args:
+        pages: Number of pages
+        density: Share of words that are skills
+        rng: Random source
+
+    Returns:
+        Dictionary with pages, density, pdf (bytes) and raw_text (the text
+        laid out in the PDF, before cleaning)
+    """
+    page_lines = []
+    for _ in range(pages):
+        words = _words(WORDS_PER_LINE * LINES_PER_PAGE, density, rng)
+        page_lines.append([
+            ' '.join(words[i:i + WORDS_PER_LINE]) for i in range(0, len(words), WORDS_PER_LINE)
+        ])
+    return {
+        'pages': pages,
+        'density': density,
+        'pdf': make_pdf(page_lines),
+        'raw_text': '\n'.join('\n'.join(lines) for lines in page_lines)
+    }
+
+
+def make_job_description(length: int, rng: random.Random) -> str:
+    """
+    Builds a job description of about length words, a fifth of them skills
+    """
+    return ' '.join(_words(length, 0.2, rng))
+
+
+def generate_corpus(seed: int = 0, resumes: int = 60,
+                    page_counts: Sequence[int] = PAGE_COUNTS,
+                    skill_densities: Sequence[float] = SKILL_DENSITIES,
+                    jd_lengths: Sequence[int] = JD_LENGTHS) -> Dict:
+    """
+    Generates the same corpus for the same arguments
+
+    Resumes cycle through every (page count, skill density) combination.
+
+    Args:
+        seed: Random seed
+        resumes: Number of resumes
+        page_counts: Page counts to cover
+        skill_densities: Skill densities to cover
+        jd_lengths: Job description lengths (words) to cover
+
+    Returns:
+        Dictionary with 'resumes' (see make_resume) and 'job_descriptions'
+        (dictionaries with length and text)
+    """
+    rng = random.Random(seed)
+    combinations = [(pages, density) for pages in page_counts for density in skill_densities]
+
+    corpus_resumes = []
+    for i in range(resumes):
+        pages, density = combinations[i % len(combinations)]
+        corpus_resumes.append({'id': i, **make_resume(pages, density, rng)})
+
+    job_descriptions = [
+        {'id': i, 'length': length, 'text': make_job_description(length, rng)}
+        for i, length in enumerate(jd_lengths)
+    ]
+    return {'resumes': corpus_resumes, 'job_descriptions': job_descriptions}
+
+
+def write_corpus(corpus: Dict, directory: str):
+    """
+    Writes the PDFs and a manifest.json with job descriptions to a directory
+    """
+    os.makedirs(directory, exist_ok=True)
+    manifest = {'resumes': [], 'job_descriptions': corpus['job_descriptions']}
+    for resume in corpus['resumes']:
+        filename = f"resume-{resume['id']:04d}-{resume['pages']}p-{resume['density']:.2f}.pdf"
+        with open(os.path.join(directory, filename), 'wb') as f:
+            f.write(resume['pdf'])
+        manifest['resumes'].append({
+            'id': resume['id'],
+            'file': filename,
+            'pages': resume['pages'],
+            'density': resume['density']
+        })
+    with open(os.path.join(directory, 'manifest.json'), 'w') as f:
+        json.dump(manifest, f, indent=2)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--out', required=True, help='Output directory')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--resumes', type=int, default=60)
+    args = parser.parse_args()
+
+    corpus = generate_corpus(args.seed, args.resumes)
+    write_corpus(corpus, args.out)
+    print(f"Wrote {len(corpus['resumes'])} resumes and "
+          f"{len(corpus['job_descriptions'])} job descriptions to {args.out}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,60 @@
+"""
+Minimal PDF Generator
+Writes simple multi-page text PDFs for benchmarks, without extra dependencies
+"""
+
+from typing import List
+
+
+def _escape(text: str) -> str:
+    return text.replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)')
+
+
+def make_pdf(pages: List[List[str]]) -> bytes:
+    """
+    Builds a PDF with one page per entry, each a list of text lines
+
+    Args:
+        pages: Lines of text per page (latin-1 characters only)
+
+    Returns:
+        PDF file bytes
+    """
+    objects = [
+        b'<< /Type /Catalog /Pages 2 0 R >>',
+        None,  # Pages tree, filled in once the page object numbers are known
+        b'<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>',
+    ]
+
+    page_numbers = []
+    for lines in pages:
+        commands = ['BT', '/F1 10 Tf', '12 TL', '50 780 Td']
+        for line in lines:
+            commands.append(f'({_escape(line)}) Tj T*')
+        commands.append('ET')
+        stream = '\n'.join(commands).encode('latin-1', errors='replace')
+
+        objects.append(b'<< /Length %d >>\nstream\n' % len(stream) + stream + b'\nendstream')
+        content_number = len(objects)
+        objects.append(
+            b'<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] '
+            b'/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>' % content_number
+        )
+        page_numbers.append(len(objects))
+
+    kids = ' '.join(f'{number} 0 R' for number in page_numbers)
+    objects[1] = f'<< /Type /Pages /Kids [{kids}] /Count {len(page_numbers)} >>'.encode('latin-1')
+
+    output = bytearray(b'%PDF-1.4\n')
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(output))
+        output += b'%d 0 obj\n' % number + body + b'\nendobj\n'
+
+    xref_offset = len(output)
+    output += b'xref\n0 %d\n' % (len(objects) + 1)
+    output += b'0000000000 65535 f \n'
+    for offset in offsets:
+        output += b'%010d 00000 n \n' % offset
+    output += b'trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n' % (len(objects) + 1, xref_offset)
+    return bytes(output)
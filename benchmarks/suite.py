@@ -0,0 +1,266 @@
+"""
+Benchmark Suite
+Times every analysis stage in isolation and the /analyze route end to end on
+a synthetic corpus; writes throughput, latency percentiles and peak RSS to
+JSON and flags regressions against a saved baseline
+
+Usage:
+    python -m benchmarks.suite [--quick] [--output results.json]
+    python -m benchmarks.suite --save-baseline benchmarks/results/baseline.json
+    python -m benchmarks.suite --baseline benchmarks/results/baseline.json [--threshold 0.15]
+"""
+
+import os
+
+# Measure uncached work: every run parses every PDF again and leaves no
+# candidates behind; the stages warm up explicitly, not in the background
+# (set before config is imported)
+os.environ.setdefault('PDF_TEXT_CACHE_ENABLED', 'false')
+os.environ.setdefault('CANDIDATE_STORE_ENABLED', 'false')
+os.environ.setdefault('WARMUP_MODE', 'off')
+
+import argparse
+import io
+import json
+import platform
+import resource
+import subprocess
+import sys
+import time
+from typing import Callable, Dict, List, Optional, Sequence
+
+from benchmarks.corpus import generate_corpus
+from config import SKILL_EXTRACTION_MODE
+from modules.matcher import HASHING_ENGINE, _similarity_scores, analyze_job_description
+from modules.resume_parser import clean_text, extract_pdf
+from modules.skill_extractor import VOCABULARY_MODE, extract_skills, load_spacy_model
+
+
+DEFAULT_OUTPUT = os.path.join('benchmarks', 'results', 'latest.json')
+DEFAULT_THRESHOLD = 0.15  # relative slowdown flagged as a regression
+
+
+def peak_rss_mb() -> float:
+    # ru_maxrss is in KiB on Linux and bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def percentile(sorted_values: List[float], q: float) -> float:
+    return sorted_values[min(len(sorted_values) - 1, int(q * len(sorted_values)))]
+
+
+def run_stage(items: Sequence, function: Callable, repeat: int = 1) -> Dict:
+    """
+    Calls function(item) for every item, repeat times
+
+    Returns:
+        Dictionary with calls, total_s, throughput (calls/s), mean/p50/p95/p99
+        latency in ms and peak_rss_mb so far
+    """
+    latencies = []
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for item in items:
+            call_start = time.perf_counter()
+            function(item)
+            latencies.append((time.perf_counter() - call_start) * 1000)
+    total = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        'calls': len(latencies),
+        'total_s': round(total, 4),
+        'throughput': round(len(latencies) / total, 2) if total else None,
+        'mean_ms': round(sum(latencies) / len(latencies), 3),
+        'p50_ms': round(percentile(latencies, 0.50), 3),
+        'p95_ms': round(percentile(latencies, 0.95), 3),
+        'p99_ms': round(percentile(latencies, 0.99), 3),
+        'peak_rss_mb': round(peak_rss_mb(), 1)
+    }
+
+
+def spacy_mode() -> Optional[str]:
+    """
+    The spaCy profile to benchmark, or None if the model is not installed
+    """
+    mode = SKILL_EXTRACTION_MODE if SKILL_EXTRACTION_MODE != VOCABULARY_MODE else 'minimal'
+    try:
+        load_spacy_model(mode)
+    except Exception as e:
+        print(f"Skipping spaCy stage: {str(e)}")
+        return None
+    return mode
+
+
+def run_suite(corpus: Dict, repeat: int = 1) -> Dict[str, Dict]:
+    """
+    Runs every stage over the corpus
+
+    Args:
+        corpus: Output of generate_corpus
+        repeat: Passes over the corpus per stage
+
+    Returns:
+        Stage name -> stage results (see run_stage)
+    """
+    resumes = corpus['resumes']
+    job_descriptions = [jd['text'] for jd in corpus['job_descriptions']]
+    stages = {}
+
+    extract_pdf(resumes[0]['pdf'], mode='serial')  # imports PyPDF2
+    stages['pdf_extraction'] = run_stage(
+        resumes, lambda resume: extract_pdf(resume['pdf'], mode='serial'), repeat
+    )
+    stages['clean_text'] = run_stage(resumes, lambda resume: clean_text(resume['raw_text']), repeat)
+
+    texts = [extract_pdf(resume['pdf'], mode='serial')['text'] for resume in resumes]
+    stages['skill_matching'] = run_stage(
+        texts, lambda text: extract_skills(text, mode=VOCABULARY_MODE, fuzzy=False), repeat
+    )
+    stages['fuzzy_matching'] = run_stage(
+        texts, lambda text: extract_skills(text, mode=VOCABULARY_MODE, fuzzy=True), repeat
+    )
+
+    mode = spacy_mode()
+    if mode is not None:
+        stages[f'spacy_{mode}'] = run_stage(texts, lambda text: extract_skills(text, mode=mode), repeat)
+    else:
+        stages['spacy'] = {'skipped': 'spaCy model not installed'}
+
+    # TF-IDF similarity of each resume against each job description; the job
+    # description analysis is prepared outside the timed calls
+    pairs = [(text, jd, analyze_job_description(jd)) for text in texts for jd in job_descriptions]
+    _similarity_scores([pairs[0][0]], pairs[0][1], pairs[0][2])  # imports scikit-learn
+    stages['tfidf_similarity'] = run_stage(pairs, lambda pair: _similarity_scores([pair[0]], pair[1], pair[2]), repeat)
+
+    hashed = [(text, jd, analyze_job_description(jd, engine=HASHING_ENGINE)) for text, jd, _ in pairs]
+    stages['hashing_similarity'] = run_stage(
+        hashed, lambda pair: _similarity_scores([pair[0]], pair[1], pair[2], engine=HASHING_ENGINE), repeat
+    )
+
+    from app import app
+    client = app.test_client()
+
+    def post_analyze(pair):
+        resume, jd = pair
+        response = client.post('/analyze', data={
+            'resume': (io.BytesIO(resume['pdf']), 'resume.pdf'),
+            'job_description': jd
+        })
+        if response.status_code != 200:
+            raise RuntimeError(f"/analyze returned {response.status_code}: {response.get_json()}")
+
+    route_pairs = [(resume, job_descriptions[i % len(job_descriptions)]) for i, resume in enumerate(resumes)]
+    stages['analyze_route'] = run_stage(route_pairs, post_analyze, repeat)
+    return stages
+
+
+def git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except Exception:
+        return None
+
+
+def compare(current: Dict, baseline: Dict, threshold: float = DEFAULT_THRESHOLD) -> List[str]:
+    """
+    Lists stages whose p50 latency, throughput or peak RSS got worse than the
+    baseline by more than threshold (relative)
+    """
+    regressions = []
+    for name, stage in current['stages'].items():
+        base = baseline['stages'].get(name)
+        if not base or 'skipped' in stage or 'skipped' in base:
+            continue
+        checks = [
+            ('p50_ms', stage['p50_ms'] > base['p50_ms'] * (1 + threshold)),
+            ('throughput', stage['throughput'] < base['throughput'] * (1 - threshold)),
+            ('peak_rss_mb', stage['peak_rss_mb'] > base['peak_rss_mb'] * (1 + threshold)),
+        ]
+        for metric, worse in checks:
+            if worse:
+                regressions.append(f"{name}.{metric}: {base[metric]} -> {stage[metric]}")
+    return regressions
+
+
+def print_results(results: Dict, baseline: Optional[Dict] = None):
+    print(f"{'stage':<18} {'calls':>6} {'per s':>9} {'p50 ms':>9} {'p95 ms':>9} "
+          f"{'p99 ms':>9} {'RSS MB':>8} {'p50 vs base':>12}")
+    for name, stage in results['stages'].items():
+        if 'skipped' in stage:
+            print(f"{name:<18} skipped: {stage['skipped']}")
+            continue
+        change = ''
+        base = (baseline or {}).get('stages', {}).get(name)
+        if base and 'skipped' not in base:
+            change = f"{(stage['p50_ms'] / base['p50_ms'] - 1) * 100:+.1f}%"
+        print(f"{name:<18} {stage['calls']:>6} {stage['throughput']:>9.1f} {stage['p50_ms']:>9.2f} "
+              f"{stage['p95_ms']:>9.2f} {stage['p99_ms']:>9.2f} {stage['peak_rss_mb']:>8.1f} {change:>12}")
+
+
+def write_json(data: Dict, path: str):
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump(data, f, indent=2)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--resumes', type=int, default=45)
+    parser.add_argument('--repeat', type=int, default=2, help='Passes over the corpus per stage')
+    parser.add_argument('--quick', action='store_true', help='9 resumes, one pass')
+    parser.add_argument('--output', default=DEFAULT_OUTPUT)
+    parser.add_argument('--baseline', help='Results JSON to compare against')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD)
+    parser.add_argument('--save-baseline', metavar='PATH', help='Also write the results here')
+    args = parser.parse_args()
+
+    if args.quick:
+        args.resumes, args.repeat = 9, 1
+
+    corpus = generate_corpus(args.seed, args.resumes)
+    results = {
+        'meta': {
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+            'git_revision': git_revision(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'skill_extraction_mode': SKILL_EXTRACTION_MODE,
+            'seed': args.seed,
+            'resumes': args.resumes,
+            'repeat': args.repeat
+        },
+        'stages': run_suite(corpus, args.repeat)
+    }
+
+    write_json(results, args.output)
+    if args.save_baseline:
+        write_json(results, args.save_baseline)
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+
+    print_results(results, baseline)
+    print(f"\nResults written to {args.output}")
+
+    if baseline is not None:
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"\nRegressions (more than {args.threshold:.0%} worse than {args.baseline}):")
+            for regression in regressions:
+                print(f"  {regression}")
+            sys.exit(1)
+        print(f"\nNo regressions against {args.baseline}")
+
+
+if __name__ == '__main__':
+    main()
@@ -9,10 +9,160 @@ UPLOAD_FOLDER = 'uploads/resumes'
 MAX_CONTENT_LENGTH = 16 * 1024 * 1024  # 16MB max file size
 ALLOWED_EXTENSIONS = {'pdf'}
 
+# Uploads are parsed from memory; larger ones spill to a temporary file in UPLOAD_FOLDER
+UPLOAD_SPOOL_MAX_SIZE = 2 * 1024 * 1024  # 2MB
+UPLOAD_SPOOL_STREAM_MAX_SIZE = 0  # /analyze/stream uploads go straight to disk, so memory stays flat
+
+# Batch screening (/analyze/batch and /analyze/stream)
+MAX_BATCH_FILES = 500
+MAX_BATCH_CONTENT_LENGTH = 512 * 1024 * 1024  # 512MB max per batch request
+
+# One resume against many job descriptions (/analyze/multi)
+MAX_MULTI_JOB_DESCRIPTIONS = 200
+
+# PDF text extraction limits: stop after this many pages or cleaned characters
+PDF_MAX_PAGES = 50
+PDF_MAX_CHARS = 200000
+
+# PDF extraction mode:
+#   'serial'   - pages are extracted one after another in the request worker
+#   'parallel' - documents with at least PDF_PARALLEL_MIN_PAGES pages are split
+#                across a process pool; hanging pages are skipped after a timeout
+PDF_EXTRACTION_MODE = os.environ.get('PDF_EXTRACTION_MODE', 'serial')
+PDF_PARALLEL_MIN_PAGES = 20
+PDF_POOL_WORKERS = int(os.environ.get('PDF_POOL_WORKERS', '0'))  # 0 = one per CPU core
+PDF_PAGE_TIMEOUT = 5.0  # seconds
+PDF_DOCUMENT_TIMEOUT = 30.0  # seconds
+
+# Pre-parse inspection (trailer, cross-reference table and page dictionaries
+# only, no text extraction) and the limits it enforces before extraction
+PDF_INSPECT_MAX_PAGES = 10  # page dictionaries checked for fonts to detect image-only PDFs
+PDF_REJECT_PAGES = int(os.environ.get('PDF_REJECT_PAGES', '500'))  # more pages are rejected (0 = no limit)
+PDF_REJECT_IMAGE_ONLY = True  # reject PDFs whose pages use no font (scans): there is no text to extract
+PDF_LARGE_PAGES = 10  # documents with at least this many pages are admitted as large
+
+# Cleaned resume text cache, keyed by SHA-256 of the uploaded PDF
+PDF_TEXT_CACHE_ENABLED = os.environ.get('PDF_TEXT_CACHE_ENABLED', 'true').lower() == 'true'
+PDF_TEXT_CACHE_BACKEND = os.environ.get('PDF_TEXT_CACHE_BACKEND', 'sqlite')
+PDF_TEXT_CACHE_PATH = os.environ.get('PDF_TEXT_CACHE_PATH', 'cache/pdf_text.sqlite3')
+PDF_TEXT_CACHE_MAX_ENTRIES = 10000
+PDF_TEXT_CACHE_MAX_BYTES = 256 * 1024 * 1024  # 256MB
+
+# Asynchronous analysis jobs (POST /jobs, GET /jobs/<id>)
+JOBS_DB_PATH = os.environ.get('JOBS_DB_PATH', 'data/jobs.sqlite3')
+JOB_WORKERS = int(os.environ.get('JOB_WORKERS', '2'))  # local worker processes started by the app, in total across web workers
+JOB_QUEUE_MAX_DEPTH = 1000  # queued + running jobs
+JOB_RESULT_TTL = 24 * 60 * 60  # seconds finished jobs are kept
+JOB_LEASE_SECONDS = 120  # a running job is retried if not finished within this time
+JOB_MAX_ATTEMPTS = 3
+JOB_POLL_INTERVAL = 0.2  # seconds
+
+# Candidate store: skills of every analyzed resume in an inverted index (GET /candidates/search)
+CANDIDATE_STORE_ENABLED = os.environ.get('CANDIDATE_STORE_ENABLED', 'true').lower() == 'true'
+CANDIDATE_STORE_PATH = os.environ.get('CANDIDATE_STORE_PATH', 'data/candidates.sqlite3')
+CANDIDATE_STORE_MERGE_SEGMENTS = 32  # appended posting segments of a skill before they are merged
+
+# Hashed vectors of the stored candidates (HASHING_N_FEATURES columns), kept on disk
+# as an append-only CSR matrix and memory-mapped to rank them (POST /candidates/rank)
+RESUME_MATRIX_DIR = os.environ.get('RESUME_MATRIX_DIR', 'data/resume_matrix')
+RANKING_SKILL_WEIGHT = float(os.environ.get('RANKING_SKILL_WEIGHT', '0.5'))  # share of skill coverage in the score
+RANKING_CHUNK_ROWS = 5000  # resumes scored per step (bounds memory per query)
+RANKING_MAX_JOB_DESCRIPTIONS = 200
+RANKING_MAX_K = 500
+
+# Admission control for the /analyze routes, per worker process. At most
+# ANALYZE_MAX_IN_FLIGHT analyses run at once (ANALYZE_MAX_LARGE_IN_FLIGHT of them on
+# large documents or batches); up to ANALYZE_MAX_QUEUE more wait for a slot, for at
+# most ANALYZE_QUEUE_TIMEOUT seconds. Beyond that, requests get 503 with Retry-After.
+ANALYZE_MAX_IN_FLIGHT = int(os.environ.get('ANALYZE_MAX_IN_FLIGHT', '2'))  # 0 = no admission control
+ANALYZE_MAX_LARGE_IN_FLIGHT = 1
+ANALYZE_MAX_QUEUE = int(os.environ.get('ANALYZE_MAX_QUEUE', '4'))
+ANALYZE_QUEUE_TIMEOUT = 5.0  # seconds
+ANALYZE_RETRY_AFTER = 5  # seconds
+
+# Offline bulk screening (python -m modules.screen)
+SCREEN_WORKERS = int(os.environ.get('SCREEN_WORKERS', '0'))  # 0 = one per CPU core
+SCREEN_MEMORY_LIMIT_MB = 1024  # a worker is replaced once its peak RSS exceeds this (0 = never)
+SCREEN_HARD_MEMORY_LIMIT_MB = 0  # address space cap per worker; larger resumes fail (0 = none)
+SCREEN_CHECKPOINT_INTERVAL = 2.0  # seconds between output flushes and checkpoint writes
+SCREEN_PROGRESS_INTERVAL = 5.0  # seconds between progress lines
+
+# Model preloading and warmup (GET /ready reports when it has finished)
+#   'preload'    - load and warm up at import, then gc.freeze(); for the gunicorn
+#                  master with preload_app (see gunicorn.conf.py), so workers share it
+#   'background' - warm up in a background thread of each process
+#   'off'        - no warmup, ready right away
+WARMUP_MODE = os.environ.get('WARMUP_MODE', 'background')
+
+# Instrumentation (GET /metrics, Server-Timing header)
+METRICS_ENABLED = os.environ.get('METRICS_ENABLED', 'true').lower() == 'true'
+METRICS_DIR = os.environ.get('METRICS_DIR', 'data/metrics')  # one file per worker process, merged by /metrics
+METRICS_FLUSH_INTERVAL = 1.0  # seconds between writes of a worker's metrics file
+
+# Sampling profiler: writes collapsed stacks (flamegraph.pl / speedscope) of slow requests
+PROFILE_SLOW_REQUESTS = os.environ.get('PROFILE_SLOW_REQUESTS', 'false').lower() == 'true'
+PROFILE_THRESHOLD_MS = float(os.environ.get('PROFILE_THRESHOLD_MS', '1000'))
+PROFILE_INTERVAL = 0.005  # seconds between stack samples
+PROFILE_DIR = os.environ.get('PROFILE_DIR', 'data/profiles')
+
 # NLP Configuration
 SPACY_MODEL = 'en_core_web_sm'
 
+# Skill extraction mode:
+#   'full'    - every component of SPACY_MODEL
+#   'minimal' - spaCy without NER and lemmatizer (same results, less work)
+#   'vocab'   - skip spaCy and use only the skills vocabulary matcher
+SKILL_EXTRACTION_MODE = os.environ.get('SKILL_EXTRACTION_MODE', 'minimal')
+SPACY_BATCH_SIZE = int(os.environ.get('SPACY_BATCH_SIZE', '32'))
+
+# Also match skills that contain a whole noun phrase (e.g. "learning" -> "machine learning")
+SKILL_PHRASE_REVERSE_MATCH = os.environ.get('SKILL_PHRASE_REVERSE_MATCH', 'true').lower() == 'true'
+
+# Also match skills with typos, split words or other punctuation ('postgressql',
+# 'kuber netes', 'node js'). A word of at least SKILL_FUZZY_MIN_LENGTHS[d - 1] characters
+# may be d edits away from a skill name, up to SKILL_FUZZY_MAX_DISTANCE (at most 2).
+# Resume skills found this way are only reported in fuzzy_skills, never mixed into the
+# exact skill lists that are scored and stored. Job descriptions are matched exactly
+# unless SKILL_FUZZY_MATCH_JD is on, which adds approximate matches to the JD skills.
+SKILL_FUZZY_MATCH = os.environ.get('SKILL_FUZZY_MATCH', 'false').lower() == 'true'
+SKILL_FUZZY_MATCH_JD = os.environ.get('SKILL_FUZZY_MATCH_JD', 'false').lower() == 'true'
+SKILL_FUZZY_MAX_DISTANCE = int(os.environ.get('SKILL_FUZZY_MAX_DISTANCE', '2'))
+SKILL_FUZZY_MIN_LENGTHS = (8, 12)[:SKILL_FUZZY_MAX_DISTANCE]
+
+# Skill taxonomy: canonical skills with their aliases and category. The JSON file is
+# compiled into TAXONOMY_ARTIFACT_PATH with python -m modules.skill_db build (a deploy
+# step: the artifact is not committed, and it is unpickled, so it must be trusted). Running
+# processes reload a new version when either file changes (checked at most every
+# TAXONOMY_RELOAD_INTERVAL seconds, 0 = never) or on TAXONOMY_RELOAD_SIGNAL ('' = off)
+_MODULES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'modules')
+TAXONOMY_PATH = os.environ.get('TAXONOMY_PATH', os.path.join(_MODULES_DIR, 'skill_taxonomy.json'))
+TAXONOMY_ARTIFACT_PATH = os.environ.get('TAXONOMY_ARTIFACT_PATH', os.path.join(_MODULES_DIR, 'skill_taxonomy.pickle'))
+TAXONOMY_RELOAD_INTERVAL = float(os.environ.get('TAXONOMY_RELOAD_INTERVAL', '5'))
+TAXONOMY_RELOAD_SIGNAL = os.environ.get('TAXONOMY_RELOAD_SIGNAL', 'SIGHUP')
+
 # Matching Configuration
+# Corpus-fitted TF-IDF model (python -m modules.tfidf_model fit ...).
+# When the file is missing, a vectorizer is fitted per request instead.
+TFIDF_MODEL_PATH = os.environ.get('TFIDF_MODEL_PATH', 'models/tfidf_model.npz')
+TFIDF_MAX_FEATURES = 50000
+
+# Similarity engine behind match_percentage:
+#   'tfidf'   - TF-IDF cosine with the corpus-fitted model above, or a vectorizer
+#               fitted per request when there is none
+#   'hashing' - cosine of hashed, log-damped n-gram counts: no vocabulary and no fit,
+#               so every document's vector is independent and can be cached and
+#               compared in bulk
+SIMILARITY_ENGINE = os.environ.get('SIMILARITY_ENGINE', 'tfidf')
+HASHING_N_FEATURES = 2 ** 20  # hashed feature columns (collisions get rarer as this grows)
+
+# Job description analysis cache (extracted skills and TF-IDF vector per JD)
+#   'memory' - per-process LRU cache
+#   'sqlite' - LRU cache in a local file shared by all gunicorn workers
+JD_CACHE_BACKEND = os.environ.get('JD_CACHE_BACKEND', 'memory')
+JD_CACHE_PATH = os.environ.get('JD_CACHE_PATH', 'cache/jd_cache.sqlite3')
+JD_CACHE_MAX_ENTRIES = 1024
+JD_CACHE_MAX_BYTES = 64 * 1024 * 1024  # 64MB
+JD_CACHE_TTL = float(os.environ['JD_CACHE_TTL']) if os.environ.get('JD_CACHE_TTL') else None  # seconds
 MIN_SIMILARITY_THRESHOLD = 0.0  # Minimum similarity score to consider
 
 # Ensure upload directory exists
@@ -0,0 +1,44 @@
+"""
+Gunicorn Configuration
+Loads and warms up the models once in the master, then forks workers that
+share the frozen heap copy-on-write
+"""
+
+import multiprocessing
+import os
+
+# Read by config.py when the app is imported (in the master, thanks to preload_app)
+os.environ.setdefault('WARMUP_MODE', 'preload')
+
+preload_app = True
+bind = f"0.0.0.0:{os.environ.get('PORT', '8000')}"
+workers = int(os.environ.get('WEB_CONCURRENCY', min(multiprocessing.cpu_count() * 2 + 1, 8)))
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', '120'))
+# Threaded workers: admission control (ANALYZE_MAX_IN_FLIGHT, ANALYZE_MAX_QUEUE) bounds
+# the analyses of each worker, and the spare threads keep cheap routes such as
+# /ready and /metrics responsive while analyses run or wait
+threads = int(os.environ.get('GUNICORN_THREADS', '8'))
+
+
+def on_starting(server):
+    # Metrics files of the previous run (dead workers, earlier deploys) would
+    # be summed into /metrics forever; the master publishes what it recorded
+    # while preloading
+    from modules import metrics
+    metrics.clear_files()
+    if metrics.METRICS_ENABLED:
+        metrics.flush()
+
+
+def post_worker_init(worker):
+    # Workers reset every signal handler after the fork; reinstall the one
+    # that reloads the skill taxonomy
+    from modules.skill_db import install_reload_signal
+    install_reload_signal()
+
+
+def worker_exit(server, worker):
+    # Publishes the requests a worker served since its last flush
+    from modules import metrics
+    if metrics.METRICS_ENABLED:
+        metrics.flush()
@@ -1,11 +1,20 @@
 """
 Smart Resume Analyzer Modules Package
+
+The public names below are imported from their submodules on first access,
+so `import modules` does not pull in PyPDF2, spaCy or scikit-learn
 """
 
-from .resume_parser import get_resume_text
-from .skill_extractor import extract_skills
-from .matcher import get_match_analysis
-from .skill_db import SKILLS_DATABASE
+import importlib
+from typing import TYPE_CHECKING
+
+# Public name -> submodule that defines it
+_EXPORTS = {
+    'get_resume_text': 'resume_parser',
+    'extract_skills': 'skill_extractor',
+    'get_match_analysis': 'matcher',
+    'SKILLS_DATABASE': 'skill_db',
+}
 
 __all__ = [
     'get_resume_text',
@@ -14,3 +23,22 @@ __all__ = [
     'SKILLS_DATABASE'
 ]
 
+if TYPE_CHECKING:
+    from .resume_parser import get_resume_text
+    from .skill_extractor import extract_skills
+    from .matcher import get_match_analysis
+    from .skill_db import SKILLS_DATABASE
+
+
+def __getattr__(name: str):
+    submodule = _EXPORTS.get(name)
+    if submodule is None:
+        raise AttributeError(f"module '{__name__}' has no attribute '{name}'")
+    value = getattr(importlib.import_module(f'.{submodule}', __name__), name)
+    # Cache it, so later lookups don't go through __getattr__
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,248 @@
+"""
+Cache Module
+Bounded LRU caches with optional TTL, in process memory or in a shared sqlite file
+"""
+
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+
+class LRUCache:
+    """
+    In-process LRU cache bounded by number of entries and by bytes.
+
+    Entry sizes are measured as the length of their pickled value. Entries
+    older than ttl seconds (when set) are treated as misses and dropped.
+    """
+
+    def __init__(self, max_entries: int = 1024, max_bytes: int = 64 * 1024 * 1024,
+                 ttl: Optional[float] = None):
+        """
+        Args:
+            max_entries: Maximum number of entries
+            max_bytes: Maximum total size of the pickled values
+            ttl: Time to live in seconds (None keeps entries until evicted)
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()  # key -> (value, size, created)
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        """
+        Returns the cached value for key, or None on a miss
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self.ttl is not None and time.time() - entry[2] > self.ttl:
+                self._remove(key)
+                entry = None
+
+            if entry is None:
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def set(self, key: str, value: Any):
+        """
+        Stores value under key, evicting least recently used entries if needed
+        """
+        size = len(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+        if size > self.max_bytes:
+            return
+
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (value, size, time.time())
+            self._bytes += size
+
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.evictions += 1
+
+    def _remove(self, key: str):
+        _, size, _ = self._entries.pop(key)
+        self._bytes -= size
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict:
+        """
+        Returns hit/miss/eviction counters and current usage
+        """
+        with self._lock:
+            return _stats(self, len(self._entries), self._bytes, 'memory')
+
+
+class SqliteCache:
+    """
+    LRU cache stored in a local sqlite file, shared by every process that
+    opens the same path (e.g. all gunicorn workers).
+
+    Same bounds and TTL semantics as LRUCache. Hit/miss/eviction counters are
+    kept per process.
+    """
+
+    def __init__(self, path: str, max_entries: int = 1024, max_bytes: int = 64 * 1024 * 1024,
+                 ttl: Optional[float] = None):
+        """
+        Args:
+            path: sqlite database file
+            max_entries: Maximum number of entries
+            max_bytes: Maximum total size of the pickled values
+            ttl: Time to live in seconds (None keeps entries until evicted)
+        """
+        self.path = path
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._local = threading.local()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        with self._connection() as connection:
+            connection.execute(
+                'CREATE TABLE IF NOT EXISTS cache ('
+                'key TEXT PRIMARY KEY, value BLOB NOT NULL, size INTEGER NOT NULL, '
+                'created REAL NOT NULL, accessed REAL NOT NULL)'
+            )
+            connection.execute('CREATE INDEX IF NOT EXISTS cache_accessed ON cache (accessed)')
+
+    def _connection(self) -> sqlite3.Connection:
+        # One connection per thread and per process (connections must not cross a fork)
+        connection = getattr(self._local, 'connection', None)
+        if connection is None or self._local.pid != os.getpid():
+            connection = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute('PRAGMA synchronous=NORMAL')
+            self._local.connection = connection
+            self._local.pid = os.getpid()
+        return connection
+
+    def get(self, key: str) -> Optional[Any]:
+        """
+        Returns the cached value for key, or None on a miss
+        """
+        connection = self._connection()
+        row = connection.execute('SELECT value, created FROM cache WHERE key = ?', (key,)).fetchone()
+        now = time.time()
+
+        if row is not None and self.ttl is not None and now - row[1] > self.ttl:
+            connection.execute('DELETE FROM cache WHERE key = ?', (key,))
+            row = None
+
+        if row is None:
+            self.misses += 1
+            return None
+
+        connection.execute('UPDATE cache SET accessed = ? WHERE key = ?', (now, key))
+        self.hits += 1
+        return pickle.loads(row[0])
+
+    def set(self, key: str, value: Any):
+        """
+        Stores value under key, evicting least recently used entries if needed
+        """
+        blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        if len(blob) > self.max_bytes:
+            return
+
+        now = time.time()
+        connection = self._connection()
+        connection.execute('BEGIN IMMEDIATE')
+        try:
+            connection.execute(
+                'INSERT OR REPLACE INTO cache (key, value, size, created, accessed) VALUES (?, ?, ?, ?, ?)',
+                (key, sqlite3.Binary(blob), len(blob), now, now)
+            )
+            entries, total_bytes = connection.execute(
+                'SELECT COUNT(*), COALESCE(SUM(size), 0) FROM cache'
+            ).fetchone()
+
+            if entries > self.max_entries or total_bytes > self.max_bytes:
+                evicted = []
+                for old_key, size in connection.execute('SELECT key, size FROM cache ORDER BY accessed'):
+                    if entries <= self.max_entries and total_bytes <= self.max_bytes:
+                        break
+                    evicted.append((old_key,))
+                    entries -= 1
+                    total_bytes -= size
+                connection.executemany('DELETE FROM cache WHERE key = ?', evicted)
+                self.evictions += len(evicted)
+
+            connection.execute('COMMIT')
+        except Exception:
+            connection.execute('ROLLBACK')
+            raise
+
+    def clear(self):
+        self._connection().execute('DELETE FROM cache')
+
+    def stats(self) -> Dict:
+        """
+        Returns hit/miss/eviction counters and current usage
+        """
+        entries, total_bytes = self._connection().execute(
+            'SELECT COUNT(*), COALESCE(SUM(size), 0) FROM cache'
+        ).fetchone()
+        return _stats(self, entries, total_bytes, 'sqlite')
+
+
+def _stats(cache, entries: int, total_bytes: int, backend: str) -> Dict:
+    lookups = cache.hits + cache.misses
+    return {
+        'backend': backend,
+        'hits': cache.hits,
+        'misses': cache.misses,
+        'evictions': cache.evictions,
+        'hit_rate': round(cache.hits / lookups, 4) if lookups else 0.0,
+        'entries': entries,
+        'bytes': total_bytes,
+        'max_entries': cache.max_entries,
+        'max_bytes': cache.max_bytes
+    }
+
+
+def create_cache(backend: str, path: str, max_entries: int, max_bytes: int,
+                 ttl: Optional[float] = None):
+    """
+    Creates an LRU cache for the configured backend
+
+    Args:
+        backend: 'memory' (per process) or 'sqlite' (shared file)
+        path: sqlite file, used by the sqlite backend only
+        max_entries: Maximum number of entries
+        max_bytes: Maximum total size of the pickled values
+        ttl: Time to live in seconds (None keeps entries until evicted)
+
+    Returns:
+        LRUCache or SqliteCache
+    """
+    if backend == 'memory':
+        return LRUCache(max_entries, max_bytes, ttl)
+    if backend == 'sqlite':
+        return SqliteCache(path, max_entries, max_bytes, ttl)
+    raise ValueError(f"Unknown cache backend '{backend}'. Expected 'memory' or 'sqlite'")
@@ -0,0 +1,580 @@
+"""
+Candidate Store Module
+Persists analyzed candidates in an inverted skill index for boolean search and top-k ranking
+"""
+
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+import zlib
+from contextlib import contextmanager
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from modules.skill_db import get_taxonomy
+from config import CANDIDATE_STORE_ENABLED, CANDIDATE_STORE_MERGE_SEGMENTS, CANDIDATE_STORE_PATH
+
+
+class QuerySyntaxError(ValueError):
+    """
+    Raised for malformed boolean skill queries
+    """
+
+
+def encode_postings(ids: np.ndarray) -> bytes:
+    """
+    Compresses a sorted array of candidate ids (delta encoding + zlib)
+    """
+    deltas = np.diff(np.asarray(ids, dtype=np.int64), prepend=0).astype('<u4')
+    return zlib.compress(deltas.tobytes(), 6)
+
+
+def decode_postings(data: bytes) -> np.ndarray:
+    """
+    Restores the sorted candidate ids written by encode_postings
+    """
+    if not data:
+        return np.empty(0, dtype=np.int64)
+    return np.cumsum(np.frombuffer(zlib.decompress(data), dtype='<u4'), dtype=np.int64)
+
+
+# Query tokens: parentheses, quoted skills, operators and bare words
+_QUERY_TOKEN_RE = re.compile(r'\(|\)|"[^"]*"|[^\s()"]+')
+_OPERATORS = {'AND', 'OR', 'NOT'}
+
+
+def _canonical_skill(name: str) -> str:
+    """
+    Normalizes a skill name from a query; aliases ('js', 'k8s') stand for
+    their canonical skill and unknown names are kept as written
+    """
+    name = ' '.join(name.lower().split())
+    return get_taxonomy().canonical(name) or name
+
+
+def parse_query(query: str):
+    """
+    Parses a boolean skill query into a tree
+
+    Operators are AND, OR and NOT (uppercase, NOT binds tightest, then AND,
+    then OR) with parentheses for grouping. Consecutive words form one skill,
+    so 'spring boot AND NOT java' is ('and', [('skill', 'spring boot'),
+    ('not', ('skill', 'java'))]). Skills may also be quoted.
+
+    Args:
+        query: Query string
+
+    Returns:
+        Nested tuples: ('skill', name), ('not', node), ('and', [nodes]), ('or', [nodes])
+
+    Raises:
+        QuerySyntaxError: If the query is malformed
+    """
+    tokens = []
+    words = []
+    for token in _QUERY_TOKEN_RE.findall(query):
+        if token in _OPERATORS or token in ('(', ')') or token.startswith('"'):
+            if words:
+                tokens.append(('skill', _canonical_skill(' '.join(words))))
+                words = []
+            if token.startswith('"'):
+                tokens.append(('skill', _canonical_skill(token.strip('"'))))
+            else:
+                tokens.append(('op', token))
+        else:
+            words.append(token)
+    if words:
+        tokens.append(('skill', _canonical_skill(' '.join(words))))
+
+    position = 0
+
+    def peek():
+        return tokens[position] if position < len(tokens) else None
+
+    def parse_or():
+        nonlocal position
+        nodes = [parse_and()]
+        while peek() == ('op', 'OR'):
+            position += 1
+            nodes.append(parse_and())
+        return nodes[0] if len(nodes) == 1 else ('or', nodes)
+
+    def parse_and():
+        nonlocal position
+        nodes = [parse_not()]
+        while peek() == ('op', 'AND'):
+            position += 1
+            nodes.append(parse_not())
+        return nodes[0] if len(nodes) == 1 else ('and', nodes)
+
+    def parse_not():
+        nonlocal position
+        if peek() == ('op', 'NOT'):
+            position += 1
+            return ('not', parse_not())
+        return parse_atom()
+
+    def parse_atom():
+        nonlocal position
+        token = peek()
+        if token is None:
+            raise QuerySyntaxError('Unexpected end of query')
+        position += 1
+        if token == ('op', '('):
+            node = parse_or()
+            if peek() != ('op', ')'):
+                raise QuerySyntaxError('Missing closing parenthesis')
+            position += 1
+            return node
+        if token[0] == 'skill' and token[1]:
+            return token
+        raise QuerySyntaxError(f"Unexpected '{token[1]}'")
+
+    tree = parse_or()
+    if position != len(tokens):
+        raise QuerySyntaxError(f"Unexpected '{tokens[position][1]}'")
+    return tree
+
+
+class CandidateStore:
+    """
+    Candidates with their extracted skills, plus an inverted index
+    skill -> sorted candidate ids stored as compressed postings in sqlite.
+
+    Inserts never rewrite a posting list: each one appends a small segment
+    per skill with the new ids. Queries concatenate a skill's merged postings
+    and its segments, and once a skill has max_segments segments they are
+    folded into its merged postings (see merge_segments).
+
+    Decoded postings are cached in memory and dropped whenever another
+    process (or this one) adds candidates.
+    """
+
+    def __init__(self, path: str = CANDIDATE_STORE_PATH, max_segments: int = CANDIDATE_STORE_MERGE_SEGMENTS):
+        self.path = path
+        self.max_segments = max_segments
+        self._local = threading.local()
+        self._lock = threading.RLock()
+        self._postings_cache: Dict[str, np.ndarray] = {}
+        self._all_ids: Optional[np.ndarray] = None
+        self._cache_version = None
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        connection = self._connection()
+        connection.execute(
+            'CREATE TABLE IF NOT EXISTS candidates ('
+            'id INTEGER PRIMARY KEY AUTOINCREMENT, name TEXT, content_hash TEXT UNIQUE, '
+            'skills TEXT NOT NULL, created REAL NOT NULL)'
+        )
+        connection.execute(
+            'CREATE TABLE IF NOT EXISTS postings ('
+            'skill TEXT PRIMARY KEY, ids BLOB NOT NULL, count INTEGER NOT NULL)'
+        )
+        connection.execute(
+            'CREATE TABLE IF NOT EXISTS posting_segments ('
+            'id INTEGER PRIMARY KEY AUTOINCREMENT, skill TEXT NOT NULL, ids BLOB NOT NULL, count INTEGER NOT NULL)'
+        )
+        connection.execute('CREATE INDEX IF NOT EXISTS posting_segments_skill ON posting_segments (skill, id)')
+        connection.execute('CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value INTEGER NOT NULL)')
+        connection.execute("INSERT OR IGNORE INTO meta (key, value) VALUES ('version', 0)")
+        connection.execute("INSERT OR IGNORE INTO meta (key, value) VALUES ('candidates', 0)")
+
+    def _connection(self) -> sqlite3.Connection:
+        # One connection per thread and per process (connections must not cross a fork)
+        connection = getattr(self._local, 'connection', None)
+        if connection is None or self._local.pid != os.getpid():
+            connection = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute('PRAGMA synchronous=NORMAL')
+            self._local.connection = connection
+            self._local.pid = os.getpid()
+        return connection
+
+    def add_candidates(self, candidates: Iterable[Tuple[str, List[str], Optional[str]]]) -> List[int]:
+        """
+        Adds analyzed candidates and appends a postings segment per skill
+
+        Each skill of the batch gets one segment with its new ids, so the cost
+        of an insert does not depend on how many candidates are stored. Skills
+        that reach max_segments segments are merged afterwards, outside the
+        write transaction. A candidate whose content_hash is already stored
+        keeps its existing id.
+
+        Args:
+            candidates: (name, skills, content_hash) tuples
+
+        Returns:
+            Candidate ids, aligned with the input
+        """
+        now = time.time()
+        connection = self._connection()
+        connection.execute('BEGIN IMMEDIATE')
+        try:
+            ids = []
+            inserted = 0
+            new_ids_by_skill: Dict[str, List[int]] = {}
+            for name, skills, content_hash in candidates:
+                if content_hash is not None:
+                    row = connection.execute(
+                        'SELECT id FROM candidates WHERE content_hash = ?', (content_hash,)
+                    ).fetchone()
+                    if row is not None:
+                        ids.append(row[0])
+                        continue
+
+                skills = sorted({skill.lower() for skill in skills})
+                cursor = connection.execute(
+                    'INSERT INTO candidates (name, content_hash, skills, created) VALUES (?, ?, ?, ?)',
+                    (name, content_hash, json.dumps(skills), now)
+                )
+                ids.append(cursor.lastrowid)
+                inserted += 1
+                for skill in skills:
+                    new_ids_by_skill.setdefault(skill, []).append(cursor.lastrowid)
+
+            # New ids are always larger than stored ones, so segments in the
+            # order they were written hold ascending ids
+            connection.executemany(
+                'INSERT INTO posting_segments (skill, ids, count) VALUES (?, ?, ?)',
+                [(skill, sqlite3.Binary(encode_postings(np.asarray(new_ids, dtype=np.int64))), len(new_ids))
+                 for skill, new_ids in new_ids_by_skill.items()]
+            )
+            # Skills whose segments are due for a merge
+            full = []
+            new_skills = list(new_ids_by_skill)
+            for start in range(0, len(new_skills), 500):
+                chunk = new_skills[start:start + 500]
+                placeholders = ','.join('?' * len(chunk))
+                full.extend(row[0] for row in connection.execute(
+                    f'SELECT skill FROM posting_segments WHERE skill IN ({placeholders}) '
+                    'GROUP BY skill HAVING COUNT(*) >= ?', chunk + [self.max_segments]
+                ))
+
+            if inserted:
+                connection.execute("UPDATE meta SET value = value + 1 WHERE key = 'version'")
+                connection.execute("UPDATE meta SET value = value + ? WHERE key = 'candidates'", (inserted,))
+            connection.execute('COMMIT')
+        except Exception:
+            connection.execute('ROLLBACK')
+            raise
+
+        try:
+            self.merge_segments_of(full)
+        except Exception as e:
+            # The segments stay readable; the next insert retries the merge
+            print(f"Error merging posting segments: {str(e)}")
+        return ids
+
+    def _read_postings(self, connection: sqlite3.Connection, skill: str) -> Tuple[np.ndarray, int]:
+        # Merged postings followed by the segments appended since, and the
+        # id of the last segment read
+        row = connection.execute('SELECT ids FROM postings WHERE skill = ?', (skill,)).fetchone()
+        parts = [decode_postings(row[0])] if row is not None else []
+        last_segment = 0
+        for segment_id, data in connection.execute(
+            'SELECT id, ids FROM posting_segments WHERE skill = ? ORDER BY id', (skill,)
+        ):
+            parts.append(decode_postings(data))
+            last_segment = segment_id
+        if not parts:
+            return np.empty(0, dtype=np.int64), last_segment
+        return (parts[0] if len(parts) == 1 else np.concatenate(parts)), last_segment
+
+    def merge_segments_of(self, skills: Iterable[str]) -> int:
+        """
+        Folds the appended segments of skills into their merged postings
+
+        Postings are read and re-encoded from a snapshot; the write transaction
+        only swaps in the result, and skips a skill if another process merged
+        it in the meantime.
+
+        Args:
+            skills: Skills to merge
+
+        Returns:
+            Number of skills merged
+        """
+        connection = self._connection()
+        merged = 0
+        for skill in skills:
+            connection.execute('BEGIN')
+            try:
+                postings, last_segment = self._read_postings(connection, skill)
+                segments = connection.execute(
+                    'SELECT COUNT(*) FROM posting_segments WHERE skill = ? AND id <= ?', (skill, last_segment)
+                ).fetchone()[0]
+            finally:
+                connection.execute('COMMIT')
+            if not segments:
+                continue
+            data = sqlite3.Binary(encode_postings(postings))
+
+            connection.execute('BEGIN IMMEDIATE')
+            try:
+                current = connection.execute(
+                    'SELECT COUNT(*) FROM posting_segments WHERE skill = ? AND id <= ?', (skill, last_segment)
+                ).fetchone()[0]
+                if current == segments:
+                    connection.execute(
+                        'INSERT OR REPLACE INTO postings (skill, ids, count) VALUES (?, ?, ?)',
+                        (skill, data, len(postings))
+                    )
+                    connection.execute(
+                        'DELETE FROM posting_segments WHERE skill = ? AND id <= ?', (skill, last_segment)
+                    )
+                    merged += 1
+                connection.execute('COMMIT')
+            except Exception:
+                connection.execute('ROLLBACK')
+                raise
+        return merged
+
+    def merge_segments(self) -> int:
+        """
+        Merges the appended segments of every skill (e.g. before a backup)
+
+        Returns:
+            Number of skills merged
+        """
+        skills = [row[0] for row in self._connection().execute('SELECT DISTINCT skill FROM posting_segments')]
+        return self.merge_segments_of(skills)
+
+    def add_candidate(self, name: str, skills: List[str], content_hash: Optional[str] = None) -> int:
+        """
+        Adds one analyzed candidate
+
+        Args:
+            name: Display name (e.g. the resume filename)
+            skills: Skills extracted from the resume
+            content_hash: SHA-256 of the resume, used to avoid duplicates
+
+        Returns:
+            Candidate id
+        """
+        return self.add_candidates([(name, skills, content_hash)])[0]
+
+    @contextmanager
+    def _snapshot(self):
+        # Queries read postings and candidates from one consistent version of
+        # the store, dropping cached postings if candidates were added since
+        with self._lock:
+            connection = self._connection()
+            connection.execute('BEGIN')
+            try:
+                version = connection.execute("SELECT value FROM meta WHERE key = 'version'").fetchone()[0]
+                if version != self._cache_version:
+                    self._postings_cache = {}
+                    self._all_ids = None
+                    self._cache_version = version
+                yield
+            finally:
+                connection.execute('COMMIT')
+
+    def postings(self, skill: str) -> np.ndarray:
+        """
+        Returns the sorted ids of candidates with a skill
+        """
+        skill = skill.lower()
+        with self._lock:
+            cached = self._postings_cache.get(skill)
+            if cached is None:
+                cached, _ = self._read_postings(self._connection(), skill)
+                self._postings_cache[skill] = cached
+            return cached
+
+    def _universe(self) -> np.ndarray:
+        with self._lock:
+            if self._all_ids is None:
+                connection = self._connection()
+                max_id = connection.execute('SELECT MAX(id) FROM candidates').fetchone()[0] or 0
+                if self.count() == max_id:
+                    # Ids are dense unless rows were deleted by hand
+                    self._all_ids = np.arange(1, max_id + 1, dtype=np.int64)
+                else:
+                    rows = connection.execute('SELECT id FROM candidates ORDER BY id').fetchall()
+                    self._all_ids = np.fromiter((row[0] for row in rows), dtype=np.int64, count=len(rows))
+            return self._all_ids
+
+    def _mask(self, ids: np.ndarray) -> np.ndarray:
+        universe = self._universe()
+        mask = np.zeros(int(universe[-1]) + 1 if len(universe) else 1, dtype=bool)
+        mask[ids] = True
+        return mask
+
+    def _evaluate(self, node) -> np.ndarray:
+        kind = node[0]
+        if kind == 'skill':
+            return self.postings(node[1])
+        if kind == 'not':
+            mask = self._mask(self._universe())
+            mask[self._evaluate(node[1])] = False
+            return np.flatnonzero(mask)
+        if kind == 'or':
+            mask = self._mask(self._evaluate(node[1][0]))
+            for child in node[1][1:]:
+                mask[self._evaluate(child)] = True
+            return np.flatnonzero(mask)
+
+        # AND: start from the shortest positive posting list and keep the ids
+        # present in (or, for negated terms, absent from) each other list
+        positives = [child for child in node[1] if child[0] != 'not']
+        negatives = [child[1] for child in node[1] if child[0] == 'not']
+        if positives:
+            sets = sorted((self._evaluate(child) for child in positives), key=len)
+        else:
+            sets = [self._universe()]
+        result = sets[0]
+        for other in sets[1:]:
+            if not len(result):
+                break
+            result = result[self._mask(other)[result]]
+        for child in negatives:
+            if not len(result):
+                break
+            result = result[~self._mask(self._evaluate(child))[result]]
+        return result
+
+    def search(self, query: str, limit: int = 100) -> Dict:
+        """
+        Runs a boolean skill query, e.g. 'kafka AND kubernetes AND NOT java'
+
+        Args:
+            query: Boolean query (see parse_query)
+            limit: Maximum number of candidates returned
+
+        Returns:
+            Dictionary with total number of matches and the first candidates
+
+        Raises:
+            QuerySyntaxError: If the query is malformed
+        """
+        tree = parse_query(query)
+        with self._snapshot():
+            ids = self._evaluate(tree)
+            return {
+                'total': int(len(ids)),
+                'candidates': self.get_candidates(ids[:limit].tolist())
+            }
+
+    def top_k(self, skills: List[str], k: int = 10) -> List[Dict]:
+        """
+        Candidates with the most of the given skills (e.g. a job description's)
+
+        Args:
+            skills: Skills to match
+            k: Number of candidates returned
+
+        Returns:
+            Candidates sorted by number of matched skills (ties by id), each
+            with matched_count and matched_skills
+        """
+        skills = sorted({_canonical_skill(skill) for skill in skills})
+        if k <= 0:
+            return []
+        with self._snapshot():
+            postings = [self.postings(skill) for skill in skills]
+            postings = [ids for ids in postings if len(ids)]
+            if not postings:
+                return []
+
+            # Count matched skills per candidate id over the concatenated postings
+            counts = np.bincount(np.concatenate(postings))
+            top_ids = self._top_ids(counts, k)
+            candidates = self.get_candidates(top_ids.tolist())
+
+        skill_set = set(skills)
+        for candidate in candidates:
+            candidate['matched_skills'] = [skill for skill in candidate['skills'] if skill in skill_set]
+            candidate['matched_count'] = len(candidate['matched_skills'])
+        return candidates
+
+    def skill_hits(self, skills: List[str]) -> np.ndarray:
+        """
+        Sorted ids of the candidates having any of the skills, each repeated
+        once per skill it has (np.bincount gives matched skills per candidate)
+        """
+        skills = sorted({_canonical_skill(skill) for skill in skills})
+        with self._snapshot():
+            postings = [self.postings(skill) for skill in skills]
+        if not postings:
+            return np.empty(0, dtype=np.int64)
+        return np.sort(np.concatenate(postings), kind='stable')
+
+    @staticmethod
+    def _top_ids(counts: np.ndarray, k: int) -> np.ndarray:
+        # Ids with the k highest counts, ties broken by lowest id
+        matched = np.flatnonzero(counts)
+        if len(matched) > k:
+            # k-th best count, then everything above it plus the lowest ids tied with it
+            threshold = -np.partition(-counts[matched], k - 1)[k - 1]
+            above = matched[counts[matched] > threshold]
+            tied = matched[counts[matched] == threshold][:k - len(above)]
+            matched = np.concatenate([above, tied])
+        order = np.lexsort((matched, -counts[matched]))
+        return matched[order]
+
+    def get_candidates(self, ids: List[int]) -> List[Dict]:
+        """
+        Loads candidates by id, keeping the order of ids
+        """
+        if not ids:
+            return []
+        rows = {}
+        connection = self._connection()
+        for start in range(0, len(ids), 500):
+            chunk = ids[start:start + 500]
+            placeholders = ','.join('?' * len(chunk))
+            for row in connection.execute(
+                f'SELECT id, name, skills, created FROM candidates WHERE id IN ({placeholders})', chunk
+            ):
+                rows[row[0]] = {
+                    'id': row[0],
+                    'name': row[1],
+                    'skills': json.loads(row[2]),
+                    'created': row[3]
+                }
+        return [rows[candidate_id] for candidate_id in ids if candidate_id in rows]
+
+    def count(self) -> int:
+        """
+        Returns the number of stored candidates
+        """
+        return self._connection().execute("SELECT value FROM meta WHERE key = 'candidates'").fetchone()[0]
+
+
+# Shared store (created on first use)
+_candidate_store = None
+
+
+def get_candidate_store() -> CandidateStore:
+    global _candidate_store
+    if _candidate_store is None:
+        _candidate_store = CandidateStore()
+    return _candidate_store
+
+
+def record_candidates(candidates: List[Tuple[str, List[str], Optional[str]]]) -> List[int]:
+    """
+    Saves analyzed resumes to the candidate store when it is enabled;
+    failures are logged and never break the analysis
+
+    Args:
+        candidates: (name, skills, content_hash) tuples, name being e.g. the resume filename
+
+    Returns:
+        Candidate ids, or an empty list if nothing was stored
+    """
+    if not CANDIDATE_STORE_ENABLED or not candidates:
+        return []
+    try:
+        return get_candidate_store().add_candidates(candidates)
+    except Exception as e:
+        print(f"Error saving candidates: {str(e)}")
+        return []
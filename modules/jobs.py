@@ -0,0 +1,439 @@
+"""
+Jobs Module
+Asynchronous analysis jobs: a durable sqlite queue and local worker processes
+
+Usage:
+    python -m modules.jobs worker [--processes N]
+"""
+
+import argparse
+import fcntl
+import json
+import multiprocessing
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Dict, List, Optional
+
+from modules.metrics import maybe_flush
+from config import (
+    JOBS_DB_PATH,
+    JOB_QUEUE_MAX_DEPTH,
+    JOB_RESULT_TTL,
+    JOB_LEASE_SECONDS,
+    JOB_MAX_ATTEMPTS,
+    JOB_POLL_INTERVAL,
+    JOB_WORKERS
+)
+
+
+class QueueFullError(Exception):
+    """
+    Raised when the number of unfinished jobs has reached the queue depth limit
+    """
+
+
+class JobQueue:
+    """
+    Job queue and result store in a local sqlite file.
+
+    Workers claim jobs with a lease and renew it while the job runs. A job
+    whose lease expires (its worker crashed or was killed) goes back to the
+    queue until it has been tried JOB_MAX_ATTEMPTS times; only the latest
+    attempt can then finish it. Finished jobs are kept for JOB_RESULT_TTL
+    seconds.
+    """
+
+    def __init__(self, path: str = JOBS_DB_PATH, max_depth: int = JOB_QUEUE_MAX_DEPTH,
+                 result_ttl: float = JOB_RESULT_TTL, lease_seconds: float = JOB_LEASE_SECONDS,
+                 max_attempts: int = JOB_MAX_ATTEMPTS):
+        self.path = path
+        self.max_depth = max_depth
+        self.result_ttl = result_ttl
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self._local = threading.local()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        connection = self._connection()
+        connection.execute(
+            'CREATE TABLE IF NOT EXISTS jobs ('
+            'id TEXT PRIMARY KEY, status TEXT NOT NULL, resume BLOB, content_hash TEXT, '
+            'job_description TEXT NOT NULL, result TEXT, error TEXT, '
+            'attempts INTEGER NOT NULL DEFAULT 0, lease_until REAL, '
+            'created REAL NOT NULL, updated REAL NOT NULL)'
+        )
+        connection.execute('CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, created)')
+        columns = {row['name'] for row in connection.execute('PRAGMA table_info(jobs)')}
+        if 'filename' not in columns:
+            # Databases created before jobs recorded their resume in the candidate store
+            connection.execute('ALTER TABLE jobs ADD COLUMN filename TEXT')
+
+    def _connection(self) -> sqlite3.Connection:
+        # One connection per thread and per process (connections must not cross a fork)
+        connection = getattr(self._local, 'connection', None)
+        if connection is None or self._local.pid != os.getpid():
+            connection = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            connection.row_factory = sqlite3.Row
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute('PRAGMA synchronous=NORMAL')
+            self._local.connection = connection
+            self._local.pid = os.getpid()
+        return connection
+
+    def submit(self, resume: bytes, content_hash: Optional[str], job_description: str,
+               filename: Optional[str] = None) -> str:
+        """
+        Queues an analysis job
+
+        Args:
+            resume: PDF bytes
+            content_hash: SHA-256 of the PDF bytes, if known
+            job_description: Job description text
+            filename: Name of the uploaded resume, saved with the candidate
+
+        Returns:
+            Job id
+
+        Raises:
+            QueueFullError: If max_depth jobs are already queued or running
+        """
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        connection = self._connection()
+        connection.execute('BEGIN IMMEDIATE')
+        try:
+            unfinished = connection.execute(
+                "SELECT COUNT(*) FROM jobs WHERE status IN ('queued', 'running')"
+            ).fetchone()[0]
+            if unfinished >= self.max_depth:
+                raise QueueFullError(f'Job queue is full ({self.max_depth} jobs)')
+
+            connection.execute(
+                'INSERT INTO jobs (id, status, resume, content_hash, job_description, filename, created, updated) '
+                "VALUES (?, 'queued', ?, ?, ?, ?, ?, ?)",
+                (job_id, sqlite3.Binary(resume), content_hash, job_description, filename, now, now)
+            )
+            connection.execute('COMMIT')
+        except Exception:
+            connection.execute('ROLLBACK')
+            raise
+        return job_id
+
+    def claim(self) -> Optional[Dict]:
+        """
+        Leases the oldest queued job, first requeueing jobs whose lease expired
+
+        Returns:
+            Job row as a dictionary, attempts being the claimed attempt (pass
+            it to renew, complete and fail), or None if the queue is empty
+        """
+        now = time.time()
+        connection = self._connection()
+        connection.execute('BEGIN IMMEDIATE')
+        try:
+            # Jobs of crashed workers: retry, or give up after max_attempts
+            connection.execute(
+                "UPDATE jobs SET status = 'failed', error = 'Worker crashed while processing the job', "
+                "resume = NULL, updated = ? "
+                "WHERE status = 'running' AND lease_until < ? AND attempts >= ?",
+                (now, now, self.max_attempts)
+            )
+            connection.execute(
+                "UPDATE jobs SET status = 'queued', updated = ? "
+                "WHERE status = 'running' AND lease_until < ?",
+                (now, now)
+            )
+
+            job = connection.execute(
+                "SELECT * FROM jobs WHERE status = 'queued' ORDER BY created LIMIT 1"
+            ).fetchone()
+            if job is not None:
+                connection.execute(
+                    "UPDATE jobs SET status = 'running', attempts = attempts + 1, "
+                    'lease_until = ?, updated = ? WHERE id = ?',
+                    (now + self.lease_seconds, now, job['id'])
+                )
+                job = {**dict(job), 'attempts': job['attempts'] + 1}
+            connection.execute('COMMIT')
+        except Exception:
+            connection.execute('ROLLBACK')
+            raise
+        return job
+
+    def renew(self, job_id: str, attempt: int) -> bool:
+        """
+        Extends the lease of a running job
+
+        Args:
+            job_id: Job id
+            attempt: Attempt returned by claim
+
+        Returns:
+            False if the job is no longer this attempt's (its lease expired
+            and it was requeued, or it finished)
+        """
+        cursor = self._connection().execute(
+            "UPDATE jobs SET lease_until = ? WHERE id = ? AND status = 'running' AND attempts = ?",
+            (time.time() + self.lease_seconds, job_id, attempt)
+        )
+        return cursor.rowcount == 1
+
+    def complete(self, job_id: str, attempt: int, result: Dict) -> bool:
+        """
+        Stores the result of a finished job and drops its PDF
+
+        Only the attempt that holds the job can finish it: a run whose lease
+        expired (the job was requeued meanwhile) changes nothing.
+
+        Returns:
+            Whether the result was stored
+        """
+        cursor = self._connection().execute(
+            "UPDATE jobs SET status = 'done', result = ?, resume = NULL, lease_until = NULL, "
+            "updated = ? WHERE id = ? AND status = 'running' AND attempts = ?",
+            (json.dumps(result), time.time(), job_id, attempt)
+        )
+        return cursor.rowcount == 1
+
+    def fail(self, job_id: str, attempt: int, error: str) -> bool:
+        """
+        Marks a job as failed and drops its PDF (see complete)
+
+        Returns:
+            Whether the error was stored
+        """
+        cursor = self._connection().execute(
+            "UPDATE jobs SET status = 'failed', error = ?, resume = NULL, lease_until = NULL, "
+            "updated = ? WHERE id = ? AND status = 'running' AND attempts = ?",
+            (error, time.time(), job_id, attempt)
+        )
+        return cursor.rowcount == 1
+
+    def get(self, job_id: str) -> Optional[Dict]:
+        """
+        Returns the status of a job, with its result or error once finished
+
+        Args:
+            job_id: Job id
+
+        Returns:
+            Dictionary with job_id, status, attempts, created, updated and
+            result or error; None if the job doesn't exist or has expired
+        """
+        job = self._connection().execute(
+            'SELECT id, status, result, error, attempts, created, updated FROM jobs WHERE id = ?',
+            (job_id,)
+        ).fetchone()
+        if job is None:
+            return None
+
+        status = {
+            'job_id': job['id'],
+            'status': job['status'],
+            'attempts': job['attempts'],
+            'created': job['created'],
+            'updated': job['updated']
+        }
+        if job['status'] == 'done':
+            status['result'] = json.loads(job['result'])
+        elif job['status'] == 'failed':
+            status['error'] = job['error']
+        return status
+
+    def purge_expired(self) -> int:
+        """
+        Deletes finished jobs older than result_ttl
+
+        Returns:
+            Number of deleted jobs
+        """
+        cursor = self._connection().execute(
+            "DELETE FROM jobs WHERE status IN ('done', 'failed') AND updated < ?",
+            (time.time() - self.result_ttl,)
+        )
+        return cursor.rowcount
+
+    def depth(self) -> int:
+        """
+        Returns the number of queued and running jobs
+        """
+        return self._connection().execute(
+            "SELECT COUNT(*) FROM jobs WHERE status IN ('queued', 'running')"
+        ).fetchone()[0]
+
+
+def process_job(resume: bytes, content_hash: Optional[str], job_description: str,
+                filename: Optional[str] = None) -> Dict:
+    """
+    Runs the same analysis as the synchronous /analyze route, and saves the
+    resume to the candidate store like it does
+
+    Args:
+        resume: PDF bytes
+        content_hash: SHA-256 of the PDF bytes, if known
+        job_description: Job description text
+        filename: Name of the uploaded resume
+
+    Returns:
+        Analysis results
+
+    Raises:
+        ValueError: If no text can be extracted from the PDF
+    """
+    from modules.resume_parser import get_resume_text
+    from modules.matcher import get_match_analysis
+    from modules.resume_matrix import record_resumes
+
+    resume_text = get_resume_text(resume, content_hash)
+    if not resume_text:
+        raise ValueError('Could not extract text from PDF. Please ensure the PDF contains readable text.')
+
+    analysis = get_match_analysis(resume_text, job_description)
+    record_resumes([(filename, analysis['resume_skills'], content_hash)], [resume_text])
+    return {
+        'match_percentage': analysis['match_percentage'],
+        'matched_skills': analysis['matched_skills'],
+        'missing_skills': analysis['missing_skills'],
+        'resume_skills': analysis['resume_skills'],
+        'jd_skills': analysis['jd_skills'],
+        'fuzzy_skills': analysis['fuzzy_skills'],
+        'taxonomy_version': analysis['taxonomy_version']
+    }
+
+
+def _renew_lease(queue: JobQueue, job_id: str, attempt: int, done: threading.Event):
+    # Three renewals per lease, so one late renewal doesn't lose the job
+    while not done.wait(queue.lease_seconds / 3):
+        if not queue.renew(job_id, attempt):
+            return
+
+
+def run_worker(path: str = JOBS_DB_PATH, poll_interval: float = JOB_POLL_INTERVAL):
+    """
+    Worker process loop: claims jobs and runs them until killed
+
+    Args:
+        path: Jobs database file
+        poll_interval: Seconds to sleep when the queue is empty
+    """
+    queue = JobQueue(path)
+    last_purge = 0.0
+
+    while True:
+        if time.time() - last_purge > 60:
+            queue.purge_expired()
+            last_purge = time.time()
+
+        job = queue.claim()
+        if job is None:
+            time.sleep(poll_interval)
+            continue
+
+        # Renews the lease while the job runs, however long it takes
+        done = threading.Event()
+        heartbeat = threading.Thread(target=_renew_lease, args=(queue, job['id'], job['attempts'], done),
+                                     daemon=True)
+        heartbeat.start()
+        try:
+            result = process_job(job['resume'], job['content_hash'], job['job_description'], job['filename'])
+        except Exception as e:
+            queue.fail(job['id'], job['attempts'], f'Error processing resume: {str(e)}')
+        else:
+            queue.complete(job['id'], job['attempts'], result)
+        finally:
+            done.set()
+            heartbeat.join()
+
+        # Stage timings of jobs show up in /metrics next to the web workers'
+        maybe_flush()
+
+
+# Local worker processes started by the web app (see ensure_workers)
+_workers: List[multiprocessing.Process] = []
+_workers_lock = threading.Lock()
+# Open lock file while this process owns the pool, None otherwise
+_pool_lock_file = None
+
+
+def _own_pool(path: str) -> bool:
+    """
+    Whether this process runs the local worker pool for a jobs database
+
+    Every web server worker calls ensure_workers; an exclusive lock on a file
+    next to the database elects one of them, so the server runs `count`
+    workers in total rather than `count` per web worker. The lock is released
+    when its owner exits, and the next web worker to call ensure_workers
+    takes over the pool.
+    """
+    global _pool_lock_file
+    if _pool_lock_file is not None:
+        return True
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    lock_file = open(f'{path}.workers.lock', 'a')
+    try:
+        fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except BlockingIOError:
+        lock_file.close()
+        return False
+    _pool_lock_file = lock_file
+    return True
+
+
+def ensure_workers(count: int = JOB_WORKERS, path: str = JOBS_DB_PATH) -> int:
+    """
+    Starts local worker processes, replacing any that have died
+
+    Only one process per jobs database runs the pool (see _own_pool); in the
+    others this does nothing.
+
+    Args:
+        count: Number of worker processes to keep alive
+        path: Jobs database file
+
+    Returns:
+        Number of live workers started by this process
+    """
+    with _workers_lock:
+        if not _own_pool(path):
+            return 0
+        _workers[:] = [worker for worker in _workers if worker.is_alive()]
+        # spawn keeps workers independent of the web server's threads and state
+        context = multiprocessing.get_context('spawn')
+        while len(_workers) < count:
+            worker = context.Process(target=run_worker, args=(path,), daemon=True)
+            worker.start()
+            _workers.append(worker)
+        return len(_workers)
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description='Run analysis job workers')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    worker_parser = subparsers.add_parser('worker', help='Process queued jobs')
+    worker_parser.add_argument('--processes', type=int, default=max(JOB_WORKERS, 1))
+    worker_parser.add_argument('--db', default=JOBS_DB_PATH)
+    args = parser.parse_args(argv)
+
+    if args.processes == 1:
+        run_worker(args.db)
+        return
+
+    context = multiprocessing.get_context('spawn')
+    workers = [context.Process(target=run_worker, args=(args.db,)) for _ in range(args.processes)]
+    for worker in workers:
+        worker.start()
+    print(f"Started {len(workers)} job workers on {args.db}")
+    for worker in workers:
+        worker.join()
+
+
+if __name__ == '__main__':
+    main()
@@ -1,12 +1,323 @@
 """
 Matcher Module
-Uses TF-IDF and cosine similarity to match resume against job description
+Uses TF-IDF (or hashed n-gram) vectors and cosine similarity to match
+resume against job description
 """
 
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
-from typing import Dict, List, Tuple
-from modules.skill_extractor import extract_skills
+import hashlib
+from typing import TYPE_CHECKING, Dict, List, Optional
+from modules.cache import create_cache
+from modules.metrics import timed
+from modules.skill_db import Taxonomy, get_taxonomy
+from modules.skill_extractor import extract_skills, extract_skills_many, fuzzy_only_skills
+from modules.skill_bitset import job_gaps, skill_gaps, skill_matrix, skill_row
+from modules.tfidf_model import VECTORIZER_PARAMS, get_tfidf_model
+from config import (
+    JD_CACHE_BACKEND,
+    JD_CACHE_PATH,
+    JD_CACHE_MAX_ENTRIES,
+    JD_CACHE_MAX_BYTES,
+    JD_CACHE_TTL,
+    SIMILARITY_ENGINE,
+    HASHING_N_FEATURES,
+    SKILL_EXTRACTION_MODE,
+    SKILL_PHRASE_REVERSE_MATCH,
+    SKILL_FUZZY_MATCH,
+    SKILL_FUZZY_MATCH_JD,
+    SKILL_FUZZY_MIN_LENGTHS
+)
+
+if TYPE_CHECKING:
+    from sklearn.feature_extraction.text import HashingVectorizer, TfidfVectorizer
+
+
+SIMILARITY_ENGINES = ('tfidf', 'hashing')
+HASHING_ENGINE = 'hashing'
+
+# Stateless vectorizer of the hashing engine (created on first use)
+_hashing_vectorizer = None
+
+
+# Job description analyses, keyed by a hash of the normalized text
+_jd_cache = create_cache(
+    JD_CACHE_BACKEND,
+    JD_CACHE_PATH,
+    JD_CACHE_MAX_ENTRIES,
+    JD_CACHE_MAX_BYTES,
+    JD_CACHE_TTL
+)
+
+
+def _empty_analysis(taxonomy: Optional[Taxonomy] = None) -> Dict:
+    """
+    Returns the analysis of an empty resume or job description
+    """
+    return {
+        'match_percentage': 0.0,
+        'matched_skills': [],
+        'missing_skills': [],
+        'resume_skills': [],
+        'jd_skills': [],
+        'fuzzy_skills': {},
+        'taxonomy_version': (taxonomy or get_taxonomy()).version
+    }
+
+
+def _fuzzy_skills(resume_text: str, resume_skills: List[str], taxonomy: Taxonomy) -> Dict[str, float]:
+    """
+    Skills a resume mentions only approximately, with their confidence
+
+    They are reported next to the exact matches but never added to them, so
+    the scored and stored skill lists only hold skills the resume names.
+    """
+    if not SKILL_FUZZY_MATCH:
+        return {}
+    return fuzzy_only_skills(resume_text, resume_skills, taxonomy)
+
+
+def _new_vectorizer() -> 'TfidfVectorizer':
+    """
+    Creates the TF-IDF vectorizer used for per-request similarity scoring
+    """
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    
+    # Use ngram_range to capture phrases and technical terms
+    return TfidfVectorizer(max_features=5000, **VECTORIZER_PARAMS)
+
+
+def _get_hashing_vectorizer() -> 'HashingVectorizer':
+    """
+    Returns the vectorizer of the hashing engine: term counts of the same
+    n-grams as the TF-IDF vectorizer, hashed into HASHING_N_FEATURES columns
+    """
+    global _hashing_vectorizer
+    if _hashing_vectorizer is None:
+        from sklearn.feature_extraction.text import HashingVectorizer
+        _hashing_vectorizer = HashingVectorizer(
+            n_features=HASHING_N_FEATURES,
+            alternate_sign=False,
+            norm=None,
+            **VECTORIZER_PARAMS
+        )
+    return _hashing_vectorizer
+
+
+def hashed_vectors(texts: List[str]):
+    """
+    Vectorizes texts with the hashing engine
+    
+    Term counts are damped to 1 + log(count) (without IDF, this keeps
+    frequent filler words from drowning out the skills) and L2-normalized.
+    Each row depends only on its own text (there is no vocabulary to fit),
+    so rows can be computed separately, cached and stacked in any order.
+    
+    Args:
+        texts: Texts to vectorize
+        
+    Returns:
+        Sparse CSR matrix of L2-normalized rows, one per text
+    """
+    import numpy as np
+    from sklearn.preprocessing import normalize
+    
+    counts = _get_hashing_vectorizer().transform(texts)
+    np.log1p(counts.data, out=counts.data)
+    return normalize(counts, norm='l2', copy=False)
+
+
+def _dot_with_row(matrix, row):
+    """
+    matrix @ row.T for a CSR matrix and one sparse row with sorted indices
+    
+    scipy would convert the transposed row to CSR, allocating an index
+    pointer per column (2**20 with the hashing engine) on every call; this
+    matches column indices with a binary search instead.
+    
+    Returns:
+        Dense array with one value per matrix row
+    """
+    import numpy as np
+    
+    scores = np.zeros(matrix.shape[0])
+    if not row.nnz or not matrix.nnz:
+        return scores
+    positions = np.searchsorted(row.indices, matrix.indices)
+    np.minimum(positions, row.nnz - 1, out=positions)
+    products = np.where(row.indices[positions] == matrix.indices, matrix.data * row.data[positions], 0.0)
+    row_ids = np.repeat(np.arange(matrix.shape[0]), np.diff(matrix.indptr))
+    return np.bincount(row_ids, weights=products, minlength=matrix.shape[0])
+
+
+def _check_engine(engine: Optional[str]) -> str:
+    engine = engine or SIMILARITY_ENGINE
+    if engine not in SIMILARITY_ENGINES:
+        raise ValueError(
+            f"Unknown similarity engine '{engine}'. Expected one of: {', '.join(SIMILARITY_ENGINES)}"
+        )
+    return engine
+
+
+def normalize_job_description(job_description: str) -> str:
+    """
+    Normalizes a job description so trivially different copies share a cache entry
+    
+    Args:
+        job_description: Job description text
+        
+    Returns:
+        Lowercased text with whitespace collapsed
+    """
+    return ' '.join(job_description.lower().split())
+
+
+def analyze_job_description(job_description: str, taxonomy: Optional[Taxonomy] = None,
+                            engine: Optional[str] = None) -> Dict:
+    """
+    Extracts the skills and vector of a job description, using the cache
+    
+    The vector is computed by the hashing engine, or by the TF-IDF engine
+    when a corpus-fitted model is loaded; with per-request fitting it depends
+    on the resume and cannot be reused.
+    
+    Args:
+        job_description: Job description text
+        taxonomy: Skill taxonomy (defaults to the current version)
+        engine: 'tfidf' or 'hashing' (defaults to SIMILARITY_ENGINE)
+        
+    Returns:
+        Dictionary with 'skills' (list) and 'vector' (sparse row or None)
+    """
+    normalized = normalize_job_description(job_description)
+    engine = _check_engine(engine)
+    model = get_tfidf_model() if engine != HASHING_ENGINE else None
+    taxonomy = taxonomy or get_taxonomy()
+    
+    # The model and taxonomy fingerprints keep entries from a refitted model,
+    # another engine, an older taxonomy or other skill extraction settings
+    # apart (the sqlite cache outlives a restart with a new configuration)
+    if engine == HASHING_ENGINE:
+        model_key = f'hashing-{HASHING_N_FEATURES}'
+    else:
+        model_key = model.fingerprint if model is not None else 'per-request'
+    skills_key = f"{taxonomy.fingerprint[:16]}-{SKILL_EXTRACTION_MODE}-reverse{int(SKILL_PHRASE_REVERSE_MATCH)}"
+    if SKILL_FUZZY_MATCH_JD:
+        skills_key += '-fuzzy' + '-'.join(map(str, SKILL_FUZZY_MIN_LENGTHS))
+    key = f"{model_key}:{skills_key}:{hashlib.sha256(normalized.encode('utf-8')).hexdigest()}"
+    
+    analysis = _jd_cache.get(key)
+    if analysis is None:
+        if engine == HASHING_ENGINE:
+            vector = hashed_vectors([normalized])
+        else:
+            vector = model.transform([normalized]) if model is not None else None
+        analysis = {
+            'skills': extract_skills(normalized, taxonomy=taxonomy, fuzzy=SKILL_FUZZY_MATCH_JD),
+            'vector': vector
+        }
+        _jd_cache.set(key, analysis)
+    
+    return analysis
+
+
+def get_jd_cache_stats() -> Dict:
+    """
+    Returns hit/miss/eviction counters of the job description cache
+    """
+    return _jd_cache.stats()
+
+
+def _similarity_scores(resume_texts: List[str], job_description: str, jd_analysis: Dict,
+                       engine: Optional[str] = None):
+    """
+    Cosine similarity of each resume to the job description, in one call
+    
+    The hashing engine compares hashed resume vectors with the cached job
+    description vector. The TF-IDF engine does the same with a corpus-fitted
+    model when one is loaded, otherwise it fits a vectorizer on the resumes
+    plus the job description.
+    
+    Args:
+        resume_texts: Extracted resume texts
+        job_description: Job description text
+        jd_analysis: Result of analyze_job_description (with the same engine)
+        engine: 'tfidf' or 'hashing' (defaults to SIMILARITY_ENGINE)
+        
+    Returns:
+        Array of similarity scores aligned with resume_texts
+    """
+    from sklearn.metrics.pairwise import cosine_similarity
+    
+    engine = _check_engine(engine)
+    with timed('vectorizer'):
+        if engine == HASHING_ENGINE:
+            # Rows are L2-normalized, so the dot product is the cosine
+            return _dot_with_row(hashed_vectors(resume_texts), jd_analysis['vector'])
+        
+        model = get_tfidf_model()
+        if model is not None and jd_analysis['vector'] is not None:
+            return cosine_similarity(model.transform(resume_texts), jd_analysis['vector']).ravel()
+        
+        tfidf_matrix = _new_vectorizer().fit_transform(resume_texts + [job_description])
+        return cosine_similarity(tfidf_matrix[:-1], tfidf_matrix[-1]).ravel()
+
+
+def _similarity_to_many(resume_text: str, job_descriptions: List[str], jd_analyses: List[Dict],
+                        engine: Optional[str] = None):
+    """
+    Cosine similarity of one resume to each job description, in one call
+    
+    The resume is vectorized once. With the hashing engine, or the TF-IDF
+    engine with a corpus-fitted model, the job description vectors come from
+    their cached analyses, so each extra job description only adds one row
+    to the product. Otherwise one vectorizer is fitted on the resume plus
+    all job descriptions.
+    
+    Args:
+        resume_text: Extracted resume text
+        job_descriptions: Job description texts
+        jd_analyses: Results of analyze_job_description (with the same engine),
+            aligned with job_descriptions
+        engine: 'tfidf' or 'hashing' (defaults to SIMILARITY_ENGINE)
+        
+    Returns:
+        Array of similarity scores aligned with job_descriptions
+    """
+    from scipy.sparse import vstack
+    from sklearn.metrics.pairwise import cosine_similarity
+    
+    engine = _check_engine(engine)
+    with timed('vectorizer'):
+        if engine == HASHING_ENGINE:
+            # Rows are L2-normalized, so the dot product is the cosine
+            jd_vectors = vstack([analysis['vector'] for analysis in jd_analyses], format='csr')
+            return _dot_with_row(jd_vectors, hashed_vectors([resume_text]))
+        
+        model = get_tfidf_model()
+        if model is not None and all(analysis['vector'] is not None for analysis in jd_analyses):
+            jd_vectors = vstack([analysis['vector'] for analysis in jd_analyses], format='csr')
+            return cosine_similarity(jd_vectors, model.transform([resume_text])).ravel()
+        
+        tfidf_matrix = _new_vectorizer().fit_transform([resume_text] + job_descriptions)
+        return cosine_similarity(tfidf_matrix[1:], tfidf_matrix[0]).ravel()
+
+
+def _skill_gaps(resume_skills_list: List[List[str]], jd_skills: List[str], taxonomy: Taxonomy) -> List[Dict]:
+    """
+    Finds matched and missing skills of many resumes at once, as bitwise
+    operations over a boolean skill matrix
+    
+    Args:
+        resume_skills_list: Skills found in each resume
+        jd_skills: Skills found in the job description
+        taxonomy: Taxonomy the skills were extracted with
+        
+    Returns:
+        List of dictionaries with matched_skills, missing_skills, resume_skills
+        and jd_skills, aligned with resume_skills_list
+    """
+    return skill_gaps(
+        skill_matrix(resume_skills_list, taxonomy), skill_row(jd_skills, taxonomy), taxonomy
+    )
 
 
 def calculate_match_score(resume_text: str, job_description: str) -> Dict:
@@ -24,61 +335,37 @@ def calculate_match_score(resume_text: str, job_description: str) -> Dict:
         - missing_skills: Skills in JD but not in resume
         - resume_skills: All skills found in resume
         - jd_skills: All skills found in job description
+        - fuzzy_skills: Resume skills found only approximately, with their
+          confidence (not part of resume_skills or matched_skills)
+        - taxonomy_version: Version of the skill taxonomy used
     """
+    # One taxonomy version for the whole analysis, even if it is reloaded meanwhile
+    taxonomy = get_taxonomy()
     if not resume_text or not job_description:
-        return {
-            'match_percentage': 0.0,
-            'matched_skills': [],
-            'missing_skills': [],
-            'resume_skills': [],
-            'jd_skills': []
-        }
-    
-    # Extract skills from both documents
-    resume_skills = extract_skills(resume_text)
-    jd_skills = extract_skills(job_description.lower())
+        return _empty_analysis(taxonomy)
     
-    # Calculate TF-IDF similarity
-    documents = [resume_text, job_description]
-    
-    # Create TF-IDF vectorizer
-    # Use ngram_range to capture phrases and technical terms
-    vectorizer = TfidfVectorizer(
-        ngram_range=(1, 3),  # Unigrams, bigrams, and trigrams
-        max_features=5000,
-        stop_words='english',
-        lowercase=True,
-        strip_accents='unicode'
-    )
+    # Extract skills from both documents (job description from the cache)
+    jd_analysis = analyze_job_description(job_description, taxonomy)
+    resume_skills = extract_skills(resume_text, taxonomy=taxonomy)
+    fuzzy_skills = _fuzzy_skills(resume_text, resume_skills, taxonomy)
+    jd_skills = jd_analysis['skills']
     
     try:
-        # Fit and transform documents
-        tfidf_matrix = vectorizer.fit_transform(documents)
-        
-        # Calculate cosine similarity
-        similarity_matrix = cosine_similarity(tfidf_matrix[0:1], tfidf_matrix[1:2])
-        similarity_score = similarity_matrix[0][0]
+        # Calculate TF-IDF cosine similarity
+        similarity_score = _similarity_scores([resume_text], job_description, jd_analysis)[0]
         
         # Convert to percentage (0-100)
-        match_percentage = round(similarity_score * 100, 2)
+        match_percentage = round(float(similarity_score) * 100, 2)
         
     except Exception as e:
         print(f"Error calculating similarity: {str(e)}")
         match_percentage = 0.0
     
-    # Find matched and missing skills
-    resume_skills_set = set(resume_skills)
-    jd_skills_set = set(jd_skills)
-    
-    matched_skills = sorted(list(resume_skills_set.intersection(jd_skills_set)))
-    missing_skills = sorted(list(jd_skills_set - resume_skills_set))
-    
     return {
         'match_percentage': match_percentage,
-        'matched_skills': matched_skills,
-        'missing_skills': missing_skills,
-        'resume_skills': sorted(resume_skills),
-        'jd_skills': sorted(jd_skills)
+        **_skill_gaps([resume_skills], jd_skills, taxonomy)[0],
+        'fuzzy_skills': fuzzy_skills,
+        'taxonomy_version': taxonomy.version
     }
 
 
@@ -95,3 +382,108 @@ def get_match_analysis(resume_text: str, job_description: str) -> Dict:
     """
     return calculate_match_score(resume_text, job_description)
 
+
+def get_match_analysis_batch(resume_texts: List[str], job_description: str) -> List[Dict]:
+    """
+    Match analysis of many resumes against one job description
+    
+    The job description skills are extracted once, all resumes are vectorized
+    into a single sparse TF-IDF matrix (with the corpus model, or fitted on the
+    resumes plus the job description) and every cosine similarity is computed
+    in one call.
+    
+    Args:
+        resume_texts: Extracted resume texts
+        job_description: Job description text
+        
+    Returns:
+        List of analysis dictionaries ranked by match_percentage (highest
+        first), each with an 'index' key pointing into resume_texts
+    """
+    taxonomy = get_taxonomy()
+    results = [{'index': i, **_empty_analysis(taxonomy)} for i in range(len(resume_texts))]
+    
+    indices = [i for i, text in enumerate(resume_texts) if text]
+    if not job_description or not indices:
+        return results
+    
+    # Job description skills are extracted once for the whole batch
+    jd_analysis = analyze_job_description(job_description, taxonomy)
+    jd_skills = jd_analysis['skills']
+    
+    texts = [resume_texts[i] for i in indices]
+    resume_skills_list, fuzzy_skills_list = [], []
+    for text, skills in zip(texts, extract_skills_many(texts, taxonomy=taxonomy)):
+        resume_skills_list.append(skills)
+        fuzzy_skills_list.append(_fuzzy_skills(text, skills, taxonomy))
+    
+    try:
+        # One vectorization and one similarity call for the whole batch
+        similarities = _similarity_scores(texts, job_description, jd_analysis)
+    except Exception as e:
+        print(f"Error calculating similarity: {str(e)}")
+        similarities = [0.0] * len(texts)
+    
+    # Skill gaps of the whole batch in one pass over the skill matrix
+    gaps = _skill_gaps(resume_skills_list, jd_skills, taxonomy)
+    
+    for i, gap, fuzzy_skills, similarity_score in zip(indices, gaps, fuzzy_skills_list, similarities):
+        results[i].update({
+            'match_percentage': round(float(similarity_score) * 100, 2),
+            **gap,
+            'fuzzy_skills': fuzzy_skills
+        })
+    
+    return sorted(results, key=lambda result: result['match_percentage'], reverse=True)
+
+
+def get_match_analysis_multi(resume_text: str, job_descriptions: List[str]) -> List[Dict]:
+    """
+    Match analysis of one resume against many job descriptions
+    
+    The resume's skills are extracted and its vector computed once. Each job
+    description's skills and vector come from the job description cache, and
+    every similarity is computed in one call (see _similarity_to_many), so
+    scoring against many open roles costs little more than against one.
+    
+    Args:
+        resume_text: Extracted resume text
+        job_descriptions: Job description texts
+        
+    Returns:
+        List of analysis dictionaries ranked by match_percentage (highest
+        first), each with an 'index' key pointing into job_descriptions
+    """
+    taxonomy = get_taxonomy()
+    results = [{'index': i, **_empty_analysis(taxonomy)} for i in range(len(job_descriptions))]
+    
+    indices = [i for i, text in enumerate(job_descriptions) if text]
+    if not resume_text or not indices:
+        return results
+    
+    texts = [job_descriptions[i] for i in indices]
+    jd_analyses = [analyze_job_description(text, taxonomy) for text in texts]
+    resume_skills = extract_skills(resume_text, taxonomy=taxonomy)
+    fuzzy_skills = _fuzzy_skills(resume_text, resume_skills, taxonomy)
+    
+    try:
+        similarities = _similarity_to_many(resume_text, texts, jd_analyses)
+    except Exception as e:
+        print(f"Error calculating similarity: {str(e)}")
+        similarities = [0.0] * len(texts)
+    
+    # Skill gaps against every job description in one pass over their skill matrix
+    gaps = job_gaps(
+        skill_row(resume_skills, taxonomy),
+        skill_matrix([analysis['skills'] for analysis in jd_analyses], taxonomy),
+        taxonomy
+    )
+    
+    for i, gap, similarity_score in zip(indices, gaps, similarities):
+        results[i].update({
+            'match_percentage': round(float(similarity_score) * 100, 2),
+            **gap,
+            'fuzzy_skills': fuzzy_skills
+        })
+    
+    return sorted(results, key=lambda result: result['match_percentage'], reverse=True)
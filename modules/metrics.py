@@ -0,0 +1,326 @@
+"""
+Metrics Module
+Stage timers and per-request counters, exported as Prometheus histograms
+(merged across worker processes) and as a Server-Timing header
+"""
+
+import atexit
+import contextvars
+import glob
+import json
+import os
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Dict, Optional, Tuple
+
+from config import METRICS_ENABLED, METRICS_DIR, METRICS_FLUSH_INTERVAL
+
+
+SECONDS_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+PAGE_BUCKETS = (1, 2, 3, 5, 10, 20, 50, 100)
+CHAR_BUCKETS = (500, 1000, 2500, 5000, 10000, 25000, 50000, 100000, 200000)
+SKILL_BUCKETS = (0, 1, 2, 5, 10, 20, 30, 50, 100)
+
+# name -> (type, help, buckets)
+METRICS = {
+    'resume_analyzer_stage_seconds': (
+        'histogram', 'Time spent in each analysis stage (pdf includes clean)', SECONDS_BUCKETS),
+    'resume_analyzer_request_seconds': (
+        'histogram', 'Request latency by endpoint', SECONDS_BUCKETS),
+    'resume_analyzer_requests_total': (
+        'counter', 'Requests by endpoint and status code', None),
+    'resume_analyzer_pdf_pages': (
+        'histogram', 'Pages read per PDF', PAGE_BUCKETS),
+    'resume_analyzer_text_chars': (
+        'histogram', 'Characters of cleaned text per PDF', CHAR_BUCKETS),
+    'resume_analyzer_skills': (
+        'histogram', 'Skills extracted per resume', SKILL_BUCKETS),
+    'resume_analyzer_admission_total': (
+        'counter', 'Admission decisions for analyses by lane (small, large) and outcome', None),
+    'resume_analyzer_admission_wait_seconds': (
+        'histogram', 'Time admitted analyses waited for a slot', SECONDS_BUCKETS),
+    'resume_analyzer_pdf_rejected_total': (
+        'counter', 'PDFs rejected by pre-parse inspection by reason', None),
+}
+
+# (name, labels) -> counter value, or [per-bucket counts..., sum, count] for histograms
+_values: Dict[Tuple[str, Tuple], object] = {}
+_lock = threading.Lock()
+_last_flush = 0.0
+# Whether _values changed since the last flush
+_dirty = False
+# Names this process's metrics file: the pid alone could be reused by a
+# later worker (or a process of an earlier deploy)
+_process_token = uuid.uuid4().hex[:12]
+# Pid of the process whose flusher thread is running
+_flusher_pid = None
+
+# Stage durations of the current request, for the Server-Timing header
+_request_timings: contextvars.ContextVar = contextvars.ContextVar('request_timings', default=None)
+
+
+def _key(name: str, labels: Dict[str, str]) -> Tuple[str, Tuple]:
+    return name, tuple(sorted(labels.items()))
+
+
+def observe(name: str, value: float, **labels):
+    """
+    Records a value in a histogram
+
+    Args:
+        name: Histogram name (key of METRICS)
+        value: Observed value
+        labels: Label values
+    """
+    if not METRICS_ENABLED:
+        return
+    global _dirty
+    buckets = METRICS[name][2]
+    key = _key(name, labels)
+    with _lock:
+        _dirty = True
+        entry = _values.get(key)
+        if entry is None:
+            entry = _values[key] = [0] * (len(buckets) + 2)
+        for i, bound in enumerate(buckets):
+            if value <= bound:
+                entry[i] += 1
+                break
+        entry[-2] += value
+        entry[-1] += 1
+
+
+def inc(name: str, amount: float = 1, **labels):
+    """
+    Increments a counter
+    """
+    global _dirty
+    if not METRICS_ENABLED:
+        return
+    key = _key(name, labels)
+    with _lock:
+        _dirty = True
+        _values[key] = _values.get(key, 0) + amount
+
+
+@contextmanager
+def timed(stage: str):
+    """
+    Times a block into resume_analyzer_stage_seconds{stage=...} and the
+    current request's Server-Timing entry for the stage
+    """
+    if not METRICS_ENABLED:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        observe('resume_analyzer_stage_seconds', elapsed, stage=stage)
+        timings = _request_timings.get()
+        if timings is not None:
+            timings[stage] = timings.get(stage, 0.0) + elapsed
+
+
+def start_request():
+    """
+    Starts collecting stage timings for the current request
+    """
+    _request_timings.set({})
+    _ensure_flusher()
+
+
+def request_timings() -> Dict[str, float]:
+    """
+    Returns the stage timings collected so far for the current request
+    """
+    return dict(_request_timings.get() or {})
+
+
+def finish_request(endpoint: str, status: int, elapsed: float) -> Dict[str, float]:
+    """
+    Records a finished request and returns its stage timings
+
+    Args:
+        endpoint: Route name
+        status: HTTP status code
+        elapsed: Request duration in seconds
+
+    Returns:
+        Stage -> seconds spent during this request
+    """
+    timings = _request_timings.get() or {}
+    _request_timings.set(None)
+    observe('resume_analyzer_request_seconds', elapsed, endpoint=endpoint)
+    inc('resume_analyzer_requests_total', endpoint=endpoint, status=str(status))
+    maybe_flush()
+    return timings
+
+
+def server_timing_header(timings: Dict[str, float], total: Optional[float] = None) -> str:
+    """
+    Formats stage timings as a Server-Timing header value (milliseconds)
+    """
+    entries = [f'{stage};dur={seconds * 1000:.1f}' for stage, seconds in timings.items()]
+    if total is not None:
+        entries.append(f'total;dur={total * 1000:.1f}')
+    return ', '.join(entries)
+
+
+def reset():
+    """
+    Drops everything recorded so far in this process
+    """
+    with _lock:
+        _values.clear()
+
+
+def _metrics_file() -> str:
+    return os.path.join(METRICS_DIR, f'metrics-{os.getpid()}-{_process_token}.json')
+
+
+def flush():
+    """
+    Writes this process's metrics to its file in METRICS_DIR
+    """
+    global _last_flush, _dirty
+    with _lock:
+        data = [[name, list(labels), value] for (name, labels), value in _values.items()]
+        _last_flush = time.time()
+        _dirty = False
+    try:
+        os.makedirs(METRICS_DIR, exist_ok=True)
+        path = _metrics_file()
+        temp_path = f'{path}.tmp'
+        with open(temp_path, 'w') as f:
+            json.dump(data, f)
+        os.replace(temp_path, path)
+    except OSError as e:
+        print(f"Error writing metrics: {str(e)}")
+
+
+def maybe_flush():
+    """
+    Flushes at most once per METRICS_FLUSH_INTERVAL
+    """
+    _ensure_flusher()
+    if METRICS_ENABLED and time.time() - _last_flush >= METRICS_FLUSH_INTERVAL:
+        flush()
+
+
+def _flush_periodically():
+    while True:
+        time.sleep(METRICS_FLUSH_INTERVAL)
+        if _dirty:
+            flush()
+
+
+def _ensure_flusher():
+    # Idle workers publish their last requests too: a daemon thread flushes
+    # what changed every METRICS_FLUSH_INTERVAL. Threads don't survive a fork,
+    # so each process starts its own on its first request or job
+    global _flusher_pid
+    if not METRICS_ENABLED or _flusher_pid == os.getpid():
+        return
+    with _lock:
+        if _flusher_pid == os.getpid():
+            return
+        _flusher_pid = os.getpid()
+    threading.Thread(target=_flush_periodically, name='metrics-flush', daemon=True).start()
+
+
+def _after_fork():
+    # A forked worker starts with its own file and empty metrics: what the
+    # parent recorded is in the parent's file. The lock is replaced in case
+    # another thread of the parent held it during the fork
+    global _process_token, _dirty, _lock
+    _lock = threading.Lock()
+    _process_token = uuid.uuid4().hex[:12]
+    _values.clear()
+    _dirty = False
+
+
+def _flush_at_exit():
+    if METRICS_ENABLED and _dirty:
+        flush()
+
+
+os.register_at_fork(after_in_child=_after_fork)
+atexit.register(_flush_at_exit)
+
+
+def clear_files():
+    """
+    Deletes every metrics file in METRICS_DIR, e.g. those of a previous
+    deploy, when the server starts
+    """
+    for path in glob.glob(os.path.join(METRICS_DIR, 'metrics-*.json*')):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+def collect() -> Dict[Tuple[str, Tuple], object]:
+    """
+    Merges the metrics files of every worker process (including this one)
+
+    Files of workers that exited since the server started are kept so
+    counters never go backwards; clear_files drops them on the next start.
+    """
+    flush()
+    merged: Dict[Tuple[str, Tuple], object] = {}
+    for path in glob.glob(os.path.join(METRICS_DIR, 'metrics-*.json')):
+        try:
+            with open(path) as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            continue
+        for name, labels, value in data:
+            if name not in METRICS:
+                continue
+            key = (name, tuple(tuple(label) for label in labels))
+            if isinstance(value, list):
+                current = merged.get(key)
+                merged[key] = value if current is None else [a + b for a, b in zip(current, value)]
+            else:
+                merged[key] = merged.get(key, 0) + value
+    return merged
+
+
+def _escape_label(value) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(labels, extra: Tuple = ()) -> str:
+    pairs = list(labels) + list(extra)
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape_label(value)}"' for name, value in pairs) + '}'
+
+
+def render_prometheus() -> str:
+    """
+    Renders all metrics in the Prometheus text exposition format
+    """
+    values = collect()
+    lines = []
+    for name, (kind, help_text, buckets) in METRICS.items():
+        series = sorted((key[1], value) for key, value in values.items() if key[0] == name)
+        lines.append(f'# HELP {name} {help_text}')
+        lines.append(f'# TYPE {name} {kind}')
+        for labels, value in series:
+            if kind == 'counter':
+                lines.append(f'{name}{_format_labels(labels)} {value}')
+                continue
+            cumulative = 0
+            for bound, count in zip(buckets, value):
+                cumulative += count
+                lines.append(f'{name}_bucket{_format_labels(labels, (("le", bound),))} {cumulative}')
+            lines.append(f'{name}_bucket{_format_labels(labels, (("le", "+Inf"),))} {value[-1]}')
+            lines.append(f'{name}_sum{_format_labels(labels)} {value[-2]}')
+            lines.append(f'{name}_count{_format_labels(labels)} {value[-1]}')
+    return '\n'.join(lines) + '\n'
@@ -0,0 +1,119 @@
+"""
+Profiler Module
+Opt-in sampling profiler that saves collapsed stacks of slow requests
+(flamegraph.pl, speedscope and inferno read the format directly)
+"""
+
+import os
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from typing import Dict, Optional
+
+from config import PROFILE_SLOW_REQUESTS, PROFILE_THRESHOLD_MS, PROFILE_INTERVAL, PROFILE_DIR
+
+
+class SamplingProfiler:
+    """
+    Samples the Python stacks of registered threads from a background thread.
+
+    Only threads between start() and stop() are sampled, so the cost when no
+    request is being profiled is one idle thread.
+    """
+
+    def __init__(self, interval: float = PROFILE_INTERVAL):
+        self.interval = interval
+        self._samples: Dict[int, Counter] = {}
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._pid = None
+
+    def _ensure_thread(self):
+        # Threads don't survive a fork, so each worker process starts its own
+        if self._thread is None or self._pid != os.getpid() or not self._thread.is_alive():
+            self._pid = os.getpid()
+            self._thread = threading.Thread(target=self._run, name='sampling-profiler', daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            time.sleep(self.interval)
+            with self._lock:
+                if not self._samples:
+                    continue
+                frames = sys._current_frames()
+                for thread_id, counts in self._samples.items():
+                    frame = frames.get(thread_id)
+                    if frame is not None:
+                        counts[_collapse(frame)] += 1
+
+    def start(self):
+        """
+        Starts sampling the calling thread
+        """
+        with self._lock:
+            self._samples[threading.get_ident()] = Counter()
+        self._ensure_thread()
+
+    def stop(self) -> Counter:
+        """
+        Stops sampling the calling thread
+
+        Returns:
+            Collapsed stack -> number of samples
+        """
+        with self._lock:
+            return self._samples.pop(threading.get_ident(), Counter())
+
+
+def _collapse(frame) -> str:
+    stack = []
+    while frame is not None:
+        code = frame.f_code
+        stack.append(f'{os.path.basename(code.co_filename)}:{code.co_name}')
+        frame = frame.f_back
+    return ';'.join(reversed(stack))
+
+
+def write_profile(samples: Counter, name: str, directory: str = PROFILE_DIR) -> Optional[str]:
+    """
+    Writes samples in collapsed stack format ('frame;frame;frame count' lines)
+
+    Args:
+        samples: Collapsed stack -> number of samples
+        name: Label included in the file name (e.g. the endpoint)
+        directory: Output directory
+
+    Returns:
+        Path of the written file, or None if there were no samples
+    """
+    if not samples:
+        return None
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, f"{time.strftime('%Y%m%d-%H%M%S')}-{name}-{uuid.uuid4().hex[:8]}.folded")
+    with open(path, 'w') as f:
+        for stack, count in samples.most_common():
+            f.write(f'{stack} {count}\n')
+    return path
+
+
+# Shared profiler (None unless PROFILE_SLOW_REQUESTS is on)
+profiler = SamplingProfiler() if PROFILE_SLOW_REQUESTS else None
+
+
+def profile_if_slow(samples: Counter, elapsed_ms: float, name: str) -> Optional[str]:
+    """
+    Saves the samples of a request that took longer than PROFILE_THRESHOLD_MS
+
+    Returns:
+        Path of the written profile, or None
+    """
+    if elapsed_ms < PROFILE_THRESHOLD_MS:
+        return None
+    try:
+        return write_profile(samples, name)
+    except OSError as e:
+        print(f"Error writing profile: {str(e)}")
+        return None
@@ -0,0 +1,401 @@
+"""
+Resume Matrix Module
+Keeps the hashed vector of every stored candidate in a sparse CSR matrix on
+disk, memory-mapped for reading and appended to as resumes are analyzed, and
+ranks the stored candidates against many job descriptions at once
+"""
+
+import fcntl
+import json
+import os
+import threading
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from modules.candidate_store import get_candidate_store, record_candidates
+from modules.matcher import HASHING_ENGINE, analyze_job_description, hashed_vectors
+from modules.metrics import timed
+from modules.skill_db import get_taxonomy
+from config import (
+    CANDIDATE_STORE_ENABLED,
+    HASHING_N_FEATURES,
+    RESUME_MATRIX_DIR,
+    RANKING_SKILL_WEIGHT,
+    RANKING_CHUNK_ROWS
+)
+
+
+# One file per CSR array, each only ever appended to. indptr holds the end
+# offset of every row and is written last, so its length is the number of
+# complete rows; bytes past it in the other files belong to an interrupted
+# append and are overwritten by the next one.
+_FILES = {
+    'data': np.float32,  # values of the L2-normalized hashed vectors
+    'indices': np.int32,  # hashed feature column of each value
+    'indptr': np.int64,  # end offset of each row in data and indices
+    'ids': np.int64,  # candidate store id of each row, increasing
+}
+
+
+class ResumeMatrix:
+    """
+    Hashed resume vectors (see matcher.hashed_vectors) of stored candidates,
+    one row per candidate in the order they were added
+
+    Any number of processes can append and read: appends hold an exclusive
+    lock on the directory, and readers map the files again when they have grown.
+    Rows are kept in candidate id order, so new candidates must be stored
+    and appended under the same lock (see exclusive and record_resumes).
+    """
+
+    def __init__(self, directory: str = RESUME_MATRIX_DIR, n_features: int = HASHING_N_FEATURES):
+        self.directory = directory
+        self.n_features = n_features
+        self._lock = threading.Lock()
+        self._held = threading.local()
+        self._arrays: Optional[Dict[str, np.ndarray]] = None
+        self._rows = -1
+
+        os.makedirs(directory, exist_ok=True)
+        meta_path = os.path.join(directory, 'meta.json')
+        with self.exclusive():
+            if os.path.exists(meta_path):
+                with open(meta_path) as f:
+                    meta = json.load(f)
+                if meta['n_features'] != n_features:
+                    raise ValueError(
+                        f"{directory} holds vectors with {meta['n_features']} hashed features, "
+                        f"not {n_features}; delete it to start over"
+                    )
+            else:
+                with open(meta_path, 'w') as f:
+                    json.dump({'n_features': n_features}, f)
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.directory, f'{name}.bin')
+
+    @contextmanager
+    def exclusive(self):
+        """
+        Holds the lock appends take, across threads and processes; the
+        thread holding it can append (and take it again) inside
+        """
+        if getattr(self._held, 'depth', 0):
+            self._held.depth += 1
+            try:
+                yield
+            finally:
+                self._held.depth -= 1
+            return
+        with open(os.path.join(self.directory, 'lock'), 'a') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            self._held.depth = 1
+            try:
+                yield
+            finally:
+                self._held.depth = 0
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _committed(self) -> Tuple[int, int]:
+        # Complete rows and their number of values, from the end of indptr
+        itemsize = np.dtype(_FILES['indptr']).itemsize
+        try:
+            rows = os.path.getsize(self._path('indptr')) // itemsize
+        except FileNotFoundError:
+            return 0, 0
+        if not rows:
+            return 0, 0
+        with open(self._path('indptr'), 'rb') as f:
+            f.seek((rows - 1) * itemsize)
+            nnz = int(np.frombuffer(f.read(itemsize), dtype=_FILES['indptr'])[0])
+        return rows, nnz
+
+    def _stored_ids(self, rows: int) -> np.ndarray:
+        if not rows:
+            return np.empty(0, dtype=_FILES['ids'])
+        return np.memmap(self._path('ids'), dtype=_FILES['ids'], mode='r', shape=(rows,))
+
+    def append(self, candidate_ids: List[int], vectors) -> int:
+        """
+        Appends the vectors of new candidates
+
+        Candidates already in the matrix (as returned again by the candidate
+        store for a duplicate resume) are skipped. Ids below the last stored
+        one that are not in the matrix cannot be added without breaking the
+        id order; they are logged and skipped, which only happens if they were
+        not stored and appended under one exclusive lock.
+
+        Args:
+            candidate_ids: Candidate store ids
+            vectors: Sparse CSR matrix of hashed vectors, aligned with candidate_ids
+
+        Returns:
+            Number of rows appended
+        """
+        with self.exclusive():
+            rows, nnz = self._committed()
+            stored = self._stored_ids(rows)
+            last_id = int(stored[-1]) if rows else 0
+
+            # Rows are kept in id order; a duplicate within the call keeps its first vector
+            new, seen, missed = [], set(), []
+            for i in sorted(range(len(candidate_ids)), key=candidate_ids.__getitem__):
+                candidate_id = candidate_ids[i]
+                if candidate_id in seen:
+                    continue
+                seen.add(candidate_id)
+                if candidate_id > last_id:
+                    new.append(i)
+                    continue
+                position = np.searchsorted(stored, candidate_id)
+                if position == rows or stored[position] != candidate_id:
+                    missed.append(candidate_id)
+            if missed:
+                print(f"Error saving resume vectors: candidates {missed} are older than the last "
+                      f"stored one ({last_id}) and were not added to the resume matrix")
+            if not new:
+                return 0
+            vectors = vectors[new]
+            vectors.sort_indices()
+
+            arrays = {
+                'data': vectors.data.astype(_FILES['data']),
+                'indices': vectors.indices.astype(_FILES['indices']),
+                'ids': np.asarray([candidate_ids[i] for i in new], dtype=_FILES['ids']),
+                'indptr': (nnz + vectors.indptr[1:]).astype(_FILES['indptr']),
+            }
+            offsets = {'data': nnz, 'indices': nnz, 'ids': rows, 'indptr': rows}
+            # Written in the order of _FILES, so indptr commits the rows
+            for name, dtype in _FILES.items():
+                with open(self._path(name), 'ab') as f:
+                    f.truncate(offsets[name] * np.dtype(dtype).itemsize)
+                    f.write(arrays[name].tobytes())
+            return len(new)
+
+    def snapshot(self):
+        """
+        Returns the complete rows stored so far, memory-mapped
+
+        Returns:
+            (data, indices, indptr, candidate ids): indptr starts with 0 and
+            has one more entry than there are rows
+        """
+        rows, nnz = self._committed()
+        with self._lock:
+            if rows != self._rows:
+                counts = {'data': nnz, 'indices': nnz, 'indptr': rows, 'ids': rows}
+                self._arrays = {
+                    name: (np.memmap(self._path(name), dtype=dtype, mode='r', shape=(counts[name],))
+                           if counts[name] else np.empty(0, dtype=dtype))
+                    for name, dtype in _FILES.items()
+                }
+                self._rows = rows
+            arrays = self._arrays
+        indptr = np.concatenate([np.zeros(1, dtype=np.int64), arrays['indptr']])
+        return arrays['data'], arrays['indices'], indptr, arrays['ids']
+
+    def __len__(self) -> int:
+        return self._committed()[0]
+
+
+# Shared matrix (opened on first use)
+_resume_matrix = None
+
+
+def get_resume_matrix() -> ResumeMatrix:
+    global _resume_matrix
+    if _resume_matrix is None:
+        _resume_matrix = ResumeMatrix()
+    return _resume_matrix
+
+
+def record_resumes(candidates: List[Tuple[str, List[str], Optional[str]]], resume_texts: List[str]) -> List[int]:
+    """
+    Saves analyzed resumes to the candidate store (see record_candidates) and
+    their hashed vectors to the resume matrix; failures are logged and never
+    break the analysis
+
+    The store assigns ids and the matrix appends rows under the matrix's
+    exclusive lock, so rows are appended in id order whichever thread or
+    process analyzed the resume first.
+
+    Args:
+        candidates: (name, skills, content_hash) tuples
+        resume_texts: Extracted resume texts, aligned with candidates
+
+    Returns:
+        Candidate ids, or an empty list if nothing was stored
+    """
+    if not CANDIDATE_STORE_ENABLED or not candidates:
+        return []
+    try:
+        matrix = get_resume_matrix()
+        # Vectorized before taking the lock, which other writers wait for
+        vectors = hashed_vectors(resume_texts)
+    except Exception as e:
+        print(f"Error saving resume vectors: {str(e)}")
+        return record_candidates(candidates)
+
+    with matrix.exclusive():
+        candidate_ids = record_candidates(candidates)
+        if not candidate_ids:
+            return candidate_ids
+        try:
+            matrix.append(candidate_ids, vectors)
+        except Exception as e:
+            print(f"Error saving resume vectors: {str(e)}")
+    return candidate_ids
+
+
+def _jd_columns(jd_vectors):
+    """
+    The job descriptions' vectors as a dense (columns x job descriptions)
+    array over only the hashed columns they use, plus the map from hashed
+    column to row of that array (-1 for columns no job description uses)
+    """
+    columns = np.unique(jd_vectors.indices)
+    column_map = np.full(jd_vectors.shape[1], -1, dtype=np.int32)
+    column_map[columns] = np.arange(len(columns), dtype=np.int32)
+
+    dense = np.zeros((len(columns), jd_vectors.shape[0]), dtype=np.float32)
+    jd_rows = np.repeat(np.arange(jd_vectors.shape[0]), np.diff(jd_vectors.indptr))
+    dense[column_map[jd_vectors.indices], jd_rows] = jd_vectors.data
+    return dense, column_map
+
+
+def _chunk_similarities(data, indices, indptr, start: int, stop: int, dense, column_map) -> np.ndarray:
+    """
+    Cosine similarity of resume rows start..stop to every job description,
+    as (rows x job descriptions)
+
+    Only the values in columns some job description uses can add to a dot
+    product, so the rows are narrowed to those columns (a sparse matrix of
+    the few thousand columns the job descriptions use instead of 2**20) and
+    multiplied by the dense job description array.
+    """
+    from scipy.sparse import csr_matrix
+
+    first, last = indptr[start], indptr[stop]
+    columns = column_map[indices[first:last]]
+    keep = columns >= 0
+    # Kept values per row give the narrowed matrix's row offsets
+    kept = np.concatenate([np.zeros(1, dtype=np.int32), np.cumsum(keep, dtype=np.int32)])
+    narrowed = csr_matrix(
+        (data[first:last][keep], columns[keep], kept[indptr[start:stop + 1] - first]),
+        shape=(stop - start, dense.shape[0])
+    )
+    return narrowed @ dense
+
+
+def _merge_top_k(best: Tuple[np.ndarray, ...], chunk: Tuple[np.ndarray, ...], k: int) -> Tuple[np.ndarray, ...]:
+    """
+    Keeps the k highest scores per job description (one per row of the
+    arrays) out of the current best and a new chunk, with argpartition
+
+    Args:
+        best: (scores, similarities, resume rows) kept so far
+        chunk: The same arrays for the new chunk
+        k: Scores kept per job description
+
+    Returns:
+        The new (scores, similarities, resume rows)
+    """
+    merged = tuple(np.concatenate([kept, new], axis=1) for kept, new in zip(best, chunk))
+    if merged[0].shape[1] <= k:
+        return merged
+    top = np.argpartition(-merged[0], k - 1, axis=1)[:, :k]
+    return tuple(np.take_along_axis(array, top, axis=1) for array in merged)
+
+
+def rank_candidates(job_descriptions: List[str], k: int = 50) -> List[Dict]:
+    """
+    Top k stored candidates for each job description, from the stored
+    vectors only (nothing is parsed or vectorized again)
+
+    Similarities come from one sparse product of the resume matrix with
+    the job descriptions' hashed vectors, taken chunk by chunk with a
+    running argpartition top k, so memory does not grow with the number
+    of stored resumes. Each candidate's score combines that cosine with
+    the share of the job description's skills the candidate has:
+    (1 - RANKING_SKILL_WEIGHT) * similarity + RANKING_SKILL_WEIGHT * coverage
+    (the similarity alone for job descriptions without skills).
+
+    Args:
+        job_descriptions: Job description texts
+        k: Candidates returned per job description
+
+    Returns:
+        List aligned with job_descriptions of dictionaries with jd_skills and
+        candidates (highest score first: id, name, score, similarity,
+        skill_coverage and matched_skills)
+    """
+    from scipy.sparse import vstack
+
+    taxonomy = get_taxonomy()
+    analyses = [analyze_job_description(job_description, taxonomy, engine=HASHING_ENGINE)
+                for job_description in job_descriptions]
+    if not analyses or k <= 0:
+        return [{'jd_skills': analysis['skills'], 'candidates': []} for analysis in analyses]
+
+    store = get_candidate_store()
+    data, indices, indptr, candidate_ids = get_resume_matrix().snapshot()
+    rows = len(candidate_ids)
+
+    with timed('rank'):
+        dense, column_map = _jd_columns(vstack([analysis['vector'] for analysis in analyses]).tocsr())
+        weights = np.array([RANKING_SKILL_WEIGHT if analysis['skills'] else 0.0 for analysis in analyses],
+                           dtype=np.float32)
+        skill_counts = np.array([max(len(analysis['skills']), 1) for analysis in analyses], dtype=np.float32)
+        # Sorted candidate ids, once per skill they have, per job description
+        hits = [store.skill_hits(analysis['skills']) for analysis in analyses]
+
+        jds = len(analyses)
+        best = (np.empty((jds, 0), dtype=np.float32), np.empty((jds, 0), dtype=np.float32),
+                np.empty((jds, 0), dtype=np.int64))
+        for start in range(0, rows, RANKING_CHUNK_ROWS):
+            stop = min(start + RANKING_CHUNK_ROWS, rows)
+            similarities = _chunk_similarities(data, indices, indptr, start, stop, dense, column_map).T
+
+            # Ids increase with the rows, so the chunk's hits are one slice of each sorted array
+            chunk_ids = np.asarray(candidate_ids[start:stop])
+            low, high = int(chunk_ids[0]), int(chunk_ids[-1])
+            coverage = np.empty_like(similarities)
+            for j, jd_hits in enumerate(hits):
+                chunk_hits = jd_hits[np.searchsorted(jd_hits, low):np.searchsorted(jd_hits, high, side='right')]
+                coverage[j] = np.bincount(chunk_hits - low, minlength=high - low + 1)[chunk_ids - low]
+            coverage /= skill_counts[:, None]
+
+            scores = (1 - weights)[:, None] * similarities + weights[:, None] * coverage
+            chunk_rows = np.broadcast_to(np.arange(start, stop), scores.shape)
+            best = _merge_top_k(best, (scores, similarities, chunk_rows), k)
+
+        # Highest score first, ties by row (oldest candidate first)
+        best_scores, best_similarities, best_rows = best
+        order = np.lexsort((best_rows, -best_scores))
+        best_similarities = np.take_along_axis(best_similarities, order, axis=1)
+        best_rows = np.take_along_axis(best_rows, order, axis=1)
+        best_ids = np.asarray(candidate_ids)[best_rows] if rows else best_rows
+        candidates = {candidate['id']: candidate for candidate in store.get_candidates(np.unique(best_ids).tolist())}
+
+    results = []
+    for j, analysis in enumerate(analyses):
+        jd_skills = set(analysis['skills'])
+        ranked = []
+        for candidate_id, similarity in zip(best_ids[j].tolist(), best_similarities[j].tolist()):
+            candidate = candidates.get(candidate_id)
+            if candidate is None:
+                continue
+            matched_skills = [skill for skill in candidate['skills'] if skill in jd_skills]
+            coverage = len(matched_skills) / len(jd_skills) if jd_skills else 0.0
+            ranked.append({
+                'id': candidate['id'],
+                'name': candidate['name'],
+                'score': round((1 - float(weights[j])) * similarity + float(weights[j]) * coverage, 4),
+                'similarity': round(similarity, 4),
+                'skill_coverage': round(coverage, 4),
+                'matched_skills': matched_skills
+            })
+        results.append({'jd_skills': analysis['skills'], 'candidates': ranked})
+    return results
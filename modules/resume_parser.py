@@ -3,37 +3,600 @@ Resume Parser Module
 Extracts text from PDF resumes using PyPDF2
 """
 
-import PyPDF2
+import hashlib
+import io
+import multiprocessing
+import multiprocessing.connection
+import os
+import queue
 import re
-from typing import Optional
+import shutil
+import tempfile
+import threading
+import time
+from collections import deque
+from typing import BinaryIO, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+# PyPDF2 is imported by the functions that read PDFs, on first use
+from modules.cache import create_cache
+from modules.metrics import observe, timed
+from config import (
+    PDF_MAX_PAGES,
+    PDF_MAX_CHARS,
+    PDF_EXTRACTION_MODE,
+    PDF_PARALLEL_MIN_PAGES,
+    PDF_POOL_WORKERS,
+    PDF_PAGE_TIMEOUT,
+    PDF_DOCUMENT_TIMEOUT,
+    PDF_INSPECT_MAX_PAGES,
+    PDF_REJECT_PAGES,
+    PDF_REJECT_IMAGE_ONLY,
+    PDF_TEXT_CACHE_ENABLED,
+    PDF_TEXT_CACHE_BACKEND,
+    PDF_TEXT_CACHE_PATH,
+    PDF_TEXT_CACHE_MAX_ENTRIES,
+    PDF_TEXT_CACHE_MAX_BYTES
+)
 
 
-def extract_text_from_pdf(pdf_path: str) -> Optional[str]:
+# Runs of anything other than word characters and . - + # (whitespace
+# included) collapse to a single space; used by clean_text
+_NON_TEXT_RE = re.compile(r'[^\w.+#-]+')
+
+# Bump when clean_text changes in a way its patterns don't reflect
+CLEAN_TEXT_REVISION = 1
+
+# Cached texts are only reused while the cleaning rules and limits are unchanged
+CLEAN_TEXT_VERSION = hashlib.sha256(repr((
+    CLEAN_TEXT_REVISION,
+    _NON_TEXT_RE.pattern,
+    PDF_MAX_PAGES,
+    PDF_MAX_CHARS
+)).encode('utf-8')).hexdigest()[:12]
+
+# Cleaned resume text by SHA-256 of the PDF bytes (created on first use)
+_text_cache = None
+
+# Process pool for parallel page extraction (created on first use)
+_page_pool = None
+_page_pool_lock = threading.Lock()
+
+# (path, PdfReader) of the last document opened inside a pool worker
+_worker_reader = None
+
+
+def _get_text_cache():
+    global _text_cache
+    if _text_cache is None:
+        _text_cache = create_cache(
+            PDF_TEXT_CACHE_BACKEND,
+            PDF_TEXT_CACHE_PATH,
+            PDF_TEXT_CACHE_MAX_ENTRIES,
+            PDF_TEXT_CACHE_MAX_BYTES
+        )
+    return _text_cache
+
+
+# A PDF given as a file path, raw bytes or a binary file-like object
+PdfSource = Union[str, bytes, BinaryIO]
+
+
+def _open_pdf_source(source: PdfSource) -> BinaryIO:
     """
-    Extracts text from a PDF file
+    Returns a binary stream positioned at the start of the PDF
+    
+    File paths are opened (the caller closes the stream); bytes are wrapped
+    in memory and file-like objects are rewound.
+    """
+    if isinstance(source, str):
+        return open(source, 'rb')
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return io.BytesIO(source)
+    source.seek(0)
+    return source
+
+
+def hash_file(source: PdfSource) -> str:
+    """
+    Computes the SHA-256 of a file, reading it in chunks
     
     Args:
-        pdf_path: Path to the PDF file
+        source: File path, bytes or binary file-like object
         
     Returns:
-        Extracted text as a string, or None if extraction fails
+        Hex digest
     """
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return hashlib.sha256(source).hexdigest()
+    
+    digest = hashlib.sha256()
+    file = _open_pdf_source(source)
     try:
-        text = ""
+        for chunk in iter(lambda: file.read(64 * 1024), b''):
+            digest.update(chunk)
+    finally:
+        if isinstance(source, str):
+            file.close()
+    return digest.hexdigest()
+
+
+def _uses_fonts(resources, depth: int = 0) -> bool:
+    """
+    Whether a resource dictionary names a font, directly or in the resources
+    of a form XObject it draws (forms can nest, so only a few levels deep)
+    """
+    resources = resources.get_object() if resources is not None else None
+    if not resources:
+        return False
+    if resources.get('/Font'):
+        return True
+    if depth >= 2:
+        return False
+    xobjects = resources.get('/XObject')
+    for xobject in (xobjects.get_object().values() if xobjects else ()):
+        xobject = xobject.get_object()
+        if xobject.get('/Subtype') == '/Form' and _uses_fonts(xobject.get('/Resources'), depth + 1):
+            return True
+    return False
+
+
+def _iter_page_resources(pages_root, max_pages: int) -> Iterator:
+    """
+    Yields the resources of the first max_pages pages, walking the page tree
+    without building the whole page list (resources are inherited from
+    parent nodes when a page has none of its own)
+    """
+    stack = [(pages_root, None)]
+    seen = set()
+    yielded = 0
+    while stack and yielded < max_pages:
+        node, inherited = stack.pop()
+        node = node.get_object()
+        if id(node) in seen:
+            continue
+        seen.add(id(node))
+        resources = node.get('/Resources', inherited)
+        if node.get('/Type') == '/Pages' or '/Kids' in node:
+            # Reversed, so the first kid is visited first
+            stack.extend((kid, resources) for kid in reversed(node.get('/Kids') or []))
+        else:
+            yielded += 1
+            yield resources
+
+
+def inspect_pdf(source: PdfSource, max_pages: int = PDF_INSPECT_MAX_PAGES) -> Dict:
+    """
+    Inspects a PDF without extracting any text
+    
+    Only the trailer, the cross-reference table, the document catalog and the
+    dictionaries of the first max_pages pages are read. No content stream is
+    decoded, so this costs about as much for a 1,000-page scan as for a
+    one-page resume and can decide whether a document is worth extracting.
+    
+    Args:
+        source: Path to the PDF file, its bytes, or a binary file-like object
+        max_pages: Number of page dictionaries checked for fonts
+        
+    Returns:
+        Dictionary containing:
+        - pages: Page count declared by the page tree (None if it can't be read)
+        - encrypted: Whether the PDF is encrypted
+        - needs_password: Whether it is encrypted with a user password, so its
+          text can't be extracted
+        - image_only: Whether none of the inspected pages uses a font: scanned
+          or blank pages have no text layer to extract
         
-        with open(pdf_path, 'rb') as file:
+    Raises:
+        ValueError: If the file is not a readable PDF
+    """
+    import PyPDF2
+    
+    file = _open_pdf_source(source)
+    try:
+        try:
             pdf_reader = PyPDF2.PdfReader(file)
+            encrypted = pdf_reader.is_encrypted
+            try:
+                # Encrypted PDFs with an empty user password are opened
+                # transparently; anything else needs the password
+                pages_root = pdf_reader.trailer['/Root']['/Pages']
+            except PyPDF2.errors.FileNotDecryptedError:
+                return {'pages': None, 'encrypted': True, 'needs_password': True, 'image_only': False}
             
-            # Extract text from all pages
-            for page_num in range(len(pdf_reader.pages)):
-                page = pdf_reader.pages[page_num]
-                page_text = page.extract_text()
-                text += page_text + "\n"
+            page_count = int(pages_root.get('/Count', 0))
+            inspected = list(_iter_page_resources(pages_root, max_pages))
+        except Exception as e:
+            # Broken xref tables, missing catalog or page tree, ...
+            raise ValueError(f'Not a readable PDF: {str(e)}')
+    finally:
+        if isinstance(source, str):
+            file.close()
+    
+    return {
+        'pages': page_count,
+        'encrypted': encrypted,
+        'needs_password': False,
+        'image_only': bool(inspected) and not any(_uses_fonts(resources) for resources in inspected)
+    }
+
+
+def pdf_rejection(inspection: Dict) -> Optional[Tuple[str, str]]:
+    """
+    Decides from inspect_pdf results whether a PDF is rejected before
+    extraction (PDF_REJECT_PAGES, PDF_REJECT_IMAGE_ONLY)
+    
+    Returns:
+        (reason, message) with reason one of 'needs_password', 'too_many_pages'
+        and 'image_only', or None when the PDF is accepted
+    """
+    if inspection['needs_password']:
+        return 'needs_password', 'The PDF is password protected. Please upload an unprotected PDF.'
+    if PDF_REJECT_PAGES and inspection['pages'] is not None and inspection['pages'] > PDF_REJECT_PAGES:
+        return 'too_many_pages', (f"The PDF has {inspection['pages']} pages. "
+                                  f"At most {PDF_REJECT_PAGES} pages are accepted.")
+    if PDF_REJECT_IMAGE_ONLY and inspection['image_only']:
+        return 'image_only', ('The PDF has no text layer (scanned or image-only pages). '
+                              'Please upload a PDF with selectable text.')
+    return None
+
+
+def _limit_chars(page_texts: Iterable[str], max_chars: Optional[int]) -> Iterator[str]:
+    """
+    Passes cleaned page texts through until max_chars characters (counting
+    the spaces that join pages) have been collected; the last page is cut
+    to fit and the source iterator is not consumed any further
+    """
+    collected = 0
+    for page_text in page_texts:
+        if not page_text:
+            continue
+        
+        if max_chars is not None:
+            # Account for the space joining this page to the previous one
+            remaining = max_chars - collected - (1 if collected else 0)
+            if remaining <= 0:
+                break
+            page_text = page_text[:remaining].rstrip()
+        
+        collected += len(page_text) + (1 if collected else 0)
+        yield page_text
+
+
+def iter_pdf_pages(source: PdfSource,
+                   max_pages: Optional[int] = PDF_MAX_PAGES,
+                   max_chars: Optional[int] = PDF_MAX_CHARS,
+                   skipped_pages: Optional[List[Dict]] = None) -> Iterator[str]:
+    """
+    Yields the cleaned text of a PDF page by page
+    
+    Pages are extracted and cleaned one at a time, so only the current page
+    and the text kept so far are held in memory. Extraction stops early once
+    max_pages pages have been read or max_chars characters collected; the
+    last page is cut to fit within max_chars.
+    
+    Args:
+        source: Path to the PDF file, its bytes, or a binary file-like object
+        max_pages: Maximum number of pages to read (None for no limit)
+        max_chars: Maximum number of cleaned characters (None for no limit)
+        skipped_pages: When given, pages that fail to extract are skipped and
+            recorded here instead of aborting the document
         
-        # Clean the text
-        cleaned_text = clean_text(text)
+    Yields:
+        Cleaned text of each page that has any
+    """
+    import PyPDF2
+    
+    file = _open_pdf_source(source)
+    try:
+        pdf_reader = PyPDF2.PdfReader(file)
         
-        return cleaned_text if cleaned_text.strip() else None
+        page_count = len(pdf_reader.pages)
+        if max_pages is not None:
+            page_count = min(page_count, max_pages)
+        
+        yield from _limit_chars(_iter_page_texts(pdf_reader, page_count, skipped_pages), max_chars)
+    finally:
+        if isinstance(source, str):
+            file.close()
+
+
+def _iter_page_texts(pdf_reader, page_count: int, skipped_pages: Optional[List[Dict]]) -> Iterator[str]:
+    """
+    Yields the cleaned text of the first page_count pages of an open reader
+    """
+    for page_num in range(page_count):
+        try:
+            yield clean_text(pdf_reader.pages[page_num].extract_text())
+        except Exception as e:
+            if skipped_pages is None:
+                raise
+            skipped_pages.append({'page': page_num + 1, 'reason': f'error: {str(e)}'})
+
+
+def _extract_page_worker(path: str, page_num: int) -> str:
+    """
+    Process pool task: extracts and cleans one page of the PDF at path
+    
+    Each worker keeps the reader of the last document it opened, so the
+    file is parsed once per worker rather than once per page.
+    """
+    global _worker_reader
+    if _worker_reader is None or _worker_reader[0] != path:
+        import PyPDF2
+        with open(path, 'rb') as file:
+            data = file.read()
+        _worker_reader = (path, PyPDF2.PdfReader(io.BytesIO(data)))
+    return clean_text(_worker_reader[1].pages[page_num].extract_text())
+
+
+def _page_worker_loop(connection, extract: Callable[[str, int], str]):
+    """
+    Page pool process: extracts the (path, page number) tasks it receives
+    and answers ('ok', text) or ('error', message), until its pipe closes
+    """
+    while True:
+        try:
+            path, page_num = connection.recv()
+        except EOFError:
+            return
+        try:
+            connection.send(('ok', extract(path, page_num)))
+        except Exception as e:
+            connection.send(('error', str(e)))
+
+
+class PagePool:
+    """
+    Page extraction processes shared by the request threads of a worker
+    
+    A document checks out idle processes, keeps each one busy with a page at
+    a time and checks them back in. A process stuck on a page is killed and
+    replaced on its own, so the pages other documents have in flight are not
+    affected. Processes are started by a forkserver: forking the web worker
+    itself could copy locks held by its request, metrics or profiler threads.
+    """
+    
+    def __init__(self, size: int, extract: Callable[[str, int], str] = _extract_page_worker):
+        """
+        Args:
+            size: Number of processes
+            extract: Picklable function (path, page number) -> cleaned text
+        """
+        self.size = size
+        self.extract = extract
+        self._context = multiprocessing.get_context('forkserver')
+        self._context.set_forkserver_preload(['modules.resume_parser'])
+        self._idle = queue.Queue()
+        self._processes = set()
+        self._lock = threading.Lock()
+        for _ in range(size):
+            self._idle.put(self._start())
+    
+    def _start(self):
+        connection, child_connection = self._context.Pipe()
+        process = self._context.Process(target=_page_worker_loop, args=(child_connection, self.extract),
+                                        daemon=True)
+        process.start()
+        child_connection.close()
+        with self._lock:
+            self._processes.add(process)
+        return process, connection
+    
+    def checkout(self, count: int, timeout: float) -> List:
+        """
+        Waits up to timeout seconds for an idle process, then takes up to
+        count idle ones; raises queue.Empty if none became idle
+        """
+        workers = [self._idle.get(timeout=max(timeout, 0))]
+        while len(workers) < count:
+            try:
+                workers.append(self._idle.get_nowait())
+            except queue.Empty:
+                break
+        return workers
+    
+    def checkin(self, worker):
+        self._idle.put(worker)
+    
+    def replace(self, worker):
+        """
+        Kills a process (stuck on a page, or in an unknown state) and returns
+        a new one in its place
+        """
+        process, connection = worker
+        process.kill()
+        process.join()
+        connection.close()
+        with self._lock:
+            self._processes.discard(process)
+        return self._start()
+    
+    def close(self):
+        """
+        Stops every process
+        """
+        with self._lock:
+            processes = list(self._processes)
+            self._processes.clear()
+        for process in processes:
+            process.kill()
+            process.join()
+
+
+def _get_page_pool() -> PagePool:
+    global _page_pool
+    with _page_pool_lock:
+        if _page_pool is None:
+            _page_pool = PagePool(PDF_POOL_WORKERS or os.cpu_count())
+        return _page_pool
+
+
+def _extract_pages_parallel(source: PdfSource, page_count: int,
+                            max_chars: Optional[int], skipped_pages: List[Dict],
+                            pool: Optional[PagePool] = None) -> List[str]:
+    """
+    Fans the pages of a document out to the page pool
+    
+    A page not extracted PDF_PAGE_TIMEOUT seconds after it was handed to a
+    process is skipped, and only that process is replaced. Pages still
+    missing at the document deadline (PDF_DOCUMENT_TIMEOUT, which includes
+    waiting for idle processes) are skipped too. Skipped pages are recorded
+    in skipped_pages; the texts are returned in page order.
+    """
+    pool = pool or _get_page_pool()
+    temp_path = None
+    if isinstance(source, str):
+        path = source
+    else:
+        # Workers read the document from a file, so each gets it once
+        file = _open_pdf_source(source)
+        with tempfile.NamedTemporaryFile(suffix='.pdf', delete=False) as temp_file:
+            shutil.copyfileobj(file, temp_file)
+            temp_path = path = temp_file.name
+    
+    deadline = time.monotonic() + PDF_DOCUMENT_TIMEOUT
+    page_texts = {}
+    unstarted = deque(range(page_count))
+    # Connection of a busy process -> (process, connection), page, start time
+    busy: Dict = {}
+    
+    def assign(worker):
+        # Next page for a process, or back to the pool
+        if unstarted and time.monotonic() < deadline:
+            page_num = unstarted.popleft()
+            worker[1].send((path, page_num))
+            busy[worker[1]] = (worker, page_num, time.monotonic())
+        else:
+            pool.checkin(worker)
+    
+    try:
+        try:
+            workers = pool.checkout(page_count, deadline - time.monotonic())
+        except queue.Empty:
+            workers = []
+        for worker in workers:
+            assign(worker)
+        
+        while busy:
+            wake = min([deadline] + [started + PDF_PAGE_TIMEOUT for _, _, started in busy.values()])
+            ready = multiprocessing.connection.wait(list(busy), timeout=max(wake - time.monotonic(), 0))
+            for connection in ready:
+                worker, page_num, _ = busy.pop(connection)
+                try:
+                    status, value = connection.recv()
+                except (EOFError, OSError):
+                    # The process died on the page (e.g. killed for memory)
+                    skipped_pages.append({'page': page_num + 1, 'reason': 'error: page worker exited'})
+                    assign(pool.replace(worker))
+                    continue
+                if status == 'ok':
+                    page_texts[page_num] = value
+                else:
+                    skipped_pages.append({'page': page_num + 1, 'reason': f'error: {value}'})
+                assign(worker)
+            
+            # Stuck pages: only their processes are replaced
+            now = time.monotonic()
+            for connection, (worker, page_num, started) in list(busy.items()):
+                if now >= deadline:
+                    reason = 'document timeout'
+                elif now - started >= PDF_PAGE_TIMEOUT:
+                    reason = 'page timeout'
+                else:
+                    continue
+                del busy[connection]
+                skipped_pages.append({'page': page_num + 1, 'reason': reason})
+                assign(pool.replace(worker))
+        
+        skipped_pages.extend({'page': page_num + 1, 'reason': 'document timeout'} for page_num in unstarted)
+        skipped_pages.sort(key=lambda skipped: skipped['page'])
+        ordered = (page_texts[page_num] for page_num in sorted(page_texts))
+        return list(_limit_chars(ordered, max_chars))
+    finally:
+        # Interrupted: processes still on a page are in an unknown state
+        for worker, _, _ in busy.values():
+            pool.checkin(pool.replace(worker))
+        if temp_path is not None:
+            os.remove(temp_path)
+
+
+def extract_pdf(source: PdfSource,
+                max_pages: Optional[int] = PDF_MAX_PAGES,
+                max_chars: Optional[int] = PDF_MAX_CHARS,
+                mode: str = PDF_EXTRACTION_MODE) -> Dict:
+    """
+    Extracts the cleaned text of a PDF, skipping pages that fail or hang
+    
+    In 'parallel' mode, documents with at least PDF_PARALLEL_MIN_PAGES pages
+    are split across a shared process pool (see PagePool) with per-page and
+    per-document timeouts; smaller documents stay on the in-process path.
+    
+    Args:
+        source: Path to the PDF file, its bytes, or a binary file-like object
+        max_pages: Maximum number of pages to read (None for no limit)
+        max_chars: Maximum number of cleaned characters (None for no limit)
+        mode: 'serial' or 'parallel'
+        
+    Returns:
+        Dictionary containing:
+        - text: Cleaned text (empty if nothing could be extracted)
+        - pages: Number of pages considered
+        - skipped_pages: List of {'page', 'reason'} for pages left out
+    """
+    import PyPDF2
+    
+    skipped_pages = []
+    
+    file = _open_pdf_source(source)
+    try:
+        pdf_reader = PyPDF2.PdfReader(file)
+        
+        page_count = len(pdf_reader.pages)
+        if max_pages is not None:
+            page_count = min(page_count, max_pages)
+        
+        if mode == 'parallel' and page_count >= PDF_PARALLEL_MIN_PAGES:
+            page_texts = _extract_pages_parallel(source, page_count, max_chars, skipped_pages)
+        else:
+            page_texts = _limit_chars(_iter_page_texts(pdf_reader, page_count, skipped_pages), max_chars)
+        
+        # Pages are cleaned as they are read and joined once at the end
+        text = ' '.join(page_texts)
+    finally:
+        if isinstance(source, str):
+            file.close()
+    
+    return {
+        'text': text,
+        'pages': page_count,
+        'skipped_pages': skipped_pages
+    }
+
+
+def extract_text_from_pdf(source: PdfSource,
+                          max_pages: Optional[int] = PDF_MAX_PAGES,
+                          max_chars: Optional[int] = PDF_MAX_CHARS) -> Optional[str]:
+    """
+    Extracts text from a PDF file
+    
+    Args:
+        source: Path to the PDF file, its bytes, or a binary file-like object
+        max_pages: Maximum number of pages to read (None for no limit)
+        max_chars: Maximum number of cleaned characters (None for no limit)
+        
+    Returns:
+        Extracted text as a string, or None if extraction fails
+    """
+    try:
+        with timed('pdf'):
+            result = extract_pdf(source, max_pages, max_chars)
+        
+        observe('resume_analyzer_pdf_pages', result['pages'])
+        observe('resume_analyzer_text_chars', len(result['text']))
+        
+        if result['skipped_pages']:
+            print(f"Skipped PDF pages: {result['skipped_pages']}")
+        
+        return result['text'] if result['text'] else None
         
     except Exception as e:
         print(f"Error extracting text from PDF: {str(e)}")
@@ -47,6 +610,8 @@ def clean_text(text: str) -> str:
     - Converting to lowercase
     - Removing special characters (keeping alphanumeric and basic punctuation)
     
+    All three steps are done by a single substitution pass.
+    
     Args:
         text: Raw extracted text
         
@@ -56,34 +621,51 @@ def clean_text(text: str) -> str:
     if not text:
         return ""
     
-    # Replace multiple whitespace characters with single space
-    text = re.sub(r'\s+', ' ', text)
-    
-    # Remove excessive newlines
-    text = re.sub(r'\n\s*\n', '\n', text)
-    
-    # Convert to lowercase
-    text = text.lower()
-    
-    # Remove special characters but keep alphanumeric, spaces, and basic punctuation
-    # This helps preserve skill names and technical terms
-    text = re.sub(r'[^\w\s\.\-\+\#]', ' ', text)
-    
-    # Final whitespace cleanup
-    text = re.sub(r'\s+', ' ', text)
-    
-    return text.strip()
+    # Replace each run of whitespace and special characters with one space,
+    # keeping alphanumerics and . - + # to preserve skill names and technical terms
+    with timed('clean'):
+        return _NON_TEXT_RE.sub(' ', text.lower()).strip()
 
 
-def get_resume_text(pdf_path: str) -> Optional[str]:
+def get_resume_text(source: PdfSource, content_hash: Optional[str] = None) -> Optional[str]:
     """
     Main function to extract and clean resume text
     
+    Accepts a file path or the PDF in memory (bytes or a file-like object
+    such as an upload stream), so uploads don't need to be written to disk.
+    The cleaned text is cached by the SHA-256 of the PDF bytes, so identical
+    re-uploads skip PDF parsing entirely.
+    
     Args:
-        pdf_path: Path to the PDF resume
+        source: Path to the PDF resume, its bytes, or a binary file-like object
+        content_hash: SHA-256 hex digest of the file, if already computed
+            while receiving the upload
         
     Returns:
         Cleaned resume text or None if extraction fails
     """
-    return extract_text_from_pdf(pdf_path)
+    if not PDF_TEXT_CACHE_ENABLED:
+        return extract_text_from_pdf(source)
+    
+    if content_hash is None:
+        content_hash = hash_file(source)
+    
+    cache = _get_text_cache()
+    key = f'{CLEAN_TEXT_VERSION}:{content_hash}'
+    
+    text = cache.get(key)
+    if text is None:
+        text = extract_text_from_pdf(source)
+        if text:
+            cache.set(key, text)
+    
+    return text
+
 
+def get_text_cache_stats() -> dict:
+    """
+    Returns hit/miss/eviction counters of the resume text cache
+    """
+    if not PDF_TEXT_CACHE_ENABLED:
+        return {'enabled': False}
+    return {'enabled': True, **_get_text_cache().stats()}
@@ -0,0 +1,547 @@
+"""
+Screen Module
+Offline bulk screening: scores a directory of resume PDFs against a set of
+job descriptions in worker processes and streams the results to JSONL or CSV.
+A checkpoint file records what has been written, so an interrupted run
+resumes where it stopped.
+
+Usage:
+    python -m modules.screen RESUME_DIR --jd JD.txt [--jd JD_DIR] --output results.jsonl
+        [--workers N] [--memory-limit-mb 1024] [--hard-memory-limit-mb 0] [--restart]
+"""
+
+import argparse
+import csv
+import hashlib
+import io
+import json
+import multiprocessing
+import os
+import queue
+import resource
+import signal
+import sys
+import time
+from collections import deque
+from typing import Deque, Dict, List, Optional, Set, TextIO, Tuple
+
+from config import (
+    SCREEN_WORKERS,
+    SCREEN_MEMORY_LIMIT_MB,
+    SCREEN_HARD_MEMORY_LIMIT_MB,
+    SCREEN_CHECKPOINT_INTERVAL,
+    SCREEN_PROGRESS_INTERVAL
+)
+
+
+OUTPUT_FORMATS = ('jsonl', 'csv')
+
+# One record per resume and job description; a resume that fails gets one
+# record with an error and no job
+RECORD_FIELDS = ['path', 'job', 'match_percentage', 'matched_skills', 'missing_skills',
+                 'taxonomy_version', 'error']
+
+# Bump when the checkpoint file layout changes
+CHECKPOINT_VERSION = 1
+
+
+def find_resumes(directory: str) -> List[str]:
+    """
+    Returns the paths of the PDFs under directory (recursively), relative to
+    it and sorted, so every run sees them in the same order
+    """
+    paths = []
+    for root, dirs, files in os.walk(directory):
+        dirs.sort()
+        for name in sorted(files):
+            if name.lower().endswith('.pdf'):
+                paths.append(os.path.relpath(os.path.join(root, name), directory))
+    return paths
+
+
+def load_job_descriptions(paths: List[str]) -> Dict[str, str]:
+    """
+    Reads job descriptions from text files and directories of .txt files
+
+    Args:
+        paths: Files and directories
+
+    Returns:
+        Dictionary of job name (file name without extension) -> text
+
+    Raises:
+        ValueError: If a file is empty or two files have the same name
+    """
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            files.extend(os.path.join(path, name) for name in sorted(os.listdir(path))
+                         if name.lower().endswith('.txt'))
+        else:
+            files.append(path)
+
+    job_descriptions = {}
+    for path in files:
+        name = os.path.splitext(os.path.basename(path))[0]
+        if name in job_descriptions:
+            raise ValueError(f'Two job descriptions are named {name!r}')
+        with open(path, encoding='utf-8') as f:
+            text = f.read().strip()
+        if not text:
+            raise ValueError(f'Job description {path} is empty')
+        job_descriptions[name] = text
+
+    if not job_descriptions:
+        raise ValueError('No job descriptions found')
+    return job_descriptions
+
+
+def screen_resume(path: str, job_descriptions: Dict[str, str]) -> List[Dict]:
+    """
+    Scores one resume against every job description
+
+    Args:
+        path: Path to the PDF resume
+        job_descriptions: Job name -> job description text
+
+    Returns:
+        One record per job description, with job, match_percentage,
+        matched_skills, missing_skills and taxonomy_version
+
+    Raises:
+        ValueError: If no text can be extracted from the PDF
+    """
+    from modules.resume_parser import get_resume_text
+    from modules.matcher import get_match_analysis_multi
+
+    resume_text = get_resume_text(path)
+    if not resume_text:
+        raise ValueError('Could not extract text from PDF')
+
+    # Skills and vector of the resume are computed once for all jobs
+    jobs = list(job_descriptions)
+    analyses = sorted(get_match_analysis_multi(resume_text, [job_descriptions[job] for job in jobs]),
+                      key=lambda analysis: analysis['index'])
+    return [
+        {
+            'job': jobs[analysis['index']],
+            'match_percentage': analysis['match_percentage'],
+            'matched_skills': analysis['matched_skills'],
+            'missing_skills': analysis['missing_skills'],
+            'taxonomy_version': analysis['taxonomy_version']
+        }
+        for analysis in analyses
+    ]
+
+
+def _peak_rss_mb() -> float:
+    # ru_maxrss is in KiB on Linux and bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def _worker(worker_id: int, directory: str, job_descriptions: Dict[str, str],
+            tasks, results, memory_limit_mb: int, hard_memory_limit_mb: int):
+    """
+    Worker process loop: screens the resumes of its task queue in order until
+    it gets None, or until its peak RSS exceeds memory_limit_mb (it is then
+    replaced)
+
+    Messages to results: ('ready', worker_id) once started, ('done',
+    worker_id, path, records, error, peak_rss_mb) after each resume and
+    ('retired', worker_id) when it leaves over the memory limit.
+    """
+    # Ctrl-C reaches the whole process group; the parent stops the workers
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    if hard_memory_limit_mb:
+        # Import the dependencies first, so the cap only limits what screening
+        # a resume allocates: past it, allocations raise MemoryError, which
+        # fails that resume only
+        from modules.warmup import preload
+        preload()
+        limit = hard_memory_limit_mb * 1024 * 1024
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+    results.put(('ready', worker_id))
+
+    while True:
+        path = tasks.get()
+        if path is None:
+            return
+
+        try:
+            records, error = screen_resume(os.path.join(directory, path), job_descriptions), None
+        except Exception as e:
+            records, error = [], f'Error processing resume: {str(e)}'
+
+        peak_rss_mb = _peak_rss_mb()
+        results.put(('done', worker_id, path, records, error, peak_rss_mb))
+        if memory_limit_mb and peak_rss_mb > memory_limit_mb:
+            results.put(('retired', worker_id))
+            return
+
+
+def format_record(record: Dict, output_format: str) -> bytes:
+    """
+    Encodes one record as a JSON line or a CSV row (lists joined with ';')
+    """
+    if output_format == 'jsonl':
+        return (json.dumps(record) + '\n').encode('utf-8')
+
+    row = io.StringIO()
+    csv.writer(row).writerow([
+        ';'.join(value) if isinstance(value, list) else ('' if value is None else value)
+        for value in (record.get(field) for field in RECORD_FIELDS)
+    ])
+    return row.getvalue().encode('utf-8')
+
+
+def settings_fingerprint(job_descriptions: Dict[str, str], output_format: str) -> str:
+    """
+    Identifies what a checkpoint was written for: resuming with other job
+    descriptions or another format would mix incompatible records
+    """
+    return hashlib.sha256(json.dumps(
+        {'format': output_format, 'job_descriptions': sorted(job_descriptions.items())}
+    ).encode('utf-8')).hexdigest()
+
+
+def read_checkpoint(path: str, fingerprint: str) -> Optional[Tuple[Set[str], int]]:
+    """
+    Reads a checkpoint file
+
+    The first line identifies the run; every following line lists resumes
+    whose records are in the output, and the output size after them. A line
+    cut short by a crash is ignored.
+
+    Args:
+        path: Checkpoint file
+        fingerprint: settings_fingerprint of the current run
+
+    Returns:
+        (finished resume paths, output size in bytes), or None if there is
+        no checkpoint
+
+    Raises:
+        ValueError: If the checkpoint belongs to a run with other settings
+    """
+    if not os.path.exists(path):
+        return None
+
+    finished: Set[str] = set()
+    offset = None
+    with open(path, encoding='utf-8') as f:
+        for number, line in enumerate(f):
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                break
+            if number == 0:
+                if entry.get('version') != CHECKPOINT_VERSION or entry.get('settings') != fingerprint:
+                    raise ValueError(f'Checkpoint {path} was written with other job descriptions or '
+                                     'another output format; use --restart to start over')
+                continue
+            finished.update(entry['paths'])
+            offset = entry['offset']
+
+    if offset is None:
+        return None
+    return finished, offset
+
+
+def _append_checkpoint(checkpoint, entry: Dict):
+    checkpoint.write(json.dumps(entry) + '\n')
+    checkpoint.flush()
+    os.fsync(checkpoint.fileno())
+
+
+def _format_duration(seconds: float) -> str:
+    minutes, seconds = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f'{hours}h{minutes:02d}m' if hours else f'{minutes}m{seconds:02d}s'
+
+
+def run_screen(directory: str, job_descriptions: Dict[str, str], output: str,
+               output_format: Optional[str] = None, checkpoint: Optional[str] = None,
+               workers: int = SCREEN_WORKERS, memory_limit_mb: int = SCREEN_MEMORY_LIMIT_MB,
+               hard_memory_limit_mb: int = SCREEN_HARD_MEMORY_LIMIT_MB, restart: bool = False,
+               checkpoint_interval: float = SCREEN_CHECKPOINT_INTERVAL,
+               progress_interval: float = SCREEN_PROGRESS_INTERVAL,
+               log: TextIO = sys.stderr) -> Dict:
+    """
+    Screens every PDF under directory against every job description
+
+    Records are written as resumes finish, in completion order. Every
+    checkpoint_interval seconds the output is flushed to disk and the
+    resumes written since the last checkpoint are appended to the checkpoint
+    file with the output size. A later run with the same job descriptions
+    truncates the output to the last checkpoint and skips those resumes.
+
+    Args:
+        directory: Directory of resume PDFs (searched recursively)
+        job_descriptions: Job name -> job description text
+        output: Output file
+        output_format: 'jsonl' or 'csv' (default: from the output extension)
+        checkpoint: Checkpoint file (default: output + '.checkpoint')
+        workers: Worker processes (0 = one per CPU core)
+        memory_limit_mb: Peak RSS after which a worker is replaced (0 = never)
+        hard_memory_limit_mb: Address space cap per worker (0 = none)
+        restart: Ignore an existing checkpoint and start over
+        checkpoint_interval: Seconds between checkpoints
+        progress_interval: Seconds between progress lines on log
+        log: Stream for progress lines
+
+    Returns:
+        Summary with resumes, skipped, screened, errors, records, seconds
+        and resumes_per_second
+
+    Raises:
+        ValueError: If the output format is unknown or the checkpoint
+            belongs to a run with other settings
+        RuntimeError: If a worker process dies while starting (for example
+            with hard_memory_limit_mb below what it needs to import)
+    """
+    if output_format is None:
+        output_format = 'csv' if output.lower().endswith('.csv') else 'jsonl'
+    if output_format not in OUTPUT_FORMATS:
+        raise ValueError(f"Unknown output format '{output_format}' (expected one of {', '.join(OUTPUT_FORMATS)})")
+    checkpoint = checkpoint or f'{output}.checkpoint'
+    workers = workers or os.cpu_count() or 1
+    fingerprint = settings_fingerprint(job_descriptions, output_format)
+
+    paths = find_resumes(directory)
+    state = None if restart else read_checkpoint(checkpoint, fingerprint)
+    if state is not None and not os.path.exists(output):
+        print(f"Output {output} is missing; ignoring checkpoint {checkpoint}", file=log)
+        state = None
+
+    if state is not None:
+        finished, offset = state
+        # Records written after the last checkpoint are written again
+        out = open(output, 'r+b')
+        out.truncate(offset)
+        out.seek(offset)
+        checkpoint_file = open(checkpoint, 'a', encoding='utf-8')
+    else:
+        finished = set()
+        out = open(output, 'wb')
+        if output_format == 'csv':
+            out.write(format_record({field: field for field in RECORD_FIELDS}, output_format))
+        out.flush()
+        checkpoint_file = open(checkpoint, 'w', encoding='utf-8')
+        _append_checkpoint(checkpoint_file, {'version': CHECKPOINT_VERSION, 'settings': fingerprint})
+        _append_checkpoint(checkpoint_file, {'paths': [], 'offset': out.tell()})
+
+    pending = [path for path in paths if path not in finished]
+    skipped = len(paths) - len(pending)
+    workers = min(workers, len(pending))
+    print(f"Screening {len(pending)} resumes against {len(job_descriptions)} job descriptions "
+          f"with {workers} workers ({skipped} already done)", file=log)
+
+    # One BLAS thread per worker: the pool already uses every core
+    for name in ('OMP_NUM_THREADS', 'OPENBLAS_NUM_THREADS', 'MKL_NUM_THREADS'):
+        os.environ.setdefault(name, '1')
+
+    # spawn keeps workers independent of the caller's threads and state
+    context = multiprocessing.get_context('spawn')
+    results = context.Queue()
+    # Worker id -> (process, task queue, resumes sent to it and not done yet,
+    # oldest first: the first one is being screened)
+    pool: Dict[int, Tuple[multiprocessing.Process, multiprocessing.Queue, Deque[str]]] = {}
+    next_worker_id = 0
+
+    def start_worker():
+        nonlocal next_worker_id
+        tasks = context.Queue()
+        process = context.Process(
+            target=_worker,
+            args=(next_worker_id, directory, job_descriptions, tasks, results,
+                  memory_limit_mb, hard_memory_limit_mb),
+            daemon=True
+        )
+        process.start()
+        pool[next_worker_id] = (process, tasks, deque())
+        next_worker_id += 1
+
+    done = errors = records = 0
+    peak_rss_mb = 0.0
+    unsent = deque(pending)
+    ready: Set[int] = set()
+    retired: Set[int] = set()
+    unsaved: List[str] = []  # resumes written since the last checkpoint
+    start = last_checkpoint = last_progress = time.perf_counter()
+
+    def write(path: str, path_records: List[Dict], error: Optional[str]):
+        nonlocal done, errors, records
+        if error is not None:
+            path_records = [{'error': error}]
+            errors += 1
+        for record in path_records:
+            out.write(format_record({'path': path, **record}, output_format))
+        records += len(path_records)
+        unsaved.append(path)
+        done += 1
+
+    def save_checkpoint():
+        out.flush()
+        os.fsync(out.fileno())
+        _append_checkpoint(checkpoint_file, {'paths': unsaved, 'offset': out.tell()})
+        unsaved.clear()
+
+    def handle(messages: List[Tuple]):
+        nonlocal peak_rss_mb
+        for message in messages:
+            if message[0] == 'done':
+                _, worker_id, path, path_records, error, worker_rss_mb = message
+                if worker_id not in pool:
+                    # Already handled as dead: its resumes were failed or resent
+                    continue
+                pool[worker_id][2].popleft()
+                peak_rss_mb = max(peak_rss_mb, worker_rss_mb)
+                write(path, path_records, error)
+            elif message[0] == 'ready':
+                ready.add(message[1])
+            elif message[0] == 'retired':
+                retired.add(message[1])
+
+    def report():
+        elapsed = time.perf_counter() - start
+        rate = done / elapsed if elapsed else 0.0
+        eta = _format_duration((len(pending) - done) / rate) if rate else '?'
+        print(f"{skipped + done}/{len(paths)} resumes ({(skipped + done) / max(len(paths), 1):.1%})  "
+              f"{rate:.1f} resumes/s  ETA {eta}  errors {errors}  worker peak RSS {peak_rss_mb:.0f} MB",
+              file=log, flush=True)
+
+    try:
+        for _ in range(workers):
+            start_worker()
+
+        while done < len(pending):
+            # Keep two resumes queued per worker, not the whole archive
+            for worker_id, (process, tasks, assigned) in pool.items():
+                while unsent and len(assigned) < 2 and worker_id not in retired:
+                    assigned.append(unsent.popleft())
+                    tasks.put(assigned[-1])
+
+            messages = []
+            try:
+                messages.append(results.get(timeout=0.2))
+                while True:
+                    messages.append(results.get_nowait())
+            except queue.Empty:
+                pass
+            handle(messages)
+
+            # Replace workers that left over the memory limit or died
+            dead = [worker_id for worker_id, (process, _, _) in pool.items() if not process.is_alive()]
+            if dead:
+                # A worker flushes its messages before it exits: read them all
+                # before deciding what happened to its resumes
+                messages = []
+                try:
+                    while True:
+                        messages.append(results.get_nowait())
+                except queue.Empty:
+                    pass
+                handle(messages)
+            for worker_id in dead:
+                process, _, assigned = pool.pop(worker_id)
+                process.join()
+                if worker_id not in ready:
+                    # Replacing it would fail the same way for every resume
+                    raise RuntimeError(f'Worker failed to start (exit code {process.exitcode})')
+                if process.exitcode != 0 and assigned:
+                    # The resume it died on (for example killed for running
+                    # out of memory) is recorded as failed rather than retried
+                    # forever
+                    write(assigned.popleft(), [],
+                          f'Worker exited with code {process.exitcode} while processing the resume')
+                # A worker that exits with code 0 retired over the memory
+                # limit: all of its unfinished resumes go to other workers
+                unsent.extendleft(reversed(assigned))
+                if done < len(pending):
+                    start_worker()
+
+            now = time.perf_counter()
+            if now - last_checkpoint >= checkpoint_interval:
+                save_checkpoint()
+                last_checkpoint = now
+            if now - last_progress >= progress_interval:
+                report()
+                last_progress = now
+
+        for process, tasks, _ in pool.values():
+            tasks.put(None)
+        for process, _, _ in pool.values():
+            process.join(timeout=5)
+    finally:
+        # Interrupted: workers are stopped mid-resume, those resumes are redone
+        # by the next run
+        for process, _, _ in pool.values():
+            if process.is_alive():
+                process.terminate()
+        save_checkpoint()
+        out.close()
+        checkpoint_file.close()
+
+    seconds = time.perf_counter() - start
+    report()
+    return {
+        'resumes': len(paths),
+        'skipped': skipped,
+        'screened': done,
+        'errors': errors,
+        'records': records,
+        'seconds': seconds,
+        'resumes_per_second': done / seconds if seconds else 0.0
+    }
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description='Screen a directory of resume PDFs against job descriptions')
+    parser.add_argument('directory', help='Directory of resume PDFs (searched recursively)')
+    parser.add_argument('--jd', action='append', required=True, metavar='PATH',
+                        help='Job description text file, or a directory of .txt files (repeatable)')
+    parser.add_argument('--output', '-o', required=True, help='Output file (.jsonl or .csv)')
+    parser.add_argument('--format', choices=OUTPUT_FORMATS, help='Output format (default: from the extension)')
+    parser.add_argument('--checkpoint', help='Checkpoint file (default: OUTPUT.checkpoint)')
+    parser.add_argument('--workers', type=int, default=SCREEN_WORKERS, help='Worker processes (0 = one per CPU core)')
+    parser.add_argument('--memory-limit-mb', type=int, default=SCREEN_MEMORY_LIMIT_MB,
+                        help='Replace a worker once its peak RSS exceeds this (0 = never)')
+    parser.add_argument('--hard-memory-limit-mb', type=int, default=SCREEN_HARD_MEMORY_LIMIT_MB,
+                        help='Address space cap per worker; resumes that need more fail (0 = none)')
+    parser.add_argument('--restart', action='store_true', help='Ignore an existing checkpoint and start over')
+    args = parser.parse_args(argv)
+
+    if not os.path.isdir(args.directory):
+        parser.error(f'{args.directory} is not a directory')
+    try:
+        job_descriptions = load_job_descriptions(args.jd)
+    except (OSError, ValueError) as e:
+        parser.error(str(e))
+
+    try:
+        summary = run_screen(
+            args.directory, job_descriptions, args.output,
+            output_format=args.format,
+            checkpoint=args.checkpoint,
+            workers=args.workers,
+            memory_limit_mb=args.memory_limit_mb,
+            hard_memory_limit_mb=args.hard_memory_limit_mb,
+            restart=args.restart
+        )
+    except ValueError as e:
+        parser.error(str(e))
+    except RuntimeError as e:
+        print(f"Error screening resumes: {str(e)}", file=sys.stderr)
+        sys.exit(1)
+    except KeyboardInterrupt:
+        print("\nInterrupted; run the same command again to resume", file=sys.stderr)
+        sys.exit(130)
+
+    print(f"Screened {summary['screened']} resumes in {summary['seconds']:.1f} s "
+          f"({summary['resumes_per_second']:.1f} resumes/s, {summary['errors']} errors); "
+          f"{summary['records']} records written to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,203 @@
+"""
+Skill Bitset Module
+Skill sets as NumPy boolean rows (or packed bitsets) indexed by skill id,
+with skill gap analysis of one job description against many candidates at once
+
+Ids belong to one taxonomy version: every function takes the taxonomy the
+rows were built with (the current version by default).
+"""
+
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+from modules.skill_db import Taxonomy, get_taxonomy
+
+# Set bits per byte value, for NumPy versions without np.bitwise_count
+_POPCOUNT_TABLE = np.array([bin(value).count('1') for value in range(256)], dtype=np.uint8)
+
+
+@lru_cache(maxsize=4)
+def _skill_names_array(taxonomy: Taxonomy) -> np.ndarray:
+    # Skill name per id, for decoding rows (a few versions at most live at once)
+    return np.array(taxonomy.skills, dtype=object)
+
+
+def skill_row(skills: Iterable[str], taxonomy: Optional[Taxonomy] = None) -> np.ndarray:
+    """
+    Encodes a skill set as a boolean row indexed by skill id
+
+    Args:
+        skills: Canonical skill names (skills outside the taxonomy are ignored)
+        taxonomy: Taxonomy defining the ids
+
+    Returns:
+        Boolean array with one column per skill of the taxonomy
+    """
+    taxonomy = taxonomy or get_taxonomy()
+    skill_ids = taxonomy.skill_ids
+    row = np.zeros(len(taxonomy), dtype=bool)
+    ids = [skill_ids[skill] for skill in skills if skill in skill_ids]
+    row[ids] = True
+    return row
+
+
+def skill_matrix(skill_lists: List[Iterable[str]], taxonomy: Optional[Taxonomy] = None) -> np.ndarray:
+    """
+    Encodes many skill sets as a boolean matrix, one row per set
+
+    Args:
+        skill_lists: Canonical skill names per candidate
+        taxonomy: Taxonomy defining the ids
+
+    Returns:
+        Boolean array of shape (len(skill_lists), number of skills)
+    """
+    taxonomy = taxonomy or get_taxonomy()
+    skill_ids = taxonomy.skill_ids
+    rows = []
+    columns = []
+    for row, skills in enumerate(skill_lists):
+        ids = [skill_ids[skill] for skill in skills if skill in skill_ids]
+        rows.extend([row] * len(ids))
+        columns.extend(ids)
+
+    matrix = np.zeros((len(skill_lists), len(taxonomy)), dtype=bool)
+    matrix[rows, columns] = True
+    return matrix
+
+
+def skill_names(row: np.ndarray, taxonomy: Optional[Taxonomy] = None) -> List[str]:
+    """
+    Decodes a boolean row back to skill names (alphabetical, as ids are)
+    """
+    return _skill_names_array(taxonomy or get_taxonomy())[np.flatnonzero(row)].tolist()
+
+
+def _names_per_row(matrix: np.ndarray, taxonomy: Taxonomy) -> List[List[str]]:
+    # One nonzero() over the whole matrix, split into rows
+    rows, columns = np.nonzero(matrix)
+    names = _skill_names_array(taxonomy)[columns].tolist()
+    bounds = np.searchsorted(rows, np.arange(len(matrix) + 1)).tolist()
+    return [names[start:end] for start, end in zip(bounds, bounds[1:])]
+
+
+def pack(matrix: np.ndarray) -> np.ndarray:
+    """
+    Packs boolean rows into bitsets (8 skills per byte)
+    """
+    return np.packbits(matrix, axis=-1)
+
+
+def unpack(packed: np.ndarray, taxonomy: Optional[Taxonomy] = None) -> np.ndarray:
+    """
+    Restores boolean rows from bitsets made by pack
+    """
+    return np.unpackbits(packed, axis=-1, count=len(taxonomy or get_taxonomy())).astype(bool)
+
+
+def popcount(packed: np.ndarray) -> np.ndarray:
+    """
+    Number of set bits per bitset row
+
+    Args:
+        packed: uint8 array of shape (..., bytes)
+
+    Returns:
+        Number of skills per row
+    """
+    if hasattr(np, 'bitwise_count'):
+        return np.bitwise_count(packed).sum(axis=-1, dtype=np.int64)
+    return _POPCOUNT_TABLE[packed].sum(axis=-1, dtype=np.int64)
+
+
+def gap_counts(packed_resumes: np.ndarray, packed_jd: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    Matched and missing skill counts and JD skill coverage for many
+    candidates, with bitwise AND / AND NOT over packed bitsets
+
+    Args:
+        packed_resumes: Packed skill bitsets, one row per candidate
+        packed_jd: Packed skill bitset of the job description
+
+    Returns:
+        Dictionary of arrays aligned with the rows: matched, missing and
+        coverage (share of JD skills the candidate has, 0-1)
+    """
+    jd_count = int(popcount(packed_jd))
+    matched = popcount(packed_resumes & packed_jd)
+    coverage = matched / jd_count if jd_count else np.zeros(len(matched))
+    return {
+        'matched': matched,
+        'missing': jd_count - matched,
+        'coverage': coverage
+    }
+
+
+def skill_gaps(resume_matrix: np.ndarray, jd_row: np.ndarray, taxonomy: Optional[Taxonomy] = None) -> List[Dict]:
+    """
+    Finds matched and missing skills of every candidate against one job
+    description
+
+    Args:
+        resume_matrix: Boolean skill matrix, one row per candidate
+        jd_row: Boolean skill row of the job description
+        taxonomy: Taxonomy the rows were built with
+
+    Returns:
+        List of dictionaries with matched_skills, missing_skills, resume_skills
+        and jd_skills (sorted names), aligned with the rows
+    """
+    if not len(resume_matrix):
+        return []
+
+    taxonomy = taxonomy or get_taxonomy()
+    matched = _names_per_row(resume_matrix & jd_row, taxonomy)
+    missing = _names_per_row(jd_row & ~resume_matrix, taxonomy)
+    resume_skills = _names_per_row(resume_matrix, taxonomy)
+    jd_skills = skill_names(jd_row, taxonomy)
+
+    return [
+        {
+            'matched_skills': matched[i],
+            'missing_skills': missing[i],
+            'resume_skills': resume_skills[i],
+            'jd_skills': list(jd_skills)
+        }
+        for i in range(len(resume_matrix))
+    ]
+
+
+def job_gaps(resume_row: np.ndarray, jd_matrix: np.ndarray, taxonomy: Optional[Taxonomy] = None) -> List[Dict]:
+    """
+    Finds matched and missing skills of one candidate against many job
+    descriptions (skill_gaps the other way around)
+
+    Args:
+        resume_row: Boolean skill row of the candidate
+        jd_matrix: Boolean skill matrix, one row per job description
+        taxonomy: Taxonomy the rows were built with
+
+    Returns:
+        List of dictionaries with matched_skills, missing_skills, resume_skills
+        and jd_skills (sorted names), aligned with the job descriptions
+    """
+    if not len(jd_matrix):
+        return []
+
+    taxonomy = taxonomy or get_taxonomy()
+    matched = _names_per_row(jd_matrix & resume_row, taxonomy)
+    missing = _names_per_row(jd_matrix & ~resume_row, taxonomy)
+    jd_skills = _names_per_row(jd_matrix, taxonomy)
+    resume_skills = skill_names(resume_row, taxonomy)
+
+    return [
+        {
+            'matched_skills': matched[i],
+            'missing_skills': missing[i],
+            'resume_skills': list(resume_skills),
+            'jd_skills': jd_skills[i]
+        }
+        for i in range(len(jd_matrix))
+    ]
@@ -1,157 +1,410 @@
 """
 Skills Database Module
-Maintains a comprehensive list of technical skills for matching
+Versioned skill taxonomy: canonical skills with their aliases and category,
+read from skill_taxonomy.json and compiled (alias map, ids, matcher tables)
+into an artifact that loads in a few milliseconds. Running processes swap in
+a new version when the files change or on a signal, without a restart.
+
+Usage:
+    python -m modules.skill_db build [--taxonomy PATH] [--output PATH]
+    python -m modules.skill_db info [--artifact PATH]
 """
 
-# Programming Languages
-PROGRAMMING_LANGUAGES = [
-    'python', 'java', 'javascript', 'typescript', 'c++', 'c#', 'c', 'go', 'rust',
-    'ruby', 'php', 'swift', 'kotlin', 'scala', 'r', 'matlab', 'perl', 'shell',
-    'bash', 'powershell', 'sql', 'html', 'css', 'dart', 'lua', 'haskell', 'erlang',
-    'elixir', 'clojure', 'f#', 'vb.net', 'objective-c', 'assembly', 'fortran',
-    'cobol', 'pascal', 'ada', 'delphi'
-]
+import argparse
+import hashlib
+import json
+import os
+import pickle
+import signal
+import sys
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Set, Tuple
 
-# Web Frameworks
-WEB_FRAMEWORKS = [
-    'flask', 'django', 'fastapi', 'express', 'react', 'angular', 'vue', 'next.js',
-    'nuxt.js', 'svelte', 'ember', 'backbone', 'meteor', 'spring', 'spring boot',
-    'asp.net', 'laravel', 'symfony', 'codeigniter', 'ruby on rails', 'phoenix',
-    'gin', 'echo', 'fiber', 'play framework', 'akka', 'vert.x', 'ktor'
-]
+from modules.skill_matcher import FuzzySkillIndex, SkillMatcher, SkillPhraseIndex
+from config import (
+    TAXONOMY_PATH,
+    TAXONOMY_ARTIFACT_PATH,
+    TAXONOMY_RELOAD_INTERVAL,
+    TAXONOMY_RELOAD_SIGNAL
+)
 
-# Frontend Technologies
-FRONTEND_TECH = [
-    'html5', 'css3', 'sass', 'scss', 'less', 'bootstrap', 'tailwind css',
-    'material-ui', 'ant design', 'chakra ui', 'styled-components', 'jquery',
-    'redux', 'mobx', 'zustand', 'recoil', 'webpack', 'vite', 'parcel', 'rollup',
-    'gulp', 'grunt', 'npm', 'yarn', 'pnpm', 'babel', 'typescript', 'es6', 'es7'
-]
 
-# Backend Technologies
-BACKEND_TECH = [
-    'node.js', 'deno', 'bun', 'rest api', 'graphql', 'grpc', 'microservices',
-    'serverless', 'lambda', 'azure functions', 'google cloud functions',
-    'web sockets', 'socket.io', 'rabbitmq', 'kafka', 'redis', 'celery',
-    'rq', 'bull', 'sidekiq', 'background jobs', 'cron', 'scheduled tasks'
+# Sources whose changes make a compiled artifact stale (besides the taxonomy file)
+_CODE_SOURCES = [
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'skill_matcher.py'),
+    os.path.abspath(__file__),
 ]
 
-# Databases
-DATABASES = [
-    'mysql', 'postgresql', 'mongodb', 'redis', 'elasticsearch', 'cassandra',
-    'oracle', 'sql server', 'sqlite', 'dynamodb', 'neo4j', 'couchdb',
-    'influxdb', 'timescaledb', 'cockroachdb', 'mariadb', 'firebase',
-    'firestore', 'supabase', 'planetscale', 'prisma', 'sequelize', 'typeorm'
-]
 
-# Cloud Platforms
-CLOUD_PLATFORMS = [
-    'aws', 'azure', 'google cloud', 'gcp', 'heroku', 'digitalocean', 'linode',
-    'vultr', 'cloudflare', 'vercel', 'netlify', 'render', 'fly.io', 'railway',
-    'aws ec2', 'aws s3', 'aws lambda', 'aws rds', 'aws dynamodb', 'aws ecs',
-    'aws eks', 'azure app service', 'azure functions', 'azure cosmos db',
-    'gcp compute engine', 'gcp cloud functions', 'gcp cloud sql', 'kubernetes',
-    'docker', 'docker compose', 'terraform', 'ansible', 'jenkins', 'gitlab ci',
-    'github actions', 'circleci', 'travis ci', 'azure devops'
-]
+class TaxonomyError(ValueError):
+    """
+    Raised when a taxonomy file is malformed or ambiguous
+    """
 
-# DevOps & Tools
-DEVOPS_TOOLS = [
-    'git', 'github', 'gitlab', 'bitbucket', 'svn', 'mercurial', 'jenkins',
-    'gitlab ci', 'github actions', 'circleci', 'travis ci', 'azure devops',
-    'jira', 'confluence', 'trello', 'asana', 'notion', 'slack', 'microsoft teams',
-    'docker', 'kubernetes', 'helm', 'istio', 'linkerd', 'prometheus', 'grafana',
-    'elk stack', 'splunk', 'datadog', 'new relic', 'sentry', 'logstash', 'kibana'
-]
 
-# Data Science & ML
-DATA_SCIENCE_ML = [
-    'machine learning', 'deep learning', 'neural networks', 'tensorflow', 'pytorch',
-    'keras', 'scikit-learn', 'pandas', 'numpy', 'matplotlib', 'seaborn', 'plotly',
-    'jupyter', 'colab', 'spark', 'hadoop', 'hive', 'pig', 'airflow', 'prefect',
-    'mlflow', 'kubeflow', 'opencv', 'nltk', 'spacy', 'transformers', 'bert',
-    'gpt', 'llm', 'langchain', 'openai', 'computer vision', 'nlp'
-]
+def normalize_skill(name: str) -> str:
+    """
+    Lowercases a skill name and collapses its whitespace
+    """
+    return ' '.join(str(name).lower().split())
 
-# Testing Frameworks
-TESTING_FRAMEWORKS = [
-    'pytest', 'unittest', 'nose', 'junit', 'testng', 'jest', 'mocha', 'chai',
-    'cypress', 'selenium', 'playwright', 'puppeteer', 'karma', 'jasmine',
-    'rspec', 'phpunit', 'xunit', 'nunit', 'gtest', 'cucumber', 'behave',
-    'robot framework', 'postman', 'insomnia', 'rest assured', 'karate'
-]
 
-# Mobile Development
-MOBILE_TECH = [
-    'react native', 'flutter', 'ionic', 'xamarin', 'swift', 'kotlin', 'objective-c',
-    'android studio', 'xcode', 'appium', 'expo', 'firebase', 'onesignal',
-    'push notifications', 'in-app purchases', 'mobile ui', 'mobile ux'
-]
+class Taxonomy:
+    """
+    One compiled version of the skill taxonomy.
 
-# Other Technologies
-OTHER_TECH = [
-    'linux', 'unix', 'windows', 'macos', 'bash scripting', 'powershell',
-    'api design', 'oauth', 'jwt', 'oauth2', 'openid connect', 'saml',
-    'ldap', 'active directory', 'nginx', 'apache', 'iis', 'load balancing',
-    'cdn', 'ssl', 'tls', 'https', 'dns', 'tcp/ip', 'http', 'rest', 'soap',
-    'xml', 'json', 'yaml', 'toml', 'csv', 'excel', 'power bi', 'tableau',
-    'looker', 'metabase', 'superset'
-]
+    Every surface form (canonical name or alias) maps to one canonical
+    skill, and the matchers are built over all surface forms. Instances are
+    never modified after construction, so a request can keep using the one
+    it started with while a reload swaps in the next version.
+    """
+
+    def __init__(self, data: Dict, fingerprint: str = ''):
+        """
+        Args:
+            data: Parsed taxonomy file: {'version', 'skills': [{'name',
+                'category', 'aliases'}]}
+            fingerprint: Hash of the sources it was compiled from
+
+        Raises:
+            TaxonomyError: If the data is malformed, or a surface form is
+                claimed by two skills
+        """
+        self.version = str(data.get('version') or '')
+        entries = data.get('skills')
+        if not self.version or not isinstance(entries, list):
+            raise TaxonomyError("A taxonomy needs a 'version' and a list of 'skills'")
+
+        self.categories: Dict[str, str] = {}
+        # Surface form (canonical name included) -> canonical name
+        self.aliases: Dict[str, str] = {}
+        for entry in entries:
+            name = normalize_skill(entry.get('name', '')) if isinstance(entry, dict) else ''
+            if not name:
+                raise TaxonomyError(f"Skill without a name: {entry!r}")
+            if name in self.categories:
+                raise TaxonomyError(f"Duplicate skill '{name}'")
+            self.categories[name] = entry.get('category') or 'other'
+
+            for surface in [name, *(normalize_skill(alias) for alias in entry.get('aliases', []))]:
+                owner = self.aliases.get(surface)
+                if owner is not None and owner != name:
+                    raise TaxonomyError(f"'{surface}' belongs to both '{owner}' and '{name}'")
+                if surface:
+                    self.aliases[surface] = name
+
+        # Stable integer id per skill: its position in alphabetical order, so
+        # the same taxonomy gives the same ids in every process and ascending
+        # ids list skills alphabetically
+        self.skills: List[str] = sorted(self.categories)
+        self.skill_ids: Dict[str, int] = {skill: skill_id for skill_id, skill in enumerate(self.skills)}
+
+        surfaces = sorted(self.aliases)
+        self.matcher = SkillMatcher(surfaces)
+        self.phrase_index = SkillPhraseIndex(surfaces)
+        self.fuzzy_index = FuzzySkillIndex(surfaces)
+        self.fingerprint = fingerprint
+
+    def __len__(self) -> int:
+        return len(self.skills)
+
+    def canonical(self, name: str) -> Optional[str]:
+        """
+        Canonical name of a skill or alias, or None if it is unknown
+        """
+        return self.aliases.get(normalize_skill(name))
+
+    def canonicalize(self, names: Iterable[str]) -> List[str]:
+        """
+        Canonical names of the known skills among names (unique, sorted)
+        """
+        aliases = self.aliases
+        return sorted({aliases[name] for name in map(normalize_skill, names) if name in aliases})
+
+    def find_skills(self, text_lower: str) -> Set[str]:
+        """
+        Canonical names of every skill or alias found in a lowercased text
+        """
+        aliases = self.aliases
+        return {aliases[surface] for surface in self.matcher.find_skills(text_lower)}
+
+    def find_skills_fuzzy(self, text_lower: str, min_lengths: Tuple[int, ...] = (8, 12)) -> Dict[str, float]:
+        """
+        Canonical names of the skills found approximately in a lowercased text,
+        with their best confidence (see FuzzySkillIndex.find_skills)
+        """
+        aliases = self.aliases
+        found: Dict[str, float] = {}
+        for surface, confidence in self.fuzzy_index.find_skills(text_lower, min_lengths).items():
+            skill = aliases[surface]
+            if confidence > found.get(skill, 0.0):
+                found[skill] = confidence
+        return found
+
+    def lookup_phrase(self, phrase: str, reverse: bool = True) -> Set[str]:
+        """
+        Canonical names of the skills in a phrase (see SkillPhraseIndex.lookup)
+        """
+        aliases = self.aliases
+        return {aliases[surface] for surface in self.phrase_index.lookup(phrase, reverse=reverse)}
+
+    def skills_by_category(self) -> Dict[str, List[str]]:
+        """
+        Category -> canonical skills (sorted)
+        """
+        grouped: Dict[str, List[str]] = {}
+        for skill in self.skills:
+            grouped.setdefault(self.categories[skill], []).append(skill)
+        return grouped
+
+    def info(self) -> Dict:
+        """
+        Version, number of skills and aliases, and short fingerprint
+        """
+        return {
+            'version': self.version,
+            'skills': len(self.skills),
+            'aliases': len(self.aliases) - len(self.skills),
+            'fingerprint': self.fingerprint[:12]
+        }
+
+
+def _fingerprint(taxonomy_bytes: bytes) -> str:
+    digest = hashlib.sha256(taxonomy_bytes)
+    for path in _CODE_SOURCES:
+        with open(path, 'rb') as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+
+def compile_taxonomy(path: str = TAXONOMY_PATH) -> Taxonomy:
+    """
+    Reads and compiles a taxonomy file
+
+    Args:
+        path: Taxonomy JSON file
+
+    Returns:
+        Compiled Taxonomy
+
+    Raises:
+        TaxonomyError: If the file is malformed
+    """
+    with open(path, 'rb') as f:
+        raw = f.read()
+    try:
+        data = json.loads(raw)
+    except ValueError as e:
+        raise TaxonomyError(f"{path} is not valid JSON: {str(e)}")
+    if not isinstance(data, dict):
+        raise TaxonomyError(f"{path} must contain a JSON object")
+    return Taxonomy(data, _fingerprint(raw))
+
+
+def build_artifact(taxonomy_path: str = TAXONOMY_PATH, output: str = TAXONOMY_ARTIFACT_PATH) -> Taxonomy:
+    """
+    Compiles a taxonomy file and writes the result to output (atomically, so
+    running processes never read a partial file)
+    """
+    taxonomy = compile_taxonomy(taxonomy_path)
+    tmp_path = f'{output}.{os.getpid()}.tmp'
+    with open(tmp_path, 'wb') as f:
+        pickle.dump(taxonomy, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_path, output)
+    return taxonomy
+
+
+def load_artifact(path: str = TAXONOMY_ARTIFACT_PATH, taxonomy_path: str = TAXONOMY_PATH) -> Optional[Taxonomy]:
+    """
+    Reads a compiled taxonomy
+
+    The artifact is unpickled, which runs code: only point this at a file
+    built by this module on the same deployment, never at one from outside.
+
+    Returns:
+        The Taxonomy, or None when the artifact is missing, unreadable or was
+        compiled from another version of the taxonomy file or the code
+    """
+    try:
+        with open(path, 'rb') as f:
+            taxonomy = pickle.load(f)
+        with open(taxonomy_path, 'rb') as f:
+            current = _fingerprint(f.read())
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+        return None
+    if not isinstance(taxonomy, Taxonomy) or taxonomy.fingerprint != current:
+        return None
+    return taxonomy
+
+
+def load_taxonomy(taxonomy_path: str = TAXONOMY_PATH, artifact_path: str = TAXONOMY_ARTIFACT_PATH) -> Taxonomy:
+    """
+    Loads the compiled artifact, or compiles the taxonomy file when the
+    artifact is missing or stale
+    """
+    taxonomy = load_artifact(artifact_path, taxonomy_path)
+    if taxonomy is None:
+        if os.path.exists(artifact_path):
+            print(f"Skill taxonomy artifact {artifact_path} is stale, compiling {taxonomy_path} instead "
+                  f"(run python -m modules.skill_db build)")
+        taxonomy = compile_taxonomy(taxonomy_path)
+    return taxonomy
+
+
+def _files_state() -> Tuple:
+    state = []
+    for path in (TAXONOMY_PATH, TAXONOMY_ARTIFACT_PATH):
+        try:
+            stat = os.stat(path)
+            state.append((stat.st_mtime_ns, stat.st_size))
+        except OSError:
+            state.append(None)
+    return tuple(state)
+
+
+# Current taxonomy, and what its files looked like when it was loaded
+_taxonomy = load_taxonomy()
+_taxonomy_state = _files_state()
+_last_check = time.monotonic()
+_reload_requested = False
+_reload_lock = threading.Lock()
+
+
+def _reload(state: Tuple) -> bool:
+    global _taxonomy, _taxonomy_state
+    try:
+        taxonomy = load_taxonomy()
+    except (OSError, ValueError) as e:
+        print(f"Error reloading skill taxonomy: {str(e)}")
+        # Keep serving the current version; retry once the files change again
+        _taxonomy_state = state
+        return False
+    _taxonomy_state = state
+    # A single assignment: callers see the old or the new version, never a mix
+    _taxonomy = taxonomy
+    return True
+
+
+def reload_taxonomy() -> bool:
+    """
+    Loads the taxonomy again and swaps it in
+
+    Returns:
+        Whether the new version loaded (the current one is kept otherwise)
+    """
+    global _last_check
+    with _reload_lock:
+        _last_check = time.monotonic()
+        return _reload(_files_state())
+
+
+def _check_reload():
+    global _last_check, _reload_requested
+    # One caller checks; the others carry on with the current version
+    if not _reload_lock.acquire(blocking=False):
+        return
+    try:
+        requested = _reload_requested
+        _reload_requested = False
+        _last_check = time.monotonic()
+        state = _files_state()
+        if requested or state != _taxonomy_state:
+            _reload(state)
+    finally:
+        _reload_lock.release()
+
+
+def get_taxonomy() -> Taxonomy:
+    """
+    Returns the current taxonomy, reloading it first if its files changed
+    (checked at most every TAXONOMY_RELOAD_INTERVAL seconds) or a reload
+    signal arrived
+
+    Fetch it once per document or request and use that object throughout,
+    so every step sees the same version.
+    """
+    if _reload_requested or (
+        TAXONOMY_RELOAD_INTERVAL > 0 and time.monotonic() - _last_check >= TAXONOMY_RELOAD_INTERVAL
+    ):
+        _check_reload()
+    return _taxonomy
+
+
+def _request_reload(signum, frame):
+    global _reload_requested
+    # Nothing heavy in a signal handler: the next get_taxonomy() reloads
+    _reload_requested = True
+
+
+def install_reload_signal(name: str = TAXONOMY_RELOAD_SIGNAL) -> bool:
+    """
+    Reloads the taxonomy after the named signal (e.g. 'SIGHUP')
+
+    Must be called from the main thread; gunicorn resets signal handlers in
+    each worker, so gunicorn.conf.py calls it again after the fork.
+
+    Returns:
+        Whether the handler was installed
+    """
+    if not name:
+        return False
+    try:
+        signal.signal(getattr(signal, name), _request_reload)
+    except (AttributeError, ValueError) as e:
+        print(f"Error installing taxonomy reload signal {name}: {str(e)}")
+        return False
+    return True
+
+
+def get_all_skills() -> List[str]:
+    """
+    Returns the canonical names of all skills in the current taxonomy
+    """
+    return list(get_taxonomy().skills)
+
+
+# Canonical skills and their ids as of import (get_taxonomy() follows reloads)
+SKILLS_DATABASE = list(_taxonomy.skills)
+SKILLS_BY_ID = list(_taxonomy.skills)
+SKILL_IDS = dict(_taxonomy.skill_ids)
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description='Compile or inspect the skill taxonomy')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    build_parser = subparsers.add_parser('build', help='Compile the taxonomy file into the artifact')
+    build_parser.add_argument('--taxonomy', default=TAXONOMY_PATH)
+    build_parser.add_argument('--output', default=TAXONOMY_ARTIFACT_PATH)
+
+    info_parser = subparsers.add_parser('info', help='Show the compiled version and whether it is up to date')
+    info_parser.add_argument('--taxonomy', default=TAXONOMY_PATH)
+    info_parser.add_argument('--artifact', default=TAXONOMY_ARTIFACT_PATH)
+
+    args = parser.parse_args(argv)
 
+    if args.command == 'build':
+        try:
+            taxonomy = build_artifact(args.taxonomy, args.output)
+        except TaxonomyError as e:
+            print(f"Error compiling {args.taxonomy}: {str(e)}", file=sys.stderr)
+            sys.exit(1)
+        info = taxonomy.info()
+        print(f"Compiled taxonomy {info['version']}: {info['skills']} skills, {info['aliases']} aliases "
+              f"-> {args.output} ({os.path.getsize(args.output) / 1024:.1f} KB)")
+    else:
+        taxonomy = load_artifact(args.artifact, args.taxonomy)
+        if taxonomy is None:
+            print(f"{args.artifact} is missing or stale; run python -m modules.skill_db build", file=sys.stderr)
+            sys.exit(1)
+        info = taxonomy.info()
+        print(f"{args.artifact}: taxonomy {info['version']}, {info['skills']} skills, "
+              f"{info['aliases']} aliases, up to date (fingerprint {info['fingerprint']})")
 
-def get_all_skills():
-    """
-    Returns a comprehensive list of all skills
-    Normalized to lowercase for matching
-    """
-    all_skills = (
-        PROGRAMMING_LANGUAGES +
-        WEB_FRAMEWORKS +
-        FRONTEND_TECH +
-        BACKEND_TECH +
-        DATABASES +
-        CLOUD_PLATFORMS +
-        DEVOPS_TOOLS +
-        DATA_SCIENCE_ML +
-        TESTING_FRAMEWORKS +
-        MOBILE_TECH +
-        OTHER_TECH
-    )
-    
-    # Remove duplicates and normalize
-    unique_skills = list(set([skill.lower().strip() for skill in all_skills]))
-    
-    # Also add multi-word variations
-    extended_skills = unique_skills.copy()
-    
-    # Add common variations
-    variations = {
-        'python': ['python3', 'python 3'],
-        'javascript': ['js', 'ecmascript'],
-        'typescript': ['ts'],
-        'c++': ['cpp', 'c plus plus'],
-        'c#': ['csharp', 'c sharp'],
-        'html': ['html5'],
-        'css': ['css3'],
-        'react': ['reactjs', 'react.js'],
-        'angular': ['angularjs', 'angular.js'],
-        'vue': ['vuejs', 'vue.js'],
-        'node.js': ['nodejs', 'node'],
-        'aws': ['amazon web services'],
-        'gcp': ['google cloud platform'],
-        'ml': ['machine learning'],
-        'ai': ['artificial intelligence'],
-        'api': ['rest api', 'restful api'],
-        'sql': ['structured query language'],
-    }
-    
-    for key, values in variations.items():
-        if key in extended_skills:
-            extended_skills.extend(values)
-    
-    return list(set(extended_skills))
-
-
-# Export the skills list
-SKILLS_DATABASE = get_all_skills()
 
+if __name__ == '__main__':
+    # Run the imported module's main, so pickled Taxonomy objects refer to
+    # modules.skill_db rather than __main__
+    from modules.skill_db import main as skill_db_main
+    skill_db_main()
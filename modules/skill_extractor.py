@@ -3,97 +3,253 @@ Skill Extractor Module
 Uses spaCy NLP to extract skills from resume text
 """
 
-import spacy
 import re
-from typing import List, Set
-from modules.skill_db import SKILLS_DATABASE
+from typing import Dict, Iterable, List, Optional, Set
+from modules.skill_db import Taxonomy, get_taxonomy
+from modules.metrics import timed
+from config import (
+    SPACY_MODEL,
+    SKILL_EXTRACTION_MODE,
+    SPACY_BATCH_SIZE,
+    SKILL_PHRASE_REVERSE_MATCH,
+    SKILL_FUZZY_MIN_LENGTHS
+)
 
 
-# Load spaCy model (will be loaded on first use)
-_nlp_model = None
+# spaCy components excluded by each pipeline profile.
+# Skill extraction only uses is_stop, is_alpha and noun_chunks; noun chunks
+# need the tagger, attribute ruler and parser, but never NER or lemmas.
+SPACY_PIPELINE_PROFILES = {
+    'full': [],
+    'minimal': ['ner', 'lemmatizer'],
+}
 
+# Extraction mode that skips spaCy and relies on the vocabulary matcher only
+VOCABULARY_MODE = 'vocab'
 
-def load_spacy_model():
+# Loaded spaCy models per profile (each is loaded on first use)
+_nlp_models = {}
+
+
+def load_spacy_model(profile: Optional[str] = None):
     """
-    Loads the spaCy English model
+    Loads the spaCy English model with the components of a pipeline profile
     Uses lazy loading to avoid loading on import
+    
+    Args:
+        profile: Key of SPACY_PIPELINE_PROFILES (defaults to SKILL_EXTRACTION_MODE)
+        
+    Returns:
+        Loaded spaCy Language object
     """
-    global _nlp_model
-    if _nlp_model is None:
+    profile = profile or SKILL_EXTRACTION_MODE
+    if profile not in SPACY_PIPELINE_PROFILES:
+        raise ValueError(
+            f"Unknown spaCy pipeline profile '{profile}'. "
+            f"Expected one of: {', '.join(SPACY_PIPELINE_PROFILES)}"
+        )
+    
+    if profile not in _nlp_models:
+        # spaCy takes about a second to import, so only load it when a
+        # model is actually needed (never in vocab mode)
+        import spacy
         try:
-            _nlp_model = spacy.load("en_core_web_sm")
+            _nlp_models[profile] = spacy.load(SPACY_MODEL, exclude=SPACY_PIPELINE_PROFILES[profile])
         except OSError:
             raise Exception(
-                "spaCy model 'en_core_web_sm' not found. "
-                "Please install it using: python -m spacy download en_core_web_sm"
+                f"spaCy model '{SPACY_MODEL}' not found. "
+                f"Please install it using: python -m spacy download {SPACY_MODEL}"
             )
-    return _nlp_model
+    return _nlp_models[profile]
+
+
+def _add_fuzzy_skills(matched_skills: Set[str], text_lower: str, taxonomy: Taxonomy):
+    """
+    Adds the skills found with typos, split words or other punctuation
+    """
+    with timed('fuzzy'):
+        matched_skills.update(taxonomy.find_skills_fuzzy(text_lower, SKILL_FUZZY_MIN_LENGTHS))
+
+
+def _skills_from_doc(doc, text_lower: str, taxonomy: Taxonomy, fuzzy: bool = False) -> List[str]:
+    """
+    Combines vocabulary matches with spaCy tokens and noun phrases
+    
+    Args:
+        doc: spaCy Doc of the lowercased text
+        text_lower: Lowercased text
+        taxonomy: Skill taxonomy to match against
+        fuzzy: Also match skills approximately
+        
+    Returns:
+        List of extracted skills (unique, sorted)
+    """
+    # Extract tokens and phrases
+    tokens = [token.text.lower().strip() for token in doc if not token.is_stop and token.is_alpha]
+    
+    # Extract noun phrases (often contain skill names)
+    noun_phrases = [chunk.text.lower().strip() for chunk in doc.noun_chunks]
+    
+    # Find matching skills in a single pass over the text
+    # (word boundaries for single words, flexible matching for phrases)
+    with timed('vocab'):
+        matched_skills = taxonomy.find_skills(text_lower)
+    
+    # Also check tokens directly (skill names and aliases)
+    aliases = taxonomy.aliases
+    for token in tokens:
+        if token in aliases:
+            matched_skills.add(aliases[token])
+    
+    # Check noun phrases
+    for phrase in noun_phrases:
+        # Skills inside the phrase, and optionally skills containing the phrase
+        matched_skills.update(taxonomy.lookup_phrase(phrase, reverse=SKILL_PHRASE_REVERSE_MATCH))
+    
+    if fuzzy:
+        _add_fuzzy_skills(matched_skills, text_lower, taxonomy)
+    
+    # Remove duplicates and return sorted list
+    return sorted(matched_skills)
 
 
-def extract_skills(resume_text: str) -> List[str]:
+def extract_skills(resume_text: str, mode: Optional[str] = None,
+                   taxonomy: Optional[Taxonomy] = None, fuzzy: bool = False) -> List[str]:
     """
     Extracts skills from resume text by matching against skills database
     
     Args:
         resume_text: Cleaned resume text (lowercase)
+        mode: 'full', 'minimal' or 'vocab' (defaults to SKILL_EXTRACTION_MODE)
+        taxonomy: Skill taxonomy (defaults to the current version)
+        fuzzy: Also add skills matched approximately (see fuzzy_only_skills)
         
     Returns:
-        List of extracted skills (unique, sorted)
+        List of extracted skills (canonical names, unique, sorted)
     """
     if not resume_text:
         return []
     
-    # Load spaCy model
-    nlp = load_spacy_model()
+    mode = mode or SKILL_EXTRACTION_MODE
+    taxonomy = taxonomy or get_taxonomy()
+    text_lower = resume_text.lower()
+    
+    # Latency-sensitive mode: vocabulary matcher only
+    if mode == VOCABULARY_MODE:
+        with timed('vocab'):
+            matched_skills = taxonomy.find_skills(text_lower)
+        if fuzzy:
+            _add_fuzzy_skills(matched_skills, text_lower, taxonomy)
+        return sorted(matched_skills)
     
     # Process text with spaCy
-    doc = nlp(resume_text.lower())
+    nlp = load_spacy_model(mode)
+    with timed('spacy'):
+        doc = nlp(text_lower)
     
-    # Extract tokens and phrases
-    tokens = [token.text.lower().strip() for token in doc if not token.is_stop and token.is_alpha]
+    return _skills_from_doc(doc, text_lower, taxonomy, fuzzy)
+
+
+def extract_skills_many(texts: Iterable[str],
+                        batch_size: int = SPACY_BATCH_SIZE,
+                        n_process: int = 1,
+                        mode: Optional[str] = None,
+                        taxonomy: Optional[Taxonomy] = None,
+                        fuzzy: bool = False) -> List[List[str]]:
+    """
+    Extracts skills from many texts, batching them through nlp.pipe
     
-    # Extract noun phrases (often contain skill names)
-    noun_phrases = [chunk.text.lower().strip() for chunk in doc.noun_chunks]
+    Args:
+        texts: Texts to analyze
+        batch_size: Number of texts buffered per spaCy batch
+        n_process: Number of spaCy worker processes
+        mode: 'full', 'minimal' or 'vocab' (defaults to SKILL_EXTRACTION_MODE)
+        taxonomy: Skill taxonomy (defaults to the current version)
+        fuzzy: Also add skills matched approximately (see fuzzy_only_skills)
+        
+    Returns:
+        List of extracted skill lists, aligned with texts
+    """
+    texts_lower = [text.lower() if text else '' for text in texts]
+    results: List[List[str]] = [[] for _ in texts_lower]
     
-    # Combine tokens and phrases
-    all_text_units = tokens + noun_phrases
+    mode = mode or SKILL_EXTRACTION_MODE
+    taxonomy = taxonomy or get_taxonomy()
+    indices = [i for i, text in enumerate(texts_lower) if text]
     
-    # Also check for multi-word skills by looking at the original text
-    text_lower = resume_text.lower()
+    if mode == VOCABULARY_MODE:
+        with timed('vocab'):
+            matched_skills = {i: taxonomy.find_skills(texts_lower[i]) for i in indices}
+        for i in indices:
+            if fuzzy:
+                _add_fuzzy_skills(matched_skills[i], texts_lower[i], taxonomy)
+            results[i] = sorted(matched_skills[i])
+        return results
+    
+    nlp = load_spacy_model(mode)
+    docs = iter(nlp.pipe((texts_lower[i] for i in indices), batch_size=batch_size, n_process=n_process))
+    for i in indices:
+        # Time spaCy separately from the vocabulary matching in _skills_from_doc
+        with timed('spacy'):
+            doc = next(docs)
+        results[i] = _skills_from_doc(doc, texts_lower[i], taxonomy, fuzzy)
+    
+    return results
+
+
+def extract_skill_confidences(resume_text: str, mode: Optional[str] = None,
+                              taxonomy: Optional[Taxonomy] = None) -> Dict[str, float]:
+    """
+    Extracts skills with a confidence score: 1.0 for skills matched exactly
+    (or by spaCy tokens and noun phrases), 1 - edits / length for skills
+    only found with typos
     
-    # Find matching skills
-    matched_skills = set()
-    
-    # Sort skills by length (longest first) to match multi-word skills first
-    sorted_skills = sorted(SKILLS_DATABASE, key=len, reverse=True)
-    
-    for skill in sorted_skills:
-        # Check if skill appears in text
-        # Use word boundaries for single words, flexible matching for phrases
-        if len(skill.split()) == 1:
-            # Single word: use word boundary
-            pattern = r'\b' + re.escape(skill) + r'\b'
-        else:
-            # Multi-word: flexible matching
-            pattern = re.escape(skill)
+    Args:
+        resume_text: Cleaned resume text (lowercase)
+        mode: 'full', 'minimal' or 'vocab' (defaults to SKILL_EXTRACTION_MODE)
+        taxonomy: Skill taxonomy (defaults to the current version)
         
-        if re.search(pattern, text_lower, re.IGNORECASE):
-            matched_skills.add(skill)
+    Returns:
+        Mapping of canonical skill name to confidence
+    """
+    if not resume_text:
+        return {}
     
-    # Also check tokens directly
-    for token in tokens:
-        if token in SKILLS_DATABASE:
-            matched_skills.add(token)
+    taxonomy = taxonomy or get_taxonomy()
+    with timed('fuzzy'):
+        confidences = taxonomy.find_skills_fuzzy(resume_text.lower(), SKILL_FUZZY_MIN_LENGTHS)
+    for skill in extract_skills(resume_text, mode=mode, taxonomy=taxonomy, fuzzy=False):
+        confidences[skill] = 1.0
+    return confidences
+
+
+def fuzzy_only_skills(resume_text: str, exact_skills: Iterable[str],
+                      taxonomy: Optional[Taxonomy] = None) -> Dict[str, float]:
+    """
+    Skills found only approximately (typos, split words or other punctuation),
+    with their confidence: 1.0 for a split or re-punctuated name, 1 - edits /
+    length for a typo
     
-    # Check noun phrases
-    for phrase in noun_phrases:
-        # Check if phrase contains a skill
-        for skill in sorted_skills:
-            if skill in phrase or phrase in skill:
-                matched_skills.add(skill)
+    Args:
+        resume_text: Cleaned resume text (lowercase)
+        exact_skills: Skills already matched exactly, left out of the result
+        taxonomy: Skill taxonomy (defaults to the current version)
+        
+    Returns:
+        Mapping of canonical skill name to confidence (two decimals), sorted by name
+    """
+    if not resume_text:
+        return {}
     
-    # Remove duplicates and return sorted list
-    return sorted(list(matched_skills))
+    taxonomy = taxonomy or get_taxonomy()
+    exact_skills = set(exact_skills)
+    with timed('fuzzy'):
+        confidences = taxonomy.find_skills_fuzzy(resume_text.lower(), SKILL_FUZZY_MIN_LENGTHS)
+    return {
+        skill: round(confidence, 2)
+        for skill, confidence in sorted(confidences.items())
+        if skill not in exact_skills
+    }
 
 
 def normalize_skill_name(skill: str) -> str:
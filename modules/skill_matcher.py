@@ -0,0 +1,576 @@
+"""
+Skill Matcher Module
+Compiled multi-pattern matcher that finds every skill in a text in one pass,
+and an approximate index for skills written with typos or other spacing
+"""
+
+from collections import Counter
+from typing import Dict, Iterable, Iterator, List, Set, Tuple
+
+
+def _is_word_char(char: str) -> bool:
+    """
+    Mirrors the definition of a word character used by Python's re module (\\w)
+    """
+    return char.isalnum() or char == '_'
+
+
+class SkillMatcher:
+    """
+    Aho-Corasick automaton built from a skills vocabulary.
+
+    A skill without whitespace only matches when it sits on word boundaries,
+    exactly like the regular expression r'\\b' + re.escape(skill) + r'\\b'.
+    Multi-word skills match anywhere in the text, like re.escape(skill).
+    This keeps tricky names such as 'c++', 'c#', '.net' and 'node.js'
+    behaving the same way as the previous per-skill regex loop.
+    """
+
+    def __init__(self, skills: Iterable[str]):
+        """
+        Builds the automaton
+
+        Args:
+            skills: Skill names (lowercase)
+        """
+        self.skills: List[str] = []
+        # Per pattern: (length, check start boundary, first char is word, check end boundary, last char is word)
+        self._patterns: List[Tuple[int, bool, bool, bool, bool]] = []
+
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[List[int]] = [[]]
+
+        for skill in dict.fromkeys(skills):
+            if not skill:
+                continue
+            self._add_pattern(skill)
+
+        self._build_failure_links()
+
+    def _add_pattern(self, skill: str):
+        pattern_id = len(self.skills)
+        self.skills.append(skill)
+
+        single_word = len(skill.split()) == 1
+        self._patterns.append((
+            len(skill),
+            single_word,
+            _is_word_char(skill[0]),
+            single_word,
+            _is_word_char(skill[-1]),
+        ))
+
+        state = 0
+        for char in skill:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][char] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            state = next_state
+        self._out[state].append(pattern_id)
+
+    def _build_failure_links(self):
+        queue = list(self._goto[0].values())
+        head = 0
+        while head < len(queue):
+            state = queue[head]
+            head += 1
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(char, 0)
+                self._fail[next_state] = target if target != next_state else 0
+                self._out[next_state] = self._out[next_state] + self._out[self._fail[next_state]]
+
+    def __len__(self) -> int:
+        return len(self.skills)
+
+    def finditer(self, text: str) -> Iterator[Tuple[int, int, str]]:
+        """
+        Finds every skill occurrence in a single pass over the text
+
+        Args:
+            text: Text to scan (matched case-insensitively)
+
+        Yields:
+            (start, end, skill) tuples, with offsets into text.lower()
+        """
+        if not text:
+            return
+
+        text = text.lower()
+        text_length = len(text)
+        goto = self._goto
+        fail = self._fail
+        out = self._out
+        patterns = self._patterns
+        skills = self.skills
+
+        state = 0
+        for index, char in enumerate(text):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if not out[state]:
+                continue
+
+            end = index + 1
+            for pattern_id in out[state]:
+                length, check_start, first_is_word, check_end, last_is_word = patterns[pattern_id]
+                start = end - length
+                if check_start:
+                    before_is_word = start > 0 and _is_word_char(text[start - 1])
+                    if before_is_word == first_is_word:
+                        continue
+                if check_end:
+                    after_is_word = end < text_length and _is_word_char(text[end])
+                    if after_is_word == last_is_word:
+                        continue
+                yield start, end, skills[pattern_id]
+
+    def count(self, text: str) -> Dict[str, int]:
+        """
+        Counts occurrences of every skill found in the text
+
+        Args:
+            text: Text to scan
+
+        Returns:
+            Mapping of skill to number of occurrences
+        """
+        return dict(Counter(skill for _, _, skill in self.finditer(text)))
+
+    def find_skills(self, text: str) -> Set[str]:
+        """
+        Returns the set of distinct skills found in the text
+
+        Args:
+            text: Text to scan
+
+        Returns:
+            Set of matched skills
+        """
+        return {skill for _, _, skill in self.finditer(text)}
+
+
+# Punctuation stripped from the edges of phrase tokens (keeps c++, c#, .net intact)
+_PHRASE_PUNCTUATION = ',;:!?()[]{}"\''
+
+
+def phrase_tokens(text: str) -> Tuple[str, ...]:
+    """
+    Splits a phrase or skill name into lowercase whitespace tokens
+
+    Args:
+        text: Phrase or skill name
+
+    Returns:
+        Tuple of tokens with surrounding punctuation removed
+    """
+    tokens = (token.strip(_PHRASE_PUNCTUATION) for token in text.lower().split())
+    return tuple(token for token in tokens if token)
+
+
+class SkillPhraseIndex:
+    """
+    Precomputed index resolving phrase/skill containment by lookup.
+
+    Every skill is indexed by its full token sequence and by each contiguous
+    token n-gram it contains, so both directions of containment cost a number
+    of dictionary lookups proportional to the phrase length, independent of
+    the vocabulary size:
+
+    - skill inside phrase: each token n-gram of the phrase is looked up in
+      the exact skill table
+    - phrase inside skill: the phrase token sequence is looked up in the
+      n-gram postings
+
+    Containment is token-aligned, so the phrase 'c' matches the skill 'c'
+    but no longer every skill that merely contains the letter c.
+    """
+
+    def __init__(self, skills: Iterable[str]):
+        """
+        Builds the index
+
+        Args:
+            skills: Skill names (lowercase)
+        """
+        self._skills_by_tokens: Dict[Tuple[str, ...], str] = {}
+        self._skills_by_ngram: Dict[Tuple[str, ...], Set[str]] = {}
+        self.max_skill_tokens = 0
+
+        for skill in skills:
+            tokens = phrase_tokens(skill)
+            if not tokens:
+                continue
+            self._skills_by_tokens.setdefault(tokens, skill)
+            self.max_skill_tokens = max(self.max_skill_tokens, len(tokens))
+            for start in range(len(tokens)):
+                for end in range(start + 1, len(tokens) + 1):
+                    self._skills_by_ngram.setdefault(tokens[start:end], set()).add(skill)
+
+    def __len__(self) -> int:
+        return len(self._skills_by_tokens)
+
+    def lookup(self, phrase: str, reverse: bool = True) -> Set[str]:
+        """
+        Finds skills contained in a phrase, and optionally skills containing it
+
+        Args:
+            phrase: Noun phrase or any short text
+            reverse: Also return skills that contain the whole phrase
+
+        Returns:
+            Set of matched skills
+        """
+        tokens = phrase_tokens(phrase)
+        if not tokens:
+            return set()
+
+        found = set()
+        token_count = len(tokens)
+        for start in range(token_count):
+            stop = min(token_count, start + self.max_skill_tokens)
+            for end in range(start + 1, stop + 1):
+                skill = self._skills_by_tokens.get(tokens[start:end])
+                if skill is not None:
+                    found.add(skill)
+
+        if reverse:
+            found.update(self._skills_by_ngram.get(tokens, ()))
+
+        return found
+
+
+def fuzzy_key(text: str) -> str:
+    """
+    Key of a skill name or text window for approximate matching
+
+    Spacing and punctuation are dropped, since mangled text splits and joins
+    words freely ('kuber netes', 'node js', 'nodejs' for 'node.js'), but '+'
+    and '#' are kept so c, c++ and c# stay apart.
+
+    Args:
+        text: Skill name or text
+
+    Returns:
+        Lowercase key of letters, digits, '+' and '#'
+    """
+    return ''.join(char for char in text.lower() if char.isalnum() or char in '+#')
+
+
+def edit_distance(a: str, b: str, limit: int) -> int:
+    """
+    Optimal string alignment distance (insertions, deletions, substitutions
+    and transpositions of adjacent characters), computed only as far as limit
+
+    Args:
+        a: First string
+        b: Second string
+        limit: Largest distance of interest
+
+    Returns:
+        The distance, or limit + 1 if it is larger than limit
+    """
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    # A common prefix and suffix add nothing: only the rest is compared
+    start = 0
+    while start < len(a) and start < len(b) and a[start] == b[start]:
+        start += 1
+    end_a, end_b = len(a), len(b)
+    while end_a > start and end_b > start and a[end_a - 1] == b[end_b - 1]:
+        end_a -= 1
+        end_b -= 1
+    a, b = a[start:end_a], b[start:end_b]
+    if not a or not b:
+        return max(len(a), len(b))
+
+    previous_previous = None
+    previous = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        row_minimum = i
+        for j in range(1, len(b) + 1):
+            value = previous[j - 1] if a[i - 1] == b[j - 1] else previous[j - 1] + 1
+            if previous[j] + 1 < value:
+                value = previous[j] + 1
+            if current[j - 1] + 1 < value:
+                value = current[j - 1] + 1
+            if (i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]
+                    and previous_previous[j - 2] + 1 < value):
+                value = previous_previous[j - 2] + 1
+            current[j] = value
+            if value < row_minimum:
+                row_minimum = value
+        if row_minimum > limit:
+            return limit + 1
+        previous_previous, previous = previous, current
+    return previous[-1] if previous[-1] <= limit else limit + 1
+
+
+def _deletes(text: str, distance: int) -> Set[str]:
+    """
+    Every string made by deleting up to distance characters from text (text included)
+    """
+    found = {text}
+    frontier = {text}
+    for _ in range(distance):
+        frontier = {item[:i] + item[i + 1:] for item in frontier for i in range(len(item))}
+        found |= frontier
+    return found
+
+
+# Shortest word of a multi-word skill that may contain an edit
+_MIN_EDITED_WORD_LENGTH = 4
+
+# Prefixes whose candidates FuzzySkillIndex keeps (the cache starts over beyond that)
+_CANDIDATE_CACHE_MAX_ENTRIES = 50000
+
+
+class FuzzySkillIndex:
+    """
+    Symmetric deletion index (as in SymSpell) for typo- and variant-tolerant
+    skill matching.
+
+    Every skill's fuzzy_key is stored under each string obtained by deleting
+    up to max_distance characters from its first prefix_length characters.
+    Looking up a window of text deletes characters from its key the same way,
+    so the candidates within the edit budget come from a few dictionary
+    lookups instead of a distance computation per skill; only those few are
+    then checked with edit_distance.
+
+    Text is scanned in windows of consecutive words joined into one key:
+    - split words ('kuber netes') and punctuation variants ('node js') match
+      when the joined key is exactly a skill's key
+    - typos ('postgressql', 'tensorfow') match within an edit budget that
+      grows with the length of the shorter key, since short words are too
+      close to ordinary English to allow edits; in a multi-word skill each
+      word with an edit must be long enough to tell apart ('machine lerning')
+    """
+
+    def __init__(self, skills: Iterable[str], max_distance: int = 2, prefix_length: int = 7):
+        """
+        Builds the index
+
+        Args:
+            skills: Skill names (lowercase)
+            max_distance: Largest edit budget lookups can use
+            prefix_length: Characters of each key the deletions are made from
+        """
+        self.max_distance = max_distance
+        self.prefix_length = prefix_length
+        # Key -> skills with that key (e.g. 'node.js' and 'nodejs'), and the
+        # keys of each skill's words, split at spaces and punctuation or at
+        # spaces only ('in app purchases', 'in-app purchases')
+        self._skills_by_key: Dict[str, List[str]] = {}
+        self._word_keys: Dict[str, Set[Tuple[str, ...]]] = {}
+        # Prefix with deletions -> keys
+        self._keys_by_delete: Dict[str, Set[str]] = {}
+        self.max_words = 1
+        self.max_key_length = 0
+        self._cache: Dict[Tuple[str, int], Dict[int, Tuple[str, ...]]] = {}
+        self._budget_tables: Dict[Tuple[int, ...], Tuple[int, ...]] = {}
+
+        for skill in skills:
+            key = fuzzy_key(skill)
+            if not key:
+                continue
+            self._skills_by_key.setdefault(key, []).append(skill)
+            parts = tuple(''.join(char if char.isalnum() or char in '+#' else ' ' for char in skill).split())
+            self._word_keys[skill] = {parts, tuple(filter(None, map(fuzzy_key, skill.split())))}
+            # One word more than the longest skill, for a split word in it
+            self.max_words = max(self.max_words, len(parts) + 1)
+            self.max_key_length = max(self.max_key_length, len(key))
+
+        for key in self._skills_by_key:
+            for deleted in _deletes(key[:prefix_length], max_distance):
+                self._keys_by_delete.setdefault(deleted, set()).add(key)
+
+    def __getstate__(self):
+        # Candidates are cached again in each process, never pickled
+        state = self.__dict__.copy()
+        state['_cache'] = {}
+        return state
+
+    def __len__(self) -> int:
+        return len(self._skills_by_key)
+
+    def budget(self, length: int, min_lengths: Tuple[int, ...]) -> int:
+        """
+        Edits allowed between keys whose shorter one has the given length:
+        min_lengths[d - 1] is the shortest length allowed d edits (capped at
+        max_distance)
+        """
+        return sum(length >= minimum for minimum in min_lengths[:self.max_distance])
+
+    def _budgets(self, min_lengths: Tuple[int, ...]) -> Tuple[int, ...]:
+        """
+        budget of every length up to the longest window, cached per min_lengths
+        """
+        budgets = self._budget_tables.get(min_lengths)
+        if budgets is None:
+            longest = self.max_key_length + self.max_distance
+            budgets = self._budget_tables[min_lengths] = tuple(
+                self.budget(length, min_lengths) for length in range(longest + 1)
+            )
+        return budgets
+
+    def _candidates(self, prefix: str, budget: int) -> Dict[int, Tuple[str, ...]]:
+        """
+        Skill keys sharing a deletion with a prefix (up to budget characters
+        deleted), by length; cached, since windows starting with the same
+        word mostly share their prefix
+        """
+        cache_key = (prefix, budget)
+        candidates = self._cache.get(cache_key)
+        if candidates is None:
+            found = set()
+            keys_by_delete = self._keys_by_delete
+            for deleted in _deletes(prefix, budget):
+                found.update(keys_by_delete.get(deleted, ()))
+            by_length: Dict[int, List[str]] = {}
+            for key in found:
+                by_length.setdefault(len(key), []).append(key)
+            candidates = {length: tuple(keys) for length, keys in by_length.items()}
+            if len(self._cache) >= _CANDIDATE_CACHE_MAX_ENTRIES:
+                self._cache.clear()
+            self._cache[cache_key] = candidates
+        return candidates
+
+    def lookup(self, key: str, min_lengths: Tuple[int, ...] = (8, 12)) -> List[Tuple[str, int]]:
+        """
+        Finds the skill keys nearest to a key, within the edit budget
+
+        Args:
+            key: fuzzy_key of a text window
+            min_lengths: See budget
+
+        Returns:
+            (skill key, distance) tuples: the key itself when it is a skill,
+            otherwise every skill key at the smallest distance found
+        """
+        if key in self._skills_by_key:
+            return [(key, 0)]
+        budgets = self._budgets(min_lengths)
+        length = len(key)
+        # The budget of the shorter key is at most that of this one
+        budget = budgets[min(length, len(budgets) - 1)]
+        if not budget:
+            return []
+
+        best = budget + 1
+        found = []
+        candidates = self._candidates(key[:self.prefix_length], budget)
+        for candidate_length in range(length - budget, length + budget + 1):
+            for candidate in candidates.get(candidate_length, ()):
+                limit = min(best, budgets[min(length, candidate_length, len(budgets) - 1)])
+                distance = edit_distance(key, candidate, limit)
+                if distance > limit:
+                    continue
+                if distance < best:
+                    best, found = distance, [(candidate, distance)]
+                else:
+                    found.append((candidate, distance))
+        return found
+
+    def _words_match(self, window_keys: List[str], skill: str, distance: int) -> bool:
+        """
+        Whether a window of words can stand for a skill found at the given
+        distance from their joined key
+        """
+        if len(window_keys) == 1:
+            return True
+        for skill_keys in self._word_keys[skill]:
+            # Word for word: other punctuation ('next js', 'c sharp'), or a
+            # typo ('machine lerning') that the rest of the skill backs up,
+            # but not in a word too short to tell apart ('are functions')
+            if len(skill_keys) == len(window_keys) and all(
+                word == skill_word or min(len(word), len(skill_word)) >= _MIN_EDITED_WORD_LENGTH
+                for word, skill_word in zip(window_keys, skill_keys)
+            ):
+                return True
+        # Split or joined words are no edit, but words of one or two
+        # characters ('i is', 'f #') join into too many short skill names
+        return distance == 0 and all(len(word) > 2 for word in window_keys)
+
+    def finditer(self, text: str, min_lengths: Tuple[int, ...] = (8, 12)) -> Iterator[Tuple[int, int, str, int]]:
+        """
+        Finds approximate skill occurrences in windows of consecutive words
+
+        Args:
+            text: Text to scan (matched case-insensitively)
+            min_lengths: See budget
+
+        Yields:
+            (start, end, skill, distance) tuples, with offsets into text
+        """
+        words = []
+        keys: Dict[str, str] = {}
+        position = 0
+        for word in text.split():
+            # Only whitespace lies between the previous word and this one
+            start = text.find(word, position)
+            position = start + len(word)
+            key = keys.get(word)
+            if key is None:
+                key = keys[word] = fuzzy_key(word)
+            if key:
+                words.append((start, position, key))
+
+        skills_by_key = self._skills_by_key
+        prefix_length = self.prefix_length
+        longest = self.max_key_length + self.max_distance
+        widest = self._budgets(min_lengths)[longest]
+        shortest = min_lengths[0] if widest else longest + 1
+        for first in range(len(words)):
+            key = ''
+            stop = longest
+            # Candidates of the window prefix, fixed once the key is that long
+            candidates = None
+            for last in range(first, min(first + self.max_words, len(words))):
+                key += words[last][2]
+                if len(key) > stop:
+                    break
+                if candidates is None and len(key) >= prefix_length:
+                    # Longer windows from here share this prefix, so its
+                    # candidates bound what they can match
+                    candidates = self._candidates(key[:prefix_length], widest)
+                    if not candidates:
+                        break
+                    stop = max(candidates) + widest
+                    if len(key) > stop:
+                        break
+                if len(key) < shortest and key not in skills_by_key:
+                    continue
+                for skill_key, distance in self.lookup(key, min_lengths):
+                    for skill in skills_by_key[skill_key]:
+                        window_keys = [word[2] for word in words[first:last + 1]]
+                        if self._words_match(window_keys, skill, distance):
+                            yield words[first][0], words[last][1], skill, distance
+
+    def find_skills(self, text: str, min_lengths: Tuple[int, ...] = (8, 12)) -> Dict[str, float]:
+        """
+        Skills found approximately in the text, with a confidence score
+
+        Args:
+            text: Text to scan
+            min_lengths: See budget
+
+        Returns:
+            Mapping of skill to its best confidence: 1 - distance / key
+            length (1.0 when only spacing or punctuation differ)
+        """
+        found: Dict[str, float] = {}
+        for _, _, skill, distance in self.finditer(text, min_lengths):
+            confidence = 1 - distance / len(fuzzy_key(skill))
+            if confidence > found.get(skill, 0.0):
+                found[skill] = confidence
+        return found
@@ -0,0 +1,247 @@
+"""
+TF-IDF Model Module
+Fits a TF-IDF model once on a reference corpus, persists it and scores with transform only
+
+Usage:
+    python -m modules.tfidf_model fit <corpus dir or file> [...] [--output PATH]
+    python -m modules.tfidf_model info [--model PATH]
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+from config import TFIDF_MODEL_PATH, TFIDF_MAX_FEATURES
+
+
+# Vectorizer settings shared with the per-request TF-IDF fit in matcher.py
+VECTORIZER_PARAMS = {
+    'ngram_range': (1, 3),  # Unigrams, bigrams, and trigrams
+    'stop_words': 'english',
+    'lowercase': True,
+    'strip_accents': 'unicode'
+}
+
+# Loaded model (loaded on first use, None when no model file exists)
+_tfidf_model = None
+_tfidf_model_loaded = False
+
+
+class TfidfModel:
+    """
+    Corpus-fitted TF-IDF model stored as a term list and an IDF array.
+
+    Only transform is available: documents are counted against the fixed
+    vocabulary, weighted by the stored IDF and L2-normalized, which gives the
+    same vectors as a fitted TfidfVectorizer. Every worker loading the same
+    file produces identical scores.
+    """
+
+    def __init__(self, terms: List[str], idf: np.ndarray, params: Dict):
+        """
+        Args:
+            terms: Vocabulary terms, in feature column order
+            idf: IDF weight per term
+            params: CountVectorizer parameters used at fit time
+        """
+        self.terms = list(terms)
+        # IDF is stored as float32; rounding here keeps a freshly fitted model
+        # and its saved copy bit-for-bit identical
+        self.idf = np.asarray(idf, dtype=np.float32).astype(np.float64)
+        self.params = dict(params)
+        self.params['ngram_range'] = tuple(self.params['ngram_range'])
+        self.fingerprint = _fingerprint(self.terms, self.idf)
+        # scikit-learn is imported here rather than at module level, so
+        # importing this module (and the matcher) stays cheap
+        from sklearn.feature_extraction.text import CountVectorizer
+        self._counter = CountVectorizer(
+            vocabulary={term: i for i, term in enumerate(self.terms)},
+            **self.params
+        )
+
+    def __len__(self) -> int:
+        return len(self.terms)
+
+    def transform(self, documents: Iterable[str]):
+        """
+        Converts documents to L2-normalized TF-IDF vectors
+
+        Args:
+            documents: Texts to vectorize
+
+        Returns:
+            Sparse CSR matrix with one row per document
+        """
+        from sklearn.preprocessing import normalize
+
+        counts = self._counter.transform(documents)
+        return normalize(counts.multiply(self.idf).tocsr(), norm='l2', copy=False)
+
+    def save(self, path: str):
+        """
+        Writes the model as a compressed .npz file (atomically replacing path)
+
+        Args:
+            path: Destination file
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        tmp_path = f'{path}.{os.getpid()}.tmp.npz'
+        np.savez_compressed(
+            tmp_path,
+            terms=np.frombuffer('\n'.join(self.terms).encode('utf-8'), dtype=np.uint8),
+            idf=self.idf.astype(np.float32),
+            params=np.frombuffer(json.dumps(self.params).encode('utf-8'), dtype=np.uint8)
+        )
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> 'TfidfModel':
+        """
+        Reads a model written by save
+
+        Args:
+            path: Model file
+
+        Returns:
+            Loaded TfidfModel
+        """
+        with np.load(path) as data:
+            terms_blob = data['terms'].tobytes().decode('utf-8')
+            terms = terms_blob.split('\n') if terms_blob else []
+            params = json.loads(data['params'].tobytes().decode('utf-8'))
+            return cls(terms, data['idf'], params)
+
+
+def _fingerprint(terms: List[str], idf: np.ndarray) -> str:
+    """
+    Short content hash identifying a model across processes
+    """
+    digest = hashlib.sha256('\n'.join(terms).encode('utf-8'))
+    digest.update(idf.astype(np.float32).tobytes())
+    return digest.hexdigest()[:16]
+
+
+def fit_tfidf_model(documents: Iterable[str], max_features: int = TFIDF_MAX_FEATURES) -> TfidfModel:
+    """
+    Fits a TF-IDF model on a reference corpus
+
+    Args:
+        documents: Corpus of resume and job description texts
+        max_features: Maximum vocabulary size
+
+    Returns:
+        Fitted TfidfModel
+    """
+    from sklearn.feature_extraction.text import TfidfVectorizer
+
+    vectorizer = TfidfVectorizer(max_features=max_features, **VECTORIZER_PARAMS)
+    vectorizer.fit(documents)
+
+    terms = [''] * len(vectorizer.vocabulary_)
+    for term, column in vectorizer.vocabulary_.items():
+        terms[column] = term
+
+    return TfidfModel(terms, vectorizer.idf_, VECTORIZER_PARAMS)
+
+
+def load_tfidf_model(path: str = TFIDF_MODEL_PATH) -> Optional[TfidfModel]:
+    """
+    Loads the persisted model, typically once at startup
+
+    Args:
+        path: Model file
+
+    Returns:
+        Loaded TfidfModel, or None if the file does not exist
+    """
+    global _tfidf_model, _tfidf_model_loaded
+    if os.path.exists(path):
+        _tfidf_model = TfidfModel.load(path)
+    else:
+        _tfidf_model = None
+    _tfidf_model_loaded = True
+    return _tfidf_model
+
+
+def get_tfidf_model() -> Optional[TfidfModel]:
+    """
+    Returns the loaded model, loading it on first use
+
+    Returns:
+        TfidfModel, or None when no model has been fitted
+    """
+    if not _tfidf_model_loaded:
+        load_tfidf_model()
+    return _tfidf_model
+
+
+def _iter_corpus(paths: List[str]) -> Iterable[str]:
+    """
+    Yields texts from .txt and .pdf files under the given paths
+    """
+    from modules.resume_parser import get_resume_text
+
+    for path in paths:
+        if os.path.isdir(path):
+            files = sorted(
+                os.path.join(root, name)
+                for root, _, names in os.walk(path)
+                for name in names
+            )
+        else:
+            files = [path]
+
+        for file_path in files:
+            extension = os.path.splitext(file_path)[1].lower()
+            if extension == '.txt':
+                with open(file_path, encoding='utf-8', errors='ignore') as file:
+                    text = file.read()
+            elif extension == '.pdf':
+                text = get_resume_text(file_path)
+            else:
+                continue
+            if text:
+                yield text
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description='Fit or inspect the persisted TF-IDF model')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    fit_parser = subparsers.add_parser('fit', help='Fit (or refit) the model on a reference corpus')
+    fit_parser.add_argument('paths', nargs='+', help='Directories or .txt/.pdf files')
+    fit_parser.add_argument('--output', default=TFIDF_MODEL_PATH)
+    fit_parser.add_argument('--max-features', type=int, default=TFIDF_MAX_FEATURES)
+
+    info_parser = subparsers.add_parser('info', help='Show details of a saved model')
+    info_parser.add_argument('--model', default=TFIDF_MODEL_PATH)
+
+    args = parser.parse_args(argv)
+
+    if args.command == 'fit':
+        documents = list(_iter_corpus(args.paths))
+        if not documents:
+            parser.error('No .txt or .pdf documents found')
+        model = fit_tfidf_model(documents, max_features=args.max_features)
+        model.save(args.output)
+        print(f"Fitted TF-IDF model on {len(documents)} documents "
+              f"({len(model)} terms) -> {args.output}")
+    else:
+        if not os.path.exists(args.model):
+            print(f"No model at {args.model}", file=sys.stderr)
+            sys.exit(1)
+        model = TfidfModel.load(args.model)
+        print(f"{args.model}: {len(model)} terms, "
+              f"{os.path.getsize(args.model) / 1024:.1f} KB, params={model.params}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,114 @@
+"""
+Warmup Module
+Loads models and runs a canned resume through the whole pipeline before the
+first request, optionally in the gunicorn master so workers share the result
+"""
+
+import gc
+import os
+import threading
+import time
+from typing import Dict, Optional
+
+from config import SKILL_EXTRACTION_MODE, WARMUP_MODE
+
+
+WARMUP_PDF_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'warmup_resume.pdf')
+WARMUP_JOB_DESCRIPTION = (
+    'We are hiring a backend engineer with Python, Flask or Django, PostgreSQL, '
+    'Docker and Kubernetes experience on AWS. Kafka and machine learning are a plus.'
+)
+
+_ready = threading.Event()
+_status: Dict = {'mode': WARMUP_MODE, 'ready': False, 'error': None, 'seconds': None}
+
+
+def preload():
+    """
+    Loads everything the first request would otherwise load: the spaCy
+    model of the configured extraction mode, the libraries the modules
+    import on first use (PyPDF2, scikit-learn) and the corpus-fitted TF-IDF
+    model (the skill matcher is loaded at import)
+    """
+    import PyPDF2  # noqa: F401
+    import sklearn.feature_extraction.text  # noqa: F401
+    import sklearn.metrics.pairwise  # noqa: F401
+    import sklearn.preprocessing  # noqa: F401
+    from modules.skill_extractor import VOCABULARY_MODE, load_spacy_model
+    from modules.tfidf_model import load_tfidf_model
+
+    if SKILL_EXTRACTION_MODE != VOCABULARY_MODE:
+        load_spacy_model()
+    load_tfidf_model()
+
+
+def warmup():
+    """
+    Runs the canned resume through extraction, cleaning, skill extraction
+    and matching, so lazily built state (regex caches, spaCy vocab, sklearn
+    code paths) is in place before the first real request
+    """
+    from modules import metrics
+    from modules.matcher import get_match_analysis
+    from modules.resume_parser import extract_pdf
+
+    with open(WARMUP_PDF_PATH, 'rb') as f:
+        text = extract_pdf(f.read(), mode='serial')['text']
+    get_match_analysis(text, WARMUP_JOB_DESCRIPTION)
+
+    # Warmup work isn't traffic: keep it out of /metrics (and out of every
+    # forked worker's copy of the counters)
+    metrics.reset()
+
+
+def _run(freeze: bool):
+    start = time.perf_counter()
+    try:
+        preload()
+        warmup()
+    except Exception as e:
+        _status['error'] = str(e)
+        print(f"Error during warmup: {str(e)}")
+    finally:
+        if freeze:
+            # Move everything allocated so far to a permanent generation the
+            # collector never touches, so forked workers don't dirty (and
+            # copy) the shared pages when they collect garbage
+            gc.collect()
+            gc.freeze()
+        _status['seconds'] = round(time.perf_counter() - start, 3)
+        _status['ready'] = _status['error'] is None
+        _ready.set()
+
+
+def start(mode: str = WARMUP_MODE):
+    """
+    Starts warmup according to mode ('preload', 'background' or 'off')
+    """
+    _status['mode'] = mode
+    if mode == 'preload':
+        _run(freeze=True)
+    elif mode == 'background':
+        threading.Thread(target=_run, args=(False,), name='warmup', daemon=True).start()
+    else:
+        _status['ready'] = True
+        _ready.set()
+
+
+def is_ready() -> bool:
+    return _ready.is_set() and _status['ready']
+
+
+def status() -> Dict:
+    """
+    Returns mode, ready, error and warmup duration in seconds
+    """
+    return {**_status, 'pid': os.getpid(), 'frozen_objects': gc.get_freeze_count()}
+
+
+def wait(timeout: Optional[float] = None) -> bool:
+    """
+    Waits for warmup to finish; returns whether it succeeded
+    """
+    _ready.wait(timeout)
+    return is_ready()
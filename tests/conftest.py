@@ -0,0 +1,32 @@
+"""
+Test configuration: settings that work without the spaCy model, with every
+file the app writes kept in a temporary directory (set before config is
+imported)
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+
+_DATA_DIR = tempfile.mkdtemp(prefix='resume_analyzer_tests_')
+
+os.environ.setdefault('SKILL_EXTRACTION_MODE', 'vocab')
+os.environ.setdefault('WARMUP_MODE', 'off')
+os.environ.setdefault('JOB_WORKERS', '0')
+os.environ.setdefault('PDF_TEXT_CACHE_ENABLED', 'false')
+os.environ.setdefault('JD_CACHE_BACKEND', 'memory')
+os.environ.setdefault('JOBS_DB_PATH', os.path.join(_DATA_DIR, 'jobs.sqlite3'))
+os.environ.setdefault('CANDIDATE_STORE_PATH', os.path.join(_DATA_DIR, 'candidates.sqlite3'))
+os.environ.setdefault('RESUME_MATRIX_DIR', os.path.join(_DATA_DIR, 'resume_matrix'))
+os.environ.setdefault('METRICS_DIR', os.path.join(_DATA_DIR, 'metrics'))
+os.environ.setdefault('PROFILE_DIR', os.path.join(_DATA_DIR, 'profiles'))
+
+# A copy of the taxonomy, so reload tests can rewrite it
+_REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if 'TAXONOMY_PATH' not in os.environ:
+    os.environ['TAXONOMY_PATH'] = os.path.join(_DATA_DIR, 'skill_taxonomy.json')
+    shutil.copy(os.path.join(_REPO_DIR, 'modules', 'skill_taxonomy.json'), os.environ['TAXONOMY_PATH'])
+os.environ.setdefault('TAXONOMY_ARTIFACT_PATH', os.path.join(_DATA_DIR, 'skill_taxonomy.pickle'))
+
+sys.path.insert(0, _REPO_DIR)
@@ -0,0 +1,264 @@
+"""
+Flask routes, through the test client
+"""
+
+import hashlib
+import io
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import app as app_module
+from benchmarks.pdfgen import make_pdf
+from modules import resume_parser
+
+
+@pytest.fixture
+def client():
+    return app_module.app.test_client()
+
+
+def test_413_reports_the_route_limit(client, monkeypatch):
+    body = {'job_description': 'python', 'resume': (io.BytesIO(b'%PDF' + b'0' * (17 * 1024 * 1024)), 'r.pdf')}
+    response = client.post('/analyze', data=body)
+    assert response.status_code == 413
+    assert response.get_json()['error'] == 'File size exceeds maximum allowed size (16MB)'
+
+    monkeypatch.setattr(app_module, 'MAX_BATCH_CONTENT_LENGTH', 2 * 1024 * 1024)
+    body = {'job_description': 'python', 'resumes': (io.BytesIO(b'%PDF' + b'0' * (3 * 1024 * 1024)), 'r.pdf')}
+    response = client.post('/analyze/batch', data=body)
+    assert response.status_code == 413
+    assert response.get_json()['error'] == 'File size exceeds maximum allowed size (2MB)'
+
+
+def test_hashing_spooled_file_hashes_what_it_stores():
+    chunks = [b'%PDF-1.4 ', b'x' * 5000, b' end']
+    for max_size in (0, 1024 * 1024):
+        spooled = app_module.HashingSpooledFile(max_size)
+        for chunk in chunks:
+            spooled.write(chunk)
+        spooled.seek(0)
+        assert spooled.read() == b''.join(chunks)
+        assert spooled.hexdigest() == hashlib.sha256(b''.join(chunks)).hexdigest()
+        spooled.close()
+
+
+def test_concurrent_uploads_with_the_same_name(monkeypatch):
+    """
+    Different PDFs all named resume.pdf, posted at once: each response has
+    the skill planted only in its own PDF, and each upload is hashed from
+    its own bytes
+    """
+    skills = ['kafka', 'kubernetes', 'terraform', 'django', 'pytorch', 'jenkins']
+    pdfs = {skill: make_pdf([[f'candidate {i} expert in {skill}']]) for i, skill in enumerate(skills)}
+    hashes = {}
+    get_resume_text = app_module.get_resume_text
+
+    def recording_get_resume_text(stream, content_hash=None):
+        text = get_resume_text(stream, content_hash)
+        hashes[content_hash] = text
+        return text
+
+    monkeypatch.setattr(app_module, 'get_resume_text', recording_get_resume_text)
+
+    def post(skill):
+        response = app_module.app.test_client().post('/analyze', data={
+            'job_description': ' '.join(skills),
+            'resume': (io.BytesIO(pdfs[skill]), 'resume.pdf')
+        })
+        return skill, response.get_json()
+
+    # Within ANALYZE_MAX_IN_FLIGHT + ANALYZE_MAX_QUEUE, so none is turned away
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        results = list(executor.map(post, skills * 2))
+
+    for skill, payload in results:
+        assert payload['success'], payload
+        assert payload['results']['matched_skills'] == [skill]
+    for skill, pdf in pdfs.items():
+        assert skill in hashes[hashlib.sha256(pdf).hexdigest()]
+
+
+def test_stream_releases_its_slot_when_the_response_fails(client, monkeypatch):
+    def broken_stream(generator):
+        generator.close()
+        raise RuntimeError('no stream')
+
+    monkeypatch.setattr(app_module, 'stream_with_context', broken_stream)
+    body = {'job_description': 'python', 'resumes': (io.BytesIO(make_pdf([['python developer']])), 'r.pdf')}
+    response = client.post('/analyze/stream', data=body)
+    assert response.status_code == 500
+    assert response.get_json()['error'] == 'Unexpected error: no stream'
+    assert app_module.admission.stats()['in_flight'] == 0
+
+
+def test_stream_lines(client):
+    import json
+
+    body = {
+        'job_description': 'Backend developer: python, docker and kubernetes',
+        'resumes': [
+            (io.BytesIO(make_pdf([['python and docker developer']])), 'first.pdf'),
+            (io.BytesIO(b'not a pdf at all'), 'broken.pdf'),
+            (io.BytesIO(make_pdf([['python, docker and kubernetes engineer']])), 'second.pdf'),
+        ]
+    }
+    response = client.post('/analyze/stream', data=body)
+    assert response.status_code == 200
+    assert response.mimetype == 'application/x-ndjson'
+    lines = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+
+    assert [(line['type'], line.get('index'), line.get('success')) for line in lines] == [
+        ('result', 0, True), ('result', 1, False), ('result', 2, True), ('summary', None, True)
+    ]
+    first, broken, second, summary = lines
+    assert first['filename'] == 'first.pdf'
+    assert first['matched_skills'] == ['docker', 'python']
+    assert first['missing_skills'] == ['kubernetes']
+    assert second['matched_skills'] == ['docker', 'kubernetes', 'python']
+    assert broken['filename'] == 'broken.pdf' and broken['error']
+    assert summary['analyzed'] == 2 and summary['failed'] == 1
+    assert [entry['filename'] for entry in summary['ranking']] == ['second.pdf', 'first.pdf']
+    response.close()
+    assert app_module.admission.stats()['in_flight'] == 0
+
+
+def encrypted_pdf() -> bytes:
+    import PyPDF2
+
+    writer = PyPDF2.PdfWriter()
+    for page in PyPDF2.PdfReader(io.BytesIO(make_pdf([['python developer']]))).pages:
+        writer.add_page(page)
+    writer.encrypt('secret')
+    output = io.BytesIO()
+    writer.write(output)
+    return output.getvalue()
+
+
+def image_only_pdf() -> bytes:
+    import PyPDF2
+
+    # A page without fonts, like a scan
+    writer = PyPDF2.PdfWriter()
+    writer.add_blank_page(612, 792)
+    output = io.BytesIO()
+    writer.write(output)
+    return output.getvalue()
+
+
+@pytest.mark.parametrize('make_body, status, error', [
+    (encrypted_pdf, 400, 'The PDF is password protected. Please upload an unprotected PDF.'),
+    (lambda: make_pdf([['python']] * 3), 413, 'The PDF has 3 pages. At most 2 pages are accepted.'),
+    (image_only_pdf, 400, 'The PDF has no text layer (scanned or image-only pages). '
+                          'Please upload a PDF with selectable text.'),
+])
+def test_pdfs_rejected_before_extraction(client, monkeypatch, make_body, status, error):
+    monkeypatch.setattr(resume_parser, 'PDF_REJECT_PAGES', 2)
+
+    def no_extraction(*args, **kwargs):
+        raise AssertionError('a rejected PDF was extracted')
+
+    monkeypatch.setattr(app_module, 'get_resume_text', no_extraction)
+    body = {'job_description': 'python', 'resume': (io.BytesIO(make_body()), 'r.pdf')}
+    response = client.post('/analyze', data=body)
+    assert response.status_code == status
+    assert response.get_json() == {'success': False, 'error': error}
+
+
+def test_full_queue_answers_503_with_retry_after(client, monkeypatch):
+    admission = app_module.AdmissionController(max_in_flight=1, max_large=1, max_queue=0, queue_timeout=5.0)
+    monkeypatch.setattr(app_module, 'admission', admission)
+    assert admission.acquire()
+
+    body = {'job_description': 'python', 'resume': (io.BytesIO(make_pdf([['python developer']])), 'r.pdf')}
+    response = client.post('/analyze', data=body)
+    assert response.status_code == 503
+    assert response.headers['Retry-After'] == str(app_module.ANALYZE_RETRY_AFTER)
+    assert response.get_json()['success'] is False
+
+    admission.release()
+    body = {'job_description': 'python', 'resume': (io.BytesIO(make_pdf([['python developer']])), 'r.pdf')}
+    assert client.post('/analyze', data=body).status_code == 200
+
+
+def test_queued_request_times_out():
+    admission = app_module.AdmissionController(max_in_flight=1, max_large=1, max_queue=1, queue_timeout=0.2)
+    assert admission.acquire()
+
+    start = time.monotonic()
+    assert not admission.acquire()
+    assert time.monotonic() - start >= 0.2
+    assert admission.stats() == {'in_flight': 1, 'large_in_flight': 0, 'waiting': 0}
+
+
+def test_large_documents_leave_slots_for_small_ones():
+    admission = app_module.AdmissionController(max_in_flight=2, max_large=1, max_queue=2, queue_timeout=0.2)
+    assert admission.acquire(large=True)
+    # The second slot is not for a large document...
+    assert not admission.acquire(large=True)
+    # ...but a small one takes it
+    assert admission.acquire(large=False)
+    assert admission.stats() == {'in_flight': 2, 'large_in_flight': 1, 'waiting': 0}
+
+
+def test_small_requests_are_admitted_before_large_ones():
+    admission = app_module.AdmissionController(max_in_flight=1, max_large=1, max_queue=2, queue_timeout=10.0)
+    assert admission.acquire()
+    admitted = []
+
+    def wait(large):
+        if admission.acquire(large):
+            admitted.append('large' if large else 'small')
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        large = executor.submit(wait, True)
+        while admission.stats()['waiting'] < 1:
+            time.sleep(0.01)
+        small = executor.submit(wait, False)
+        while admission.stats()['waiting'] < 2:
+            time.sleep(0.01)
+
+        admission.release()
+        small.result(timeout=5)
+        assert admitted == ['small']
+        admission.release()
+        large.result(timeout=5)
+    assert admitted == ['small', 'large']
+
+
+@pytest.mark.parametrize('body, error', [
+    ({'job_description': 'python'}, 'No resume file uploaded'),
+    ({'resume': (io.BytesIO(b''), '')}, 'No file selected'),
+    ({}, 'At least one job_description is required, and none may be empty'),
+    ({'job_description': ['python', ' ']}, 'At least one job_description is required, and none may be empty'),
+    ({'job_description': ['python', 'docker', 'kafka']}, 'Too many job descriptions. At most 2 per request.'),
+    ({'job_description': 'python', 'resume': (io.BytesIO(b'text'), 'r.txt')},
+     'Invalid file type. Only PDF files are allowed.'),
+])
+def test_multi_validation(client, monkeypatch, body, error):
+    monkeypatch.setattr(app_module, 'MAX_MULTI_JOB_DESCRIPTIONS', 2)
+    if 'resume' not in body and error != 'No resume file uploaded':
+        body['resume'] = (io.BytesIO(make_pdf([['python developer']])), 'r.pdf')
+    response = client.post('/analyze/multi', data=body)
+    assert response.status_code == 400
+    assert response.get_json() == {'success': False, 'error': error}
+
+
+def test_multi_ranks_the_job_descriptions(client):
+    body = {
+        'resume': (io.BytesIO(make_pdf([['python and docker developer']])), 'r.pdf'),
+        'job_description': ['Java and Spring', 'Python and Docker developer', 'Python, Go and Kafka']
+    }
+    response = client.post('/analyze/multi', data=body)
+    payload = response.get_json()
+    assert response.status_code == 200, payload
+
+    assert payload['resume_skills'] == ['docker', 'python']
+    results = payload['results']
+    assert [result['rank'] for result in results] == [1, 2, 3]
+    assert results[0]['index'] == 1
+    assert results[0]['matched_skills'] == ['docker', 'python']
+    assert sorted(result['index'] for result in results) == [0, 1, 2]
+    scores = [result['match_percentage'] for result in results]
+    assert scores == sorted(scores, reverse=True)
@@ -0,0 +1,102 @@
+"""
+Bounded LRU caches, in memory and in a shared sqlite file
+"""
+
+import pickle
+
+import pytest
+
+from modules import cache as cache_module
+from modules.cache import LRUCache, SqliteCache, create_cache
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def time(self):
+        return self.now
+
+
+@pytest.fixture(params=['memory', 'sqlite'])
+def make_cache(request, tmp_path):
+    def make(max_entries=1024, max_bytes=64 * 1024 * 1024, ttl=None):
+        return create_cache(request.param, str(tmp_path / 'cache.sqlite3'), max_entries, max_bytes, ttl)
+    return make
+
+
+def size_of(value) -> int:
+    return len(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+
+
+def test_backends():
+    assert isinstance(create_cache('memory', '', 1, 1), LRUCache)
+    with pytest.raises(ValueError):
+        create_cache('redis', '', 1, 1)
+
+
+def test_entry_bound_evicts_least_recently_used(make_cache, monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(cache_module, 'time', clock)
+    cache = make_cache(max_entries=3)
+    for key in 'abc':
+        cache.set(key, key.upper())
+        clock.now += 1
+
+    # Reading 'a' makes 'b' the least recently used
+    assert cache.get('a') == 'A'
+    clock.now += 1
+    cache.set('d', 'D')
+
+    assert cache.get('b') is None
+    assert [cache.get(key) for key in 'acd'] == ['A', 'C', 'D']
+    stats = cache.stats()
+    assert (stats['entries'], stats['evictions']) == (3, 1)
+
+
+def test_byte_bound(make_cache, monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(cache_module, 'time', clock)
+    value = 'x' * 1000
+    cache = make_cache(max_bytes=2 * size_of(value) + 10)
+    for key in 'abc':
+        cache.set(key, value)
+        clock.now += 1
+
+    assert cache.get('a') is None
+    assert cache.get('b') == cache.get('c') == value
+    assert cache.stats()['bytes'] == 2 * size_of(value)
+
+    # A value larger than the whole cache is not stored and evicts nothing
+    cache.set('huge', 'x' * 5000)
+    assert cache.get('huge') is None
+    assert cache.stats()['entries'] == 2
+
+
+def test_ttl_expiry(make_cache, monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(cache_module, 'time', clock)
+    cache = make_cache(ttl=60)
+    cache.set('a', 1)
+
+    clock.now += 59
+    assert cache.get('a') == 1
+    # Reading an entry doesn't extend its life
+    clock.now += 2
+    assert cache.get('a') is None
+    assert cache.stats()['entries'] == 0
+
+
+def test_replacing_a_key_keeps_one_entry(make_cache):
+    cache = make_cache()
+    cache.set('a', 'x' * 10)
+    cache.set('a', 'y' * 20)
+    assert cache.get('a') == 'y' * 20
+    stats = cache.stats()
+    assert (stats['entries'], stats['bytes']) == (1, size_of('y' * 20))
+
+
+def test_sqlite_cache_is_shared_through_its_file(tmp_path):
+    path = str(tmp_path / 'shared.sqlite3')
+    SqliteCache(path).set('key', {'skills': ['python']})
+    assert SqliteCache(path).get('key') == {'skills': ['python']}
@@ -0,0 +1,37 @@
+"""
+Candidate store: appended posting segments and their merges
+"""
+
+import random
+
+from modules.candidate_store import CandidateStore
+
+SKILLS = ['python', 'java', 'docker', 'kubernetes', 'react', 'sql']
+
+
+def test_segments_are_merged_without_changing_results(tmp_path):
+    store = CandidateStore(str(tmp_path / 'candidates.sqlite3'), max_segments=4)
+    rng = random.Random(12)
+    written = []
+    for i in range(30):
+        skills = rng.sample(SKILLS, rng.randint(1, 3))
+        written.append(set(skills))
+        assert store.add_candidate(f'candidate-{i}.pdf', skills) == i + 1
+
+        # Every query sees the candidate just added
+        found = store.search('python AND NOT java', limit=100)
+        expected = [j + 1 for j, skills in enumerate(written) if 'python' in skills and 'java' not in skills]
+        assert [candidate['id'] for candidate in found['candidates']] == expected
+
+    connection = store._connection()
+    per_skill = dict(connection.execute('SELECT skill, COUNT(*) FROM posting_segments GROUP BY skill'))
+    assert max(per_skill.values()) < 4
+    assert connection.execute('SELECT COUNT(*) FROM postings').fetchone()[0] == len(SKILLS)
+
+    store.merge_segments()
+    assert connection.execute('SELECT COUNT(*) FROM posting_segments').fetchone()[0] == 0
+    for skill in SKILLS:
+        reopened = CandidateStore(store.path)
+        expected = [j + 1 for j, skills in enumerate(written) if skill in skills]
+        assert reopened.search(skill, limit=100)['total'] == len(expected)
+        assert reopened.postings(skill).tolist() == expected
@@ -0,0 +1,105 @@
+"""
+Asynchronous jobs: worker pool ownership and job results
+"""
+
+import fcntl
+import time
+
+from modules import jobs
+
+
+def test_one_process_runs_the_worker_pool(tmp_path, monkeypatch):
+    path = str(tmp_path / 'jobs.sqlite3')
+    started = []
+    monkeypatch.setattr(jobs, '_pool_lock_file', None)
+    monkeypatch.setattr(jobs, '_workers', [])
+    monkeypatch.setattr(jobs.multiprocessing, 'get_context', lambda method: FakeContext(started))
+
+    # Another web worker holds the pool lock
+    with open(f'{path}.workers.lock', 'a') as other:
+        fcntl.flock(other, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        assert jobs.ensure_workers(2, path) == 0
+        assert started == []
+        fcntl.flock(other, fcntl.LOCK_UN)
+
+    # ...until it exits
+    assert jobs.ensure_workers(2, path) == 2
+    assert jobs.ensure_workers(2, path) == 2
+    assert len(started) == 2
+    jobs._pool_lock_file.close()
+
+
+class FakeContext:
+    def __init__(self, started):
+        self.started = started
+
+    def Process(self, target, args, daemon):
+        return FakeProcess(self.started)
+
+
+class FakeProcess:
+    def __init__(self, started):
+        self.started = started
+
+    def start(self):
+        self.started.append(self)
+
+    def is_alive(self):
+        return True
+
+
+def test_process_job_reports_the_taxonomy_version(monkeypatch):
+    from modules import resume_parser
+    from modules.skill_db import get_taxonomy
+
+    monkeypatch.setattr(resume_parser, 'get_resume_text', lambda resume, content_hash: 'python and docker')
+    result = jobs.process_job(b'%PDF', None, 'python, kubernetes')
+    assert result['matched_skills'] == ['python']
+    assert result['taxonomy_version'] == get_taxonomy().version
+
+
+def test_process_job_saves_the_candidate(monkeypatch):
+    from modules import resume_parser
+    from modules.candidate_store import get_candidate_store
+
+    monkeypatch.setattr(resume_parser, 'get_resume_text', lambda resume, content_hash: 'golang and terraform')
+    jobs.process_job(b'%PDF', 'job-resume-hash', 'golang developer', 'gopher.pdf')
+    found = get_candidate_store().search('golang AND terraform')
+    assert [candidate['name'] for candidate in found['candidates']] == ['gopher.pdf']
+
+
+def test_only_the_latest_attempt_finishes_a_job(tmp_path):
+    queue = jobs.JobQueue(str(tmp_path / 'jobs.sqlite3'), lease_seconds=0.2)
+    job_id = queue.submit(b'%PDF', None, 'python')
+    first = queue.claim()
+    assert first['attempts'] == 1
+
+    # Renewed, the lease outlives its original length
+    time.sleep(0.15)
+    assert queue.renew(job_id, 1)
+    time.sleep(0.1)
+    assert queue.claim() is None
+
+    # Expired: the job runs again, and the first run can't finish it
+    time.sleep(0.25)
+    second = queue.claim()
+    assert second['id'] == job_id and second['attempts'] == 2
+    assert not queue.renew(job_id, 1)
+    assert not queue.complete(job_id, 1, {'match_percentage': 1.0})
+    assert queue.complete(job_id, 2, {'match_percentage': 2.0})
+    assert not queue.fail(job_id, 2, 'late error')
+    assert queue.get(job_id)['result'] == {'match_percentage': 2.0}
+
+
+def test_polling_a_pending_job_revives_the_workers(tmp_path, monkeypatch):
+    import app as app_module
+
+    revived = []
+    monkeypatch.setattr(app_module, 'JOB_WORKERS', 1)
+    monkeypatch.setattr(app_module, 'ensure_workers', lambda: revived.append(True))
+    monkeypatch.setattr(app_module, '_job_queue', jobs.JobQueue(str(tmp_path / 'jobs.sqlite3')))
+    job_id = app_module.get_job_queue().submit(b'%PDF', None, 'python')
+
+    response = app_module.app.test_client().get(f'/jobs/{job_id}')
+    assert response.get_json()['status'] == 'queued'
+    assert revived == [True]
@@ -0,0 +1,139 @@
+"""
+Job description analysis and matching
+"""
+
+import random
+
+import numpy as np
+import pytest
+from scipy.stats import spearmanr
+
+from benchmarks.bench_similarity_engine import labeled_sample, quality
+from benchmarks.corpus import make_job_description, make_resume
+from modules import matcher
+from modules.resume_parser import extract_text_from_pdf
+
+
+class RecordingCache:
+    def __init__(self):
+        self.keys = []
+
+    def get(self, key):
+        self.keys.append(key)
+        return None
+
+    def set(self, key, value):
+        pass
+
+
+def test_jd_cache_key_covers_skill_extraction_settings(monkeypatch):
+    cache = RecordingCache()
+    monkeypatch.setattr(matcher, '_jd_cache', cache)
+    job_description = 'Python developer with kubernetes'
+
+    matcher.analyze_job_description(job_description, engine=matcher.HASHING_ENGINE)
+    monkeypatch.setattr(matcher, 'SKILL_EXTRACTION_MODE', 'minimal')
+    matcher.analyze_job_description(job_description, engine=matcher.HASHING_ENGINE)
+    monkeypatch.setattr(matcher, 'SKILL_PHRASE_REVERSE_MATCH', not matcher.SKILL_PHRASE_REVERSE_MATCH)
+    matcher.analyze_job_description(job_description, engine=matcher.HASHING_ENGINE)
+
+    assert len(set(cache.keys)) == 3
+
+
+def test_fuzzy_skills_carry_their_confidence(monkeypatch):
+    monkeypatch.setattr(matcher, 'SKILL_FUZZY_MATCH', True)
+    resume = 'deployed on kuber netes with postgressql and tensorfow, wrote python'
+    analysis = matcher.get_match_analysis(resume, 'python, kubernetes, postgresql and tensorflow')
+
+    assert analysis['fuzzy_skills'] == {
+        'kubernetes': pytest.approx(1.0),
+        'postgresql': pytest.approx(0.9),
+        'tensorflow': pytest.approx(0.9),
+    }
+    # Approximate matches are reported, never scored or stored as skills
+    assert analysis['resume_skills'] == ['python']
+    assert analysis['matched_skills'] == ['python']
+    assert analysis['missing_skills'] == ['kubernetes', 'postgresql', 'tensorflow']
+
+    ranked = matcher.get_match_analysis_batch([resume, 'python only'], 'python and kubernetes')
+    by_index = {result['index']: result for result in ranked}
+    assert by_index[0]['fuzzy_skills'] == analysis['fuzzy_skills']
+    assert by_index[1]['fuzzy_skills'] == {}
+    multi = matcher.get_match_analysis_multi(resume, ['kubernetes', 'tensorflow'])
+    assert all(result['fuzzy_skills'] == analysis['fuzzy_skills'] for result in multi)
+
+
+def test_job_descriptions_are_matched_exactly_unless_configured(monkeypatch):
+    monkeypatch.setattr(matcher, '_jd_cache', RecordingCache())
+    monkeypatch.setattr(matcher, 'SKILL_FUZZY_MATCH', True)
+    job_description = 'Backend role: java script tooling and kuber netes'
+
+    assert matcher.analyze_job_description(job_description)['skills'] == ['java']
+
+    monkeypatch.setattr(matcher, 'SKILL_FUZZY_MATCH_JD', True)
+    assert matcher.analyze_job_description(job_description)['skills'] == ['java', 'javascript', 'kubernetes']
+    assert len(set(matcher._jd_cache.keys)) == 2
+
+
+def test_hashing_engine_ranks_at_least_as_well_as_tfidf():
+    results = quality(labeled_sample(5, 8, random.Random(0)))
+    hashing, tfidf = results['hashing'], results['tfidf']
+
+    assert hashing['auc'] >= max(tfidf['auc'], 0.95)
+    assert hashing['precision'] >= tfidf['precision']
+    # A different scale, but the same direction as the TF-IDF scores
+    assert hashing['spearman_vs_tfidf'] > 0.3
+
+
+def test_hashed_rows_depend_only_on_their_text():
+    texts = ['python and docker developer', 'kubernetes operator', 'python python python']
+    together = matcher.hashed_vectors(texts)
+    for i, text in enumerate(texts):
+        assert (together[i] != matcher.hashed_vectors([text])).nnz == 0
+
+    job_description = 'Python developer with docker'
+    analysis = matcher.analyze_job_description(job_description, engine=matcher.HASHING_ENGINE)
+    batch = matcher._similarity_scores(texts, job_description, analysis, engine=matcher.HASHING_ENGINE)
+    single = [matcher._similarity_scores([text], job_description, analysis, engine=matcher.HASHING_ENGINE)[0]
+              for text in texts]
+    assert batch == pytest.approx(single)
+    assert np.all((batch >= 0) & (batch <= 1 + 1e-9))
+
+    same = matcher._similarity_scores(['python developer with docker'], job_description, analysis,
+                                      engine=matcher.HASHING_ENGINE)
+    assert same[0] == pytest.approx(1.0)
+
+
+def test_unknown_engine_is_rejected():
+    with pytest.raises(ValueError):
+        matcher.analyze_job_description('python', engine='word2vec')
+
+
+@pytest.mark.parametrize('engine', matcher.SIMILARITY_ENGINES)
+def test_multi_matches_one_analysis_per_job_description(engine, monkeypatch):
+    monkeypatch.setattr(matcher, 'SIMILARITY_ENGINE', engine)
+    rng = random.Random(24)
+    resume = extract_text_from_pdf(make_resume(2, 0.05, rng)['pdf'])
+    job_descriptions = [make_job_description(rng.choice((40, 150, 600)), rng) for _ in range(12)]
+    job_descriptions.insert(3, '')
+
+    ranked = matcher.get_match_analysis_multi(resume, job_descriptions)
+    scores = [result['match_percentage'] for result in ranked]
+    assert scores == sorted(scores, reverse=True)
+    assert sorted(result['index'] for result in ranked) == list(range(len(job_descriptions)))
+
+    by_index = {result['index']: result for result in ranked}
+    assert by_index[3]['match_percentage'] == 0.0 and by_index[3]['jd_skills'] == []
+    expected = {i: matcher.get_match_analysis(resume, text) for i, text in enumerate(job_descriptions) if text}
+    for i, analysis in expected.items():
+        for key in ('matched_skills', 'missing_skills', 'resume_skills', 'jd_skills', 'taxonomy_version'):
+            assert by_index[i][key] == analysis[key]
+
+    one_by_one = [expected[i]['match_percentage'] for i in sorted(expected)]
+    combined = [by_index[i]['match_percentage'] for i in sorted(expected)]
+    if engine == matcher.HASHING_ENGINE:
+        # Every job description vector comes from the cache: the same scores
+        assert combined == one_by_one
+    else:
+        # One vectorizer fitted on all job descriptions: other IDF weights, same order
+        assert spearmanr(combined, one_by_one)[0] > 0.95
@@ -0,0 +1,62 @@
+"""
+Metrics files: per-process names, background flushes and cleanup
+"""
+
+import glob
+import json
+import os
+import time
+
+from modules import metrics
+
+
+def _files():
+    return glob.glob(os.path.join(metrics.METRICS_DIR, 'metrics-*.json'))
+
+
+def test_idle_process_publishes_its_last_requests(monkeypatch):
+    monkeypatch.setattr(metrics, 'METRICS_FLUSH_INTERVAL', 0.05)
+    metrics.clear_files()
+    metrics.reset()
+    metrics.start_request()
+    metrics.flush()
+
+    # Recorded after the last flush, and no request follows
+    metrics.inc('resume_analyzer_pdf_rejected_total', reason='idle-test')
+    deadline = time.time() + 5
+    while time.time() < deadline and metrics._dirty:
+        time.sleep(0.01)
+
+    files = _files()
+    assert len(files) == 1
+    assert f'-{os.getpid()}-' in os.path.basename(files[0])
+    with open(files[0]) as f:
+        assert ['resume_analyzer_pdf_rejected_total', [['reason', 'idle-test']], 1] in json.load(f)
+
+
+def test_forked_process_writes_its_own_file():
+    metrics.clear_files()
+    metrics.reset()
+    metrics.inc('resume_analyzer_pdf_rejected_total', reason='parent')
+    metrics.flush()
+
+    pid = os.fork()
+    if pid == 0:
+        code = 1
+        try:
+            if not metrics._values:
+                metrics.inc('resume_analyzer_pdf_rejected_total', reason='child')
+                metrics.flush()
+                code = 0
+        finally:
+            os._exit(code)
+    _, status = os.waitpid(pid, 0)
+    assert os.waitstatus_to_exitcode(status) == 0
+
+    assert len(_files()) == 2
+    values = metrics.collect()
+    for reason in ('parent', 'child'):
+        assert values[('resume_analyzer_pdf_rejected_total', (('reason', reason),))] == 1
+
+    metrics.clear_files()
+    assert _files() == []
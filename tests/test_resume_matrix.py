@@ -0,0 +1,50 @@
+"""
+Resume matrix: row order when candidates are recorded concurrently
+"""
+
+import threading
+import time
+
+from modules import candidate_store, resume_matrix
+from modules.candidate_store import CandidateStore
+from modules.matcher import hashed_vectors
+from modules.resume_matrix import ResumeMatrix
+
+
+def test_resumes_recorded_out_of_order_all_get_a_row(tmp_path, monkeypatch):
+    monkeypatch.setattr(candidate_store, '_candidate_store', CandidateStore(str(tmp_path / 'candidates.sqlite3')))
+    monkeypatch.setattr(resume_matrix, '_resume_matrix', ResumeMatrix(str(tmp_path / 'matrix')))
+    hashed_vectors(['warm up the vectorizer'])
+
+    # The first resume gets its id, then stalls before its vector is saved
+    # while the second one is stored and saved
+    record_candidates = resume_matrix.record_candidates
+
+    def slow_record_candidates(candidates):
+        ids = record_candidates(candidates)
+        if candidates[0][0] == 'first.pdf':
+            time.sleep(0.5)
+        return ids
+
+    monkeypatch.setattr(resume_matrix, 'record_candidates', slow_record_candidates)
+    first = threading.Thread(target=resume_matrix.record_resumes,
+                             args=([('first.pdf', ['python'], 'hash-1')], ['python developer']))
+    first.start()
+    time.sleep(0.2)
+    resume_matrix.record_resumes([('second.pdf', ['java'], 'hash-2')], ['java developer'])
+    first.join()
+
+    _, _, _, ids = resume_matrix.get_resume_matrix().snapshot()
+    assert list(ids) == [1, 2]
+
+
+def test_ids_that_cannot_be_appended_are_logged(tmp_path, capsys):
+    matrix = ResumeMatrix(str(tmp_path / 'matrix'))
+    vectors = hashed_vectors(['python developer', 'java developer', 'go developer'])
+    assert matrix.append([3], vectors[[0]]) == 1
+    # 3 again is a duplicate resume; 1 and 2 arrived after 3
+    assert matrix.append([1, 3, 2, 4], vectors[[1, 0, 2, 1]]) == 1
+    assert '[1, 2]' in capsys.readouterr().out
+
+    _, _, _, ids = matrix.snapshot()
+    assert list(ids) == [3, 4]
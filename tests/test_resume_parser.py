@@ -0,0 +1,175 @@
+"""
+PDF text extraction: the page-by-page pipeline against the previous
+whole-document extraction, its page and character limits, the parallel page
+pool and its timeouts, and the cache of cleaned text
+"""
+
+import hashlib
+import io
+import random
+import threading
+import time
+
+import PyPDF2
+import pytest
+
+from benchmarks.bench_pdf_pipeline import legacy_extract, synthetic_pdf
+from benchmarks.pdfgen import make_pdf
+from modules import resume_parser
+from modules.cache import LRUCache
+from modules.resume_parser import PagePool
+
+
+def extract_or_hang(path: str, page_num: int) -> str:
+    # Page pool task for the tests: pages saying 'hang' never finish
+    text = resume_parser._extract_page_worker(path, page_num)
+    if 'hang' in text:
+        time.sleep(60)
+    return text
+
+
+@pytest.fixture
+def pool():
+    pool = PagePool(2, extract_or_hang)
+    yield pool
+    pool.close()
+
+
+def _pdf(tmp_path, name, lines):
+    path = tmp_path / name
+    path.write_bytes(make_pdf([[line] for line in lines]))
+    return str(path)
+
+
+def test_a_stuck_page_is_skipped_and_its_process_replaced(tmp_path, pool, monkeypatch):
+    monkeypatch.setattr(resume_parser, 'PDF_PAGE_TIMEOUT', 2.0)
+    path = _pdf(tmp_path, 'stuck.pdf', ['page one', 'hang here', 'page three', 'page four'])
+
+    skipped = []
+    texts = resume_parser._extract_pages_parallel(path, 4, None, skipped, pool)
+    assert texts == ['page one', 'page three', 'page four']
+    assert skipped == [{'page': 2, 'reason': 'page timeout'}]
+
+    # Every process is back in the pool, the stuck one replaced
+    workers = pool.checkout(2, 1.0)
+    assert len(workers) == 2 and all(process.is_alive() for process, _ in workers)
+
+
+def test_pages_left_at_the_document_deadline_are_skipped(tmp_path, pool, monkeypatch):
+    monkeypatch.setattr(resume_parser, 'PDF_PAGE_TIMEOUT', 30.0)
+    monkeypatch.setattr(resume_parser, 'PDF_DOCUMENT_TIMEOUT', 1.0)
+    path = _pdf(tmp_path, 'slow.pdf', ['hang one', 'hang two', 'page three'])
+
+    skipped = []
+    texts = resume_parser._extract_pages_parallel(path, 3, None, skipped, pool)
+    assert texts == []
+    assert skipped == [{'page': page, 'reason': 'document timeout'} for page in (1, 2, 3)]
+
+
+def test_a_stuck_page_does_not_affect_another_document(tmp_path, pool, monkeypatch):
+    monkeypatch.setattr(resume_parser, 'PDF_PAGE_TIMEOUT', 2.0)
+    stuck = _pdf(tmp_path, 'stuck.pdf', ['hang here', 'page two'])
+    clean = _pdf(tmp_path, 'clean.pdf', [f'clean page {i}' for i in range(1, 21)])
+
+    results = {}
+
+    def extract(name, path, pages):
+        skipped = []
+        results[name] = (resume_parser._extract_pages_parallel(path, pages, None, skipped, pool), skipped)
+
+    threads = [threading.Thread(target=extract, args=('stuck', stuck, 2)),
+               threading.Thread(target=extract, args=('clean', clean, 20))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert results['stuck'] == (['page two'], [{'page': 1, 'reason': 'page timeout'}])
+    assert results['clean'] == ([f'clean page {i}' for i in range(1, 21)], [])
+
+
+def test_parallel_extraction_matches_serial(monkeypatch):
+    monkeypatch.setattr(resume_parser, 'PDF_PARALLEL_MIN_PAGES', 1)
+    monkeypatch.setattr(resume_parser, 'PDF_POOL_WORKERS', 2)
+    monkeypatch.setattr(resume_parser, '_page_pool', None)
+    pdf = make_pdf([[f'Page {i}: Python, Docker & Kubernetes'] for i in range(6)])
+    try:
+        parallel = resume_parser.extract_pdf(pdf, None, 60, mode='parallel')
+    finally:
+        resume_parser._get_page_pool().close()
+    assert parallel == resume_parser.extract_pdf(pdf, None, 60, mode='serial')
+
+
+def test_text_cache_is_keyed_by_content_and_cleaning_version(monkeypatch):
+    monkeypatch.setattr(resume_parser, 'PDF_TEXT_CACHE_ENABLED', True)
+    monkeypatch.setattr(resume_parser, '_text_cache', LRUCache())
+    extracted = []
+    extract_text_from_pdf = resume_parser.extract_text_from_pdf
+
+    def counting_extract(source):
+        extracted.append(source)
+        return extract_text_from_pdf(source)
+
+    monkeypatch.setattr(resume_parser, 'extract_text_from_pdf', counting_extract)
+    first = make_pdf([['python developer']])
+    second = make_pdf([['kubernetes operator']])
+
+    assert resume_parser.get_resume_text(first) == 'python developer'
+    # Identical bytes, passed with or without their hash, are not parsed again
+    assert resume_parser.get_resume_text(first) == 'python developer'
+    assert resume_parser.get_resume_text(io.BytesIO(first), hashlib.sha256(first).hexdigest()) == 'python developer'
+    assert len(extracted) == 1
+    assert resume_parser.get_resume_text(second) == 'kubernetes operator'
+    assert len(extracted) == 2
+
+    # New cleaning rules or limits change the version: cached texts are not reused
+    monkeypatch.setattr(resume_parser, 'CLEAN_TEXT_VERSION', 'next-version')
+    assert resume_parser.get_resume_text(first) == 'python developer'
+    assert len(extracted) == 3
+
+
+@pytest.fixture(scope='module')
+def large_pdf():
+    pdf = synthetic_pdf(4, random.Random(5))
+    return pdf, legacy_extract(pdf)
+
+
+def test_unlimited_extraction_matches_legacy(large_pdf):
+    pdf, legacy = large_pdf
+    assert resume_parser.extract_text_from_pdf(pdf, max_pages=None, max_chars=None) == legacy
+    punctuated = make_pdf([['C++, Node.js & (AWS)!'], ['  '], ['Résumé: #rust / go-lang']])
+    assert resume_parser.extract_text_from_pdf(punctuated, None, None) == legacy_extract(punctuated)
+
+
+def test_page_limit_reads_the_first_pages(large_pdf):
+    pdf, _ = large_pdf
+    first_pages = PyPDF2.PdfWriter()
+    for page in PyPDF2.PdfReader(io.BytesIO(pdf)).pages[:2]:
+        first_pages.add_page(page)
+    output = io.BytesIO()
+    first_pages.write(output)
+
+    result = resume_parser.extract_pdf(pdf, max_pages=2, max_chars=None)
+    assert result['pages'] == 2
+    assert result['text'] == legacy_extract(output.getvalue())
+
+
+def test_char_limit_is_a_prefix_of_the_legacy_text(large_pdf):
+    pdf, legacy = large_pdf
+    page_length = len(' '.join(resume_parser.iter_pdf_pages(pdf, max_pages=1, max_chars=None)))
+    # Inside the first page, on the space joining two pages, and just after it
+    for max_chars in (1, 57, page_length, page_length + 1, page_length + 2, 3 * page_length, len(legacy)):
+        text = ' '.join(resume_parser.iter_pdf_pages(pdf, max_pages=None, max_chars=max_chars))
+        assert text == legacy[:max_chars].rstrip()
+
+
+def test_char_limit_stops_reading_pages():
+    read = []
+
+    def pages():
+        for text in ('aaaa', '', 'bbbb', 'cccc', 'dddd'):
+            read.append(text)
+            yield text
+
+    assert list(resume_parser._limit_chars(pages(), 7)) == ['aaaa', 'bb']
+    assert read == ['aaaa', '', 'bbbb', 'cccc']
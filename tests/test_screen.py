@@ -0,0 +1,39 @@
+"""
+Bulk screening: workers replaced over the memory limit
+"""
+
+import io
+import json
+import multiprocessing.process
+import time
+
+from benchmarks.pdfgen import make_pdf
+from modules.screen import run_screen
+
+
+def test_retired_workers_requeue_their_resumes(tmp_path, monkeypatch):
+    directory = tmp_path / 'resumes'
+    directory.mkdir()
+    for i in range(4):
+        (directory / f'resume-{i}.pdf').write_bytes(make_pdf([[f'candidate {i} expert in python and docker']]))
+    output = str(tmp_path / 'screen.jsonl')
+
+    # A slow liveness check lets a worker send its last messages and exit
+    # between the parent reading the results and checking on it
+    is_alive = multiprocessing.process.BaseProcess.is_alive
+
+    def slow_is_alive(process):
+        time.sleep(1.0)
+        return is_alive(process)
+
+    monkeypatch.setattr(multiprocessing.process.BaseProcess, 'is_alive', slow_is_alive)
+
+    # Every worker retires after its first resume, with one more queued
+    summary = run_screen(str(directory), {'backend': 'python developer'}, output,
+                         workers=1, memory_limit_mb=1, log=io.StringIO())
+
+    assert summary['screened'] == 4 and summary['errors'] == 0
+    with open(output) as f:
+        records = [json.loads(line) for line in f]
+    assert sorted(record['path'] for record in records) == [f'resume-{i}.pdf' for i in range(4)]
+    assert all(record['matched_skills'] == ['python'] for record in records)
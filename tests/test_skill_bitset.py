@@ -0,0 +1,61 @@
+"""
+Skill gaps over bitsets give the same results as the per-candidate set
+operations they replaced
+"""
+
+import random
+
+import numpy as np
+import pytest
+
+from benchmarks.bench_candidate_store import TOP_K_SKILLS, synthetic_candidates
+from benchmarks.bench_skill_bitset import set_gap
+from modules import skill_bitset
+from modules.skill_bitset import gap_counts, job_gaps, pack, skill_gaps, skill_matrix, skill_row, unpack
+
+
+@pytest.fixture(scope='module')
+def candidates():
+    return synthetic_candidates(300, random.Random(13)) + [[]]
+
+
+def test_skill_gaps_match_set_operations(candidates):
+    jd_skills = sorted(TOP_K_SKILLS)
+    gaps = skill_gaps(skill_matrix(candidates), skill_row(jd_skills))
+    assert gaps == [set_gap(skills, jd_skills) for skills in candidates]
+    assert skill_gaps(skill_matrix([]), skill_row(jd_skills)) == []
+
+
+def test_job_gaps_match_set_operations(candidates):
+    resume_skills = candidates[0]
+    jds = candidates[1:20] + [[]]
+    gaps = job_gaps(skill_row(resume_skills), skill_matrix(jds))
+    assert gaps == [set_gap(resume_skills, jd_skills) for jd_skills in jds]
+
+
+@pytest.mark.parametrize('jd_skills', [TOP_K_SKILLS, []])
+def test_gap_counts_match_set_operations(candidates, jd_skills):
+    counts = gap_counts(pack(skill_matrix(candidates)), pack(skill_row(jd_skills)))
+    matched = [len(set(jd_skills) & set(skills)) for skills in candidates]
+
+    assert counts['matched'].tolist() == matched
+    assert counts['missing'].tolist() == [len(jd_skills) - count for count in matched]
+    expected_coverage = [count / len(jd_skills) if jd_skills else 0.0 for count in matched]
+    assert counts['coverage'] == pytest.approx(expected_coverage)
+
+
+def test_pack_round_trip_and_popcount_fallback(candidates, monkeypatch):
+    matrix = skill_matrix(candidates)
+    packed = pack(matrix)
+    assert np.array_equal(unpack(packed), matrix)
+
+    expected = matrix.sum(axis=1).tolist()
+    assert skill_bitset.popcount(packed).tolist() == expected
+    # NumPy before 2.0 has no bitwise_count: the lookup table gives the same counts
+    monkeypatch.delattr(np, 'bitwise_count', raising=False)
+    assert skill_bitset.popcount(packed).tolist() == expected
+
+
+def test_skills_outside_the_taxonomy_are_ignored():
+    row = skill_row(['python', 'not-a-skill'])
+    assert skill_bitset.skill_names(row) == ['python']
@@ -0,0 +1,92 @@
+"""
+Taxonomy hot reload: a rewritten taxonomy is swapped in when its file
+changes or on the reload signal, and callers holding the old version keep it
+"""
+
+import json
+import os
+import signal
+
+import pytest
+
+from modules import skill_db
+
+
+@pytest.fixture
+def taxonomy_file():
+    with open(skill_db.TAXONOMY_PATH, 'rb') as f:
+        original = f.read()
+    yield skill_db.TAXONOMY_PATH
+    with open(skill_db.TAXONOMY_PATH, 'wb') as f:
+        f.write(original)
+    skill_db.reload_taxonomy()
+
+
+def rewrite(path: str, version: str, extra_skill: str):
+    with open(path) as f:
+        data = json.load(f)
+    data['version'] = version
+    data['skills'].append({'name': extra_skill, 'category': 'other', 'aliases': []})
+    with open(path, 'w') as f:
+        json.dump(data, f)
+
+
+def test_file_change_swaps_in_the_new_version(taxonomy_file, monkeypatch):
+    in_flight = skill_db.get_taxonomy()
+    rewrite(taxonomy_file, 'reload-test-1', 'zigbee')
+
+    monkeypatch.setattr(skill_db, 'TAXONOMY_RELOAD_INTERVAL', 0.01)
+    monkeypatch.setattr(skill_db, '_last_check', 0.0)
+    current = skill_db.get_taxonomy()
+
+    assert current.version == 'reload-test-1'
+    assert 'zigbee' in current.skills
+    # A request that fetched the taxonomy before the swap finishes on it
+    assert current is not in_flight
+    assert in_flight.version != 'reload-test-1'
+    assert 'zigbee' not in in_flight.skills
+
+
+def test_reload_signal_swaps_in_the_new_version(taxonomy_file, monkeypatch):
+    monkeypatch.setattr(skill_db, 'TAXONOMY_RELOAD_INTERVAL', 0)
+    previous_handler = signal.getsignal(signal.SIGUSR1)
+    assert skill_db.install_reload_signal('SIGUSR1')
+    try:
+        in_flight = skill_db.get_taxonomy()
+        rewrite(taxonomy_file, 'reload-test-2', 'zigbee')
+        # Polling is off: nothing changes until the signal arrives
+        assert skill_db.get_taxonomy() is in_flight
+
+        os.kill(os.getpid(), signal.SIGUSR1)
+        current = skill_db.get_taxonomy()
+    finally:
+        signal.signal(signal.SIGUSR1, previous_handler)
+
+    assert current.version == 'reload-test-2'
+    assert in_flight.version != 'reload-test-2'
+    assert 'zigbee' not in in_flight.skills
+
+
+def test_invalid_file_keeps_the_current_version(taxonomy_file):
+    current = skill_db.get_taxonomy()
+    with open(taxonomy_file, 'w') as f:
+        f.write('{not json')
+
+    assert not skill_db.reload_taxonomy()
+    assert skill_db.get_taxonomy() is current
+
+
+def test_stale_artifact_is_reported_and_recompiled(tmp_path, capsys):
+    taxonomy_path = str(tmp_path / 'skill_taxonomy.json')
+    artifact_path = str(tmp_path / 'skill_taxonomy.pickle')
+    with open(skill_db.TAXONOMY_PATH, 'rb') as src, open(taxonomy_path, 'wb') as dst:
+        dst.write(src.read())
+    skill_db.build_artifact(taxonomy_path, artifact_path)
+    assert skill_db.load_artifact(artifact_path, taxonomy_path) is not None
+
+    rewrite(taxonomy_path, 'stale-test', 'zigbee')
+    assert skill_db.load_artifact(artifact_path, taxonomy_path) is None
+    taxonomy = skill_db.load_taxonomy(taxonomy_path, artifact_path)
+
+    assert taxonomy.version == 'stale-test'
+    assert 'is stale' in capsys.readouterr().out
@@ -0,0 +1,59 @@
+"""
+Skill extraction modes: batched extraction finds the same skills as one call
+per document, and the trimmed spaCy pipeline the same as the full one (the
+spaCy tests are skipped when the model isn't installed)
+"""
+
+import random
+
+import pytest
+
+from benchmarks.bench_skill_matcher import synthetic_document
+from modules.skill_extractor import (
+    SPACY_PIPELINE_PROFILES,
+    VOCABULARY_MODE,
+    extract_skills,
+    extract_skills_many,
+    load_spacy_model
+)
+
+
+def documents(count=40):
+    rng = random.Random(3)
+    return [synthetic_document(rng) for _ in range(count)]
+
+
+def require_model(mode):
+    if mode == VOCABULARY_MODE:
+        return
+    try:
+        load_spacy_model(mode)
+    except Exception as e:
+        pytest.skip(str(e))
+
+
+@pytest.mark.parametrize('mode', [VOCABULARY_MODE, *SPACY_PIPELINE_PROFILES])
+def test_batched_extraction_matches_single_calls(mode):
+    require_model(mode)
+    texts = documents() + ['', 'Python and Docker']
+    expected = [extract_skills(text, mode=mode) for text in texts]
+    assert extract_skills_many(texts, batch_size=8, mode=mode) == expected
+
+
+def test_minimal_pipeline_matches_full():
+    require_model('full')
+    require_model('minimal')
+    texts = documents()
+    assert extract_skills_many(texts, mode='minimal') == extract_skills_many(texts, mode='full')
+
+
+def test_vocab_mode_is_a_subset_of_spacy_modes():
+    require_model('minimal')
+    # spaCy tokens and noun phrases only ever add skills to the vocabulary matches
+    for text in documents():
+        assert set(extract_skills(text, mode=VOCABULARY_MODE)) <= set(extract_skills(text, mode='minimal'))
+
+
+def test_unknown_mode_is_rejected():
+    with pytest.raises(ValueError):
+        extract_skills('python', mode='fast')
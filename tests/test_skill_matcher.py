@@ -0,0 +1,76 @@
+"""
+SkillMatcher finds the same skills as the per-skill regex loop it replaced,
+and SkillPhraseIndex the same as the substring scan over noun phrases, with
+containment aligned on tokens
+"""
+
+import random
+
+import pytest
+
+from benchmarks.bench_phrase_index import indexed_phrase_skills, legacy_phrase_skills, synthetic_phrases
+from benchmarks.bench_skill_matcher import EDGE_CASES, legacy_regex_skills, synthetic_document
+from modules.skill_db import SKILLS_DATABASE
+from modules.skill_matcher import SkillMatcher, SkillPhraseIndex, phrase_tokens
+
+
+@pytest.fixture(scope='module')
+def matcher():
+    return SkillMatcher(SKILLS_DATABASE)
+
+
+@pytest.mark.parametrize('text', EDGE_CASES)
+def test_edge_cases_match_regex(matcher, text):
+    assert matcher.find_skills(text) == legacy_regex_skills(text, SKILLS_DATABASE)
+
+
+def test_cpp_word_boundaries(matcher):
+    # '\bc\+\+\b' needs a word character after '++', as the regex loop did
+    assert 'c++' in matcher.find_skills('c++11 and java')
+    assert 'c++' not in matcher.find_skills('c++ and java')
+    assert matcher.find_skills('c++ and java') == legacy_regex_skills('c++ and java', SKILLS_DATABASE)
+
+
+def test_synthetic_documents_match_regex(matcher):
+    rng = random.Random(42)
+    for _ in range(20):
+        document = synthetic_document(rng)
+        assert matcher.find_skills(document) == legacy_regex_skills(document, SKILLS_DATABASE)
+
+
+def token_aligned_scan(phrases, skills, reverse):
+    """
+    The substring scan with phrases and skills padded to whole tokens
+    """
+    matched = set()
+    for phrase in phrases:
+        padded_phrase = f" {' '.join(phrase_tokens(phrase))} "
+        for skill in skills:
+            padded_skill = f" {' '.join(phrase_tokens(skill))} "
+            if padded_skill in padded_phrase or (reverse and padded_phrase in padded_skill):
+                matched.add(skill)
+    return matched
+
+
+@pytest.mark.parametrize('reverse', [True, False])
+def test_phrase_index_matches_token_aligned_scan(reverse):
+    index = SkillPhraseIndex(SKILLS_DATABASE)
+    rng = random.Random(7)
+    for _ in range(10):
+        phrases = synthetic_phrases(rng)
+        indexed = indexed_phrase_skills(phrases, index, reverse)
+        assert indexed == token_aligned_scan(phrases, SKILLS_DATABASE, reverse)
+        # Only ever fewer matches than the old scan, never new ones
+        assert indexed <= legacy_phrase_skills(phrases, SKILLS_DATABASE)
+
+
+def test_phrase_index_drops_partial_word_matches():
+    index = SkillPhraseIndex(SKILLS_DATABASE)
+    phrases = ['javascript developer', 'c']
+    legacy = legacy_phrase_skills(phrases, SKILLS_DATABASE)
+    indexed = indexed_phrase_skills(phrases, index, reverse=True)
+
+    assert {'java', 'javascript', 'c', 'c++'} <= legacy
+    assert 'javascript' in indexed and 'c' in indexed
+    # 'java' is only part of the word 'javascript', and 'c' only a letter of 'c++'
+    assert 'java' not in indexed and 'c++' not in indexed